@@ -0,0 +1,52 @@
+"""Micro-benchmark of per-table template setup with and without the config cache.
+
+Run from the pytpt project directory:
+
+    python benchmarks/bench_config.py [tables]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pytpt.config_utils import clear_config_cache
+from pytpt.templates import create_tpt_files
+
+
+def time_tables(tables: int, cached: bool) -> float:
+    """Time create_tpt_files for a number of tables, returning seconds per table."""
+    clear_config_cache()
+    start = time.perf_counter()
+    for i in range(tables):
+        if not cached:
+            clear_config_cache()
+        create_tpt_files(f"BENCH_TABLE_{i}", f"/data/bench_{i}.csv")
+    return (time.perf_counter() - start) / tables
+
+
+def main():
+    tables = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    project_dir = Path.cwd()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Work in a scratch copy so render_tmp output stays out of the project
+        for name in ("conf", "scripts", "ddl"):
+            shutil.copytree(project_dir / name, Path(temp_dir) / name)
+        os.chdir(temp_dir)
+        try:
+            uncached = time_tables(tables, cached=False)
+            cached = time_tables(tables, cached=True)
+        finally:
+            os.chdir(project_dir)
+
+    print(f"Tables:                {tables}")
+    print(f"Recompose per table:   {uncached * 1000:8.3f} ms/table")
+    print(f"Cached config:         {cached * 1000:8.3f} ms/table")
+    print(f"Speedup:               {uncached / cached:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark log throughput of concurrent jobs with direct and queued logging.
+
+Each job thread produces lines of simulated TPT output and either logs every
+line at DEBUG, as stream_tbuild used to, or writes them to its own job file
+and logs one line referring to it. Logging is direct (the calling thread
+writes) or queued (enqueue=True). The slowest log call shows the stall of a
+job thread that rotates and compresses the log file, which queued logging
+takes off the job threads. The console sink goes to os.devnull. Run from the
+pytpt project directory:
+
+    python benchmarks/bench_logging.py [jobs] [lines]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from loguru import logger
+
+from pytpt.logging_config import setup_logging
+
+TPT_LINE = "$LOAD: Total Rows Sent To RDBMS:      {row}  Elapsed 00:00:01  Block {job}"
+
+
+def log_every_line(job: int, lines: int, log_dir: Path) -> float:
+    """Send every line of a job's output through the logger, returning the slowest call."""
+    slowest = 0.0
+    for row in range(lines):
+        start = time.perf_counter()
+        logger.debug(f"TPT: {TPT_LINE.format(row=row, job=job)}")
+        slowest = max(slowest, time.perf_counter() - start)
+    return slowest
+
+
+def log_by_reference(job: int, lines: int, log_dir: Path) -> float:
+    """Write a job's output to its own file and log where it is, returning the log call."""
+    job_file = log_dir / f"tpt_job{job}.log"
+    with open(job_file, "w", encoding="utf-8") as f:
+        for row in range(lines):
+            f.write(TPT_LINE.format(row=row, job=job) + "\n")
+    start = time.perf_counter()
+    logger.debug(f"Job {job} output saved to: {job_file}")
+    return time.perf_counter() - start
+
+
+def run(jobs: int, lines: int, enqueue: bool, job_fn) -> tuple[float, float, float]:
+    """
+    Run jobs concurrently.
+
+    Returns:
+        Seconds until the jobs finish, until the logs are written, and of the
+        slowest log call, such as one that rotated and compressed the log file
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_dir = Path(temp_dir)
+        stdout = sys.stdout
+        with open(os.devnull, "w") as devnull:
+            sys.stdout = devnull
+            try:
+                setup_logging(log_dir, "bench.log", "DEBUG", enqueue=enqueue)
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=jobs) as executor:
+                    slowest = max(
+                        executor.map(
+                            lambda job: job_fn(job, lines, log_dir), range(jobs)
+                        )
+                    )
+                jobs_done = time.perf_counter() - start
+                # Removing the sinks waits for queued messages to be written
+                logger.remove()
+                drained = time.perf_counter() - start
+            finally:
+                sys.stdout = stdout
+    return jobs_done, drained, slowest
+
+
+def main():
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    total = jobs * lines
+
+    print(f"Jobs: {jobs}, lines per job: {lines:,}")
+    print(
+        f"{'Mode':<30} {'jobs done':>10} {'drained':>10} {'lines/s':>12} "
+        f"{'slowest call':>13}"
+    )
+    for label, enqueue, job_fn in (
+        ("Every line, direct", False, log_every_line),
+        ("Every line, queued", True, log_every_line),
+        ("Job files by reference, direct", False, log_by_reference),
+        ("Job files by reference, queued", True, log_by_reference),
+    ):
+        jobs_done, drained, slowest = run(jobs, lines, enqueue, job_fn)
+        print(
+            f"{label:<30} {jobs_done:9.2f}s {drained:9.2f}s {total / jobs_done:12,.0f} "
+            f"{slowest * 1000:11.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
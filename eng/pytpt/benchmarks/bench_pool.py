@@ -0,0 +1,89 @@
+"""Benchmark opening a connection per task vs checking one out of a pool.
+
+Uses the stub driver with simulated logon and request latency, so it runs
+without a database. Run from the pytpt project directory:
+
+    python benchmarks/bench_pool.py [tasks] [threads]
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pytpt.pool import ConnectionPool
+from pytpt.stub_driver import StubDatabase
+
+# Simulated seconds for a logon and for each request
+CONNECT_LATENCY = 0.05
+REQUEST_LATENCY = 0.005
+
+# Requests each task makes
+REQUESTS_PER_TASK = 4
+
+
+def run_requests(con) -> None:
+    """Make a task's requests on a connection."""
+    cursor = con.cursor()
+    for _ in range(REQUESTS_PER_TASK):
+        cursor.execute("select 1")
+        cursor.fetchall()
+    cursor.close()
+
+
+def connect_per_task(tasks: int, threads: int) -> tuple[float, StubDatabase]:
+    """Open and close a connection in every task."""
+    database = StubDatabase(CONNECT_LATENCY, REQUEST_LATENCY)
+
+    def task(_):
+        con = database.connect()
+        try:
+            run_requests(con)
+        finally:
+            con.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(task, range(tasks)))
+    return time.perf_counter() - start, database
+
+
+def pooled(
+    tasks: int, threads: int, max_size: int
+) -> tuple[float, StubDatabase, ConnectionPool]:
+    """Check a connection out of a shared pool in every task."""
+    database = StubDatabase(CONNECT_LATENCY, REQUEST_LATENCY)
+    pool = ConnectionPool(database.connect, min_size=0, max_size=max_size)
+
+    def task(_):
+        with pool.connection() as con:
+            run_requests(con)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(task, range(tasks)))
+    elapsed = time.perf_counter() - start
+    pool.close()
+    return elapsed, database, pool
+
+
+def main():
+    tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    print(f"Tasks: {tasks}, threads: {threads}")
+    elapsed, database = connect_per_task(tasks, threads)
+    print(f"Connect per task:  {elapsed:7.3f} s  {database.connections:4d} logons")
+
+    for max_size in (2, 4, threads):
+        elapsed, database, pool = pooled(tasks, threads, max_size)
+        mean_wait = (
+            pool.stats.wait_seconds / pool.stats.waits if pool.stats.waits else 0
+        )
+        print(
+            f"Pool max_size {max_size:<3} {elapsed:7.3f} s  {database.connections:4d} logons"
+            f"  {pool.stats.waits:4d} waits  {mean_wait * 1000:6.1f} ms mean wait"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark counting the records of a large CSV file.
+
+Compares iterating over the lines of the file, csv.reader (which handles
+quoted newlines), and count_records, with and without quoted fields in the
+file. Run from the pytpt project directory:
+
+    python benchmarks/bench_profile.py [rows]
+"""
+
+import csv
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pytpt.csv_profile import count_records
+
+PLAIN_ROW = "{row},{row},2023-09-10,REG,Lambeau Field,1\n"
+QUOTED_ROW = '{row},{row},2023-09-10,REG,"Lambeau Field, Green Bay",1\n'
+
+
+def count_lines(csv_file: Path) -> int:
+    """Count records by iterating over the lines of the file."""
+    with open(csv_file, "rb") as f:
+        return sum(1 for _ in f)
+
+
+def count_csv_reader(csv_file: Path) -> int:
+    """Count records with csv.reader."""
+    with open(csv_file, "r", encoding="utf-8", newline="") as f:
+        return sum(1 for _ in csv.reader(f))
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print(f"{'File':<8} {'Method':<15} {'seconds':>8} {'records':>12}")
+        for label, row_format in (("plain", PLAIN_ROW), ("quoted", QUOTED_ROW)):
+            csv_file = Path(temp_dir) / f"{label}.csv"
+            with open(csv_file, "w", encoding="utf-8") as f:
+                f.write("GAME_ID,WEEK,GAME_DATE,GAME_TYPE,VENUE,SEASON\n")
+                f.writelines(row_format.format(row=row) for row in range(rows))
+
+            for method, count in (
+                ("lines", count_lines),
+                ("csv.reader", count_csv_reader),
+                ("count_records", lambda csv_file: count_records(csv_file)[0]),
+            ):
+                start = time.perf_counter()
+                records = count(csv_file)
+                elapsed = time.perf_counter() - start
+                print(f"{label:<8} {method:<15} {elapsed:8.3f} {records:12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark parsing DDL into the schema model and planning the load.
+
+Generates synthetic DDL files, one per table, each referencing up to three
+earlier tables, then times a cold parse, a cached reload, a reload after one
+file changes, and planning the load levels. Run from the pytpt project
+directory:
+
+    python benchmarks/bench_schema.py [tables]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pytpt.ddl import clear_schema_cache, load_schema
+
+
+def table_ddl(index: int, parents: list[int]) -> str:
+    """Build the DDL of a synthetic table with foreign keys to its parents."""
+    lines = [
+        f"create table BENCH_DB.BENCH_TABLE_{index} (",
+        "  ID INTEGER NOT NULL",
+        "  , NAME VARCHAR(50)",
+    ]
+    lines += [f"  , PARENT_{parent}_ID INTEGER" for parent in parents]
+    lines.append(f"  , CONSTRAINT BENCH_TABLE_{index}_PK PRIMARY KEY (ID)")
+    lines += [
+        f"  , CONSTRAINT BENCH_TABLE_{index}_{parent}_FK FOREIGN KEY (PARENT_{parent}_ID)"
+        f" REFERENCES BENCH_DB.BENCH_TABLE_{parent} (ID)"
+        for parent in parents
+    ]
+    lines.append(")\n;\n")
+    return "\n".join(lines)
+
+
+def write_ddl(tables: int, ddl_dir: Path) -> None:
+    """Write one DDL file per synthetic table."""
+    rng = random.Random(0)
+    for i in range(tables):
+        parents = rng.sample(range(i), min(i, rng.randint(0, 3)))
+        (ddl_dir / f"bench_table_{i}.sql").write_text(table_ddl(i, parents))
+
+
+def timed(function):
+    """Run a function, returning its result and elapsed seconds."""
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    tables = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        ddl_dir = Path(temp_dir)
+        write_ddl(tables, ddl_dir)
+        print(f"Tables: {tables}")
+
+        clear_schema_cache()
+        schema, elapsed = timed(lambda: load_schema(ddl_dir))
+        print(f"Cold parse:          {elapsed:7.3f} s")
+
+        _, elapsed = timed(lambda: load_schema(ddl_dir))
+        print(f"Cached reload:       {elapsed:7.3f} s")
+
+        changed = ddl_dir / "bench_table_0.sql"
+        changed.write_text(changed.read_text().replace("VARCHAR(50)", "VARCHAR(60)"))
+        schema, elapsed = timed(lambda: load_schema(ddl_dir))
+        print(f"One file changed:    {elapsed:7.3f} s")
+
+        levels, elapsed = timed(schema.load_levels)
+        print(f"Plan load levels:    {elapsed:7.3f} s  {len(levels)} levels")
+
+        _, elapsed = timed(schema.load_levels)
+        print(f"Cached plan:         {elapsed:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark reading a large query result in full vs in chunks, through the stub driver.
+
+Each mode runs in its own process so peak RSS is measured separately.
+Peak RSS needs the resource module, so is not reported on Windows.
+Run from the pytpt project directory:
+
+    python benchmarks/bench_sql_reader.py [rows] [fetch_size]
+"""
+
+import subprocess
+import sys
+import time
+
+from pytpt.sql_reader import read_sql_arrow, read_sql_chunks
+from pytpt.stub_driver import StubDatabase
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MODES = ("full", "chunks", "arrow")
+
+COLUMNS = ["GAME_PLAYER_ID", "WEEK", "GAME_ID", "TEAM_ID", "PLAYER_NAME", "YARDS"]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def player_database(rows: int) -> StubDatabase:
+    """Stub database with a synthetic PLAYER table."""
+    database = StubDatabase()
+    database.create_table(
+        "PLAYER",
+        COLUMNS,
+        (
+            (i, i % 17, i // 40, i % 32, f"Player {i % 2000}", i % 150)
+            for i in range(rows)
+        ),
+    )
+    return database
+
+
+def run_mode(mode: str, rows: int, fetch_size: int) -> None:
+    """Read the whole table in one mode and print rows, seconds and peak RSS."""
+    import pandas as pd
+
+    con = player_database(rows).connect()
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+
+    if mode == "full":
+        # What pd.read_sql does: fetch every row, then build one DataFrame
+        cursor = con.cursor()
+        cursor.execute("select * from player")
+        columns = [column[0] for column in cursor.description]
+        df = pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+        read = len(df)
+    elif mode == "chunks":
+        read = sum(
+            len(df)
+            for df in read_sql_chunks(
+                con, "select * from player", fetch_size=fetch_size
+            )
+        )
+    else:
+        read = sum(
+            batch.num_rows
+            for batch in read_sql_arrow(
+                con, "select * from player", fetch_size=fetch_size
+            )
+        )
+
+    elapsed = time.perf_counter() - start
+    print(read, elapsed, peak_rss_mb() - baseline)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--mode":
+        run_mode(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+        return
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    fetch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+
+    print(f"Rows:        {rows:,}")
+    print(f"Fetch size:  {fetch_size:,}")
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, str(rows), str(fetch_size)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        read, elapsed, rss = int(output[0]), float(output[1]), float(output[2])
+        print(
+            f"{mode:<7} {elapsed:8.3f} s {read / elapsed:12,.0f} rows/s "
+            f"{rss:10.1f} MB peak RSS increase"
+        )
+
+
+if __name__ == "__main__":
+    main()
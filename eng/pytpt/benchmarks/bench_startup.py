@@ -0,0 +1,103 @@
+"""Cold start benchmark of the pytpt CLI commands, measured with -X importtime.
+
+Each case starts a fresh interpreter that imports what a command needs and
+loads the config, and reports the import time Python measured along with the
+slowest top-level imports. Run from the pytpt project directory:
+
+    python benchmarks/bench_startup.py [runs]
+"""
+
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# What each case imports and runs, as python -c code
+CASES = {
+    "cli --help": "import pytpt.cli",
+    "plan, plain YAML": (
+        "import pytpt.cli, pytpt.config_utils, pytpt.csv_utils, pytpt.ddl, "
+        "pytpt.operators; pytpt.config_utils.load_config('plain')"
+    ),
+    "plan, Hydra config": (
+        "import pytpt.cli, pytpt.config_utils, pytpt.csv_utils, pytpt.ddl, "
+        "pytpt.operators; pytpt.config_utils.load_config('conf')"
+    ),
+    "load, Hydra config": (
+        "import pytpt.cli, pytpt.config_utils, pytpt.templates, pytpt.tpt_runner, "
+        "pytpt.report; pytpt.config_utils.load_config('conf')"
+    ),
+}
+
+
+def plain_config(project_dir: Path, config_dir: Path) -> None:
+    """Write the composed Hydra config as a plain YAML config.yaml."""
+    code = (
+        "from omegaconf import OmegaConf; from pytpt.config_utils import load_config; "
+        f"print(OmegaConf.to_yaml(load_config({str(project_dir / 'conf')!r})))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    config_dir.mkdir()
+    (config_dir / "config.yaml").write_text(completed.stdout)
+
+
+def run_case(code: str) -> tuple[float, float, dict[str, int]]:
+    """Run code in a fresh interpreter: wall seconds, import seconds, top imports in us."""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = time.perf_counter() - start
+
+    # Lines are "import time: self [us] | cumulative | imported package",
+    # with nested imports indented under the package that imported them
+    top_level = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):
+            top_level[name.strip()] = int(cumulative)
+    return wall, sum(top_level.values()) / 1e6, top_level
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    project_dir = Path.cwd()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Work in a scratch copy with a plain YAML copy of the config
+        shutil.copytree(project_dir / "conf", Path(temp_dir) / "conf")
+        plain_config(project_dir, Path(temp_dir) / "plain")
+        os.chdir(temp_dir)
+        try:
+            print(f"{'Case':<20} {'wall ms':>9} {'import ms':>10}  slowest imports")
+            for label, code in CASES.items():
+                samples = [run_case(code) for _ in range(runs)]
+                wall = statistics.median(sample[0] for sample in samples)
+                imports = statistics.median(sample[1] for sample in samples)
+                slowest = sorted(
+                    samples[-1][2].items(), key=lambda item: item[1], reverse=True
+                )[:3]
+                slowest_text = ", ".join(
+                    f"{name} {us / 1000:.0f}ms" for name, us in slowest
+                )
+                print(
+                    f"{label:<20} {wall * 1000:9.1f} {imports * 1000:10.1f}  "
+                    f"{slowest_text}"
+                )
+        finally:
+            os.chdir(project_dir)
+
+
+if __name__ == "__main__":
+    main()
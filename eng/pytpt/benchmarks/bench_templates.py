@@ -0,0 +1,74 @@
+"""Benchmark rendering TPT scripts for synthetic tables.
+
+Compares re-reading and re-compiling every template per table with the
+shared TemplateEngine, and a second engine pass where nothing changed.
+Run from the pytpt project directory:
+
+    python benchmarks/bench_templates.py [tables]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pytpt.templates import (
+    TemplateEngine,
+    get_credentials,
+    render_template,
+    write_file,
+    write_file_if_changed,
+)
+
+
+def template_vars(credentials: dict, index: int) -> dict:
+    """Build the template variables for a synthetic table."""
+    return {
+        **credentials,
+        "table_name": f"BENCH_TABLE_{index}",
+        "csv_file_path": f"/data/bench_{index}.csv",
+        "ddl_content": f"create table BENCH_TABLE_{index} (ID integer not null);",
+    }
+
+
+def render_per_file(tables: int, credentials: dict, output_dir: Path) -> float:
+    """Render by reading and compiling each template file per table."""
+    scripts_dir = Path("scripts")
+    start = time.perf_counter()
+    for i in range(tables):
+        variables = template_vars(credentials, i)
+        for operation, file_name in TemplateEngine.TEMPLATE_FILES.items():
+            content = render_template(scripts_dir / file_name, **variables)
+            write_file(content, output_dir / f"{i}_{operation}")
+    return time.perf_counter() - start
+
+
+def render_engine(tables: int, credentials: dict, output_dir: Path) -> float:
+    """Render through a single compiled TemplateEngine."""
+    start = time.perf_counter()
+    engine = TemplateEngine("scripts")
+    for i in range(tables):
+        rendered = engine.render_all(**template_vars(credentials, i))
+        for operation, content in rendered.items():
+            write_file_if_changed(content, output_dir / f"{i}_{operation}")
+    return time.perf_counter() - start
+
+
+def main():
+    tables = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    credentials = get_credentials()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        per_file = render_per_file(tables, credentials, Path(temp_dir) / "per_file")
+        engine_first = render_engine(tables, credentials, Path(temp_dir) / "engine")
+        engine_unchanged = render_engine(tables, credentials, Path(temp_dir) / "engine")
+
+    print(f"Tables:                      {tables}")
+    print(f"Per-file render + write:     {per_file:8.3f} s")
+    print(f"Engine render + write:       {engine_first:8.3f} s")
+    print(f"Engine render, unchanged:    {engine_unchanged:8.3f} s")
+    print(f"Speedup:                     {per_file / engine_first:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
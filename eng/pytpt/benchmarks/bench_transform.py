@@ -0,0 +1,70 @@
+"""Benchmark rewriting a large CSV in table column order, against a raw file copy.
+
+Each method of csv_transform writes a synthetic 2,000,000 row CSV to a file:
+appending default columns, reordering fields split on commas, and reordering
+rows parsed with the csv module, which files with quoted fields need. A CSV
+whose columns already match the table is not rewritten at all. Run from the
+pytpt project directory:
+
+    python benchmarks/bench_transform.py [rows]
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pytpt.csv_transform import map_columns, transform_csv
+from pytpt.ddl import Column
+
+HEADER = "GAME_PLAYER_ID,WEEK,GAME_ID,TEAM_ID,LOCATION,PLAYER_NAME\n"
+ROW = "{row},1,{game},1,Home,Byron Maxwell\n"
+
+COLUMNS = [
+    Column("GAME_PLAYER_ID", "INTEGER", nullable=False),
+    Column("WEEK", "INTEGER"),
+    Column("GAME_ID", "INTEGER", nullable=False),
+    Column("TEAM_ID", "INTEGER", nullable=False),
+    Column("HOME_AWAY", "VARCHAR", 50),
+    Column("PLAYER_NAME", "VARCHAR", 100),
+]
+
+ALIASES = {"LOCATION": "HOME_AWAY"}
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_file = Path(temp_dir) / "player.csv"
+        with open(csv_file, "w", encoding="utf-8") as f:
+            f.write(HEADER)
+            f.writelines(ROW.format(row=row, game=row // 40) for row in range(rows))
+        output_file = Path(temp_dir) / "output.csv"
+        size_mb = csv_file.stat().st_size / (1024 * 1024)
+
+        header = HEADER.strip().split(",")
+        cases = {
+            "append": map_columns(header, COLUMNS + [Column("SEASON", "INTEGER")]),
+            "split": map_columns(list(reversed(header)), COLUMNS, ALIASES),
+            "csv": map_columns(list(reversed(header)), COLUMNS, ALIASES),
+        }
+
+        print(f"Rows: {rows:,}, {size_mb:,.1f} MB")
+        print(f"{'Method':<12} {'seconds':>8} {'MB/s':>8}")
+        start = time.perf_counter()
+        shutil.copyfile(csv_file, output_file)
+        elapsed = time.perf_counter() - start
+        print(f"{'file copy':<12} {elapsed:8.3f} {size_mb / elapsed:8,.0f}")
+
+        for method, mapping in cases.items():
+            start = time.perf_counter()
+            with open(output_file, "wb") as output:
+                transform_csv(csv_file, output, mapping, method)
+            elapsed = time.perf_counter() - start
+            print(f"{method:<12} {elapsed:8.3f} {size_mb / elapsed:8,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+"""Run many tbuild jobs concurrently from one asyncio event loop."""
+
+import asyncio
+import os
+import signal
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterable, Optional
+
+from .logging_config import get_logger
+from .metrics import MetricsParser
+from .retry import RetryPolicy, classify
+from .tpt_runner import (
+    STDERR_TAIL_LINES,
+    TbuildEvent,
+    TbuildResult,
+    _event_from_line,
+    log_tbuild_result,
+    tbuild_command,
+    tbuild_log_file,
+)
+
+logger = get_logger(__name__)
+
+# Return code of a job killed for running past its timeout, as from timeout(1)
+TIMEOUT_RETURN_CODE = 124
+
+# A job that timed out is worth retrying whatever its output; any other failure,
+# such as the return code 12 of lost sessions and syntax errors alike, is only
+# retried when classify finds a transient error in its output
+TRANSIENT_RETURN_CODES = frozenset({TIMEOUT_RETURN_CODE})
+
+# Seconds a job is given to exit after SIGTERM before it is killed
+KILL_GRACE_SECONDS = 5.0
+
+# Longest line read from tbuild output
+LINE_LIMIT = 1024 * 1024
+
+
+@dataclass
+class TbuildJob:
+    """A tbuild command to run under the supervisor."""
+
+    name: str
+    cmd: list[str]
+    log_file: Path
+    operation_type: str = "unknown"
+    timeout: Optional[float] = None
+
+
+@dataclass
+class JobEvent:
+    """Progress event of one attempt at a supervised job."""
+
+    job_name: str
+    attempt: int
+    event: TbuildEvent
+
+
+@dataclass
+class JobResult:
+    """Outcome of a supervised job after any retries."""
+
+    job: TbuildJob
+    result: Optional[TbuildResult] = None
+    attempts: int = 0
+    elapsed: float = 0.0
+    cancelled: bool = False
+
+    @property
+    def success(self) -> bool:
+        """True if the last attempt succeeded."""
+        return self.result is not None and self.result.success
+
+    @property
+    def timed_out(self) -> bool:
+        """True if the last attempt was killed for running past its timeout."""
+        return self.result is not None and self.result.returncode == TIMEOUT_RETURN_CODE
+
+
+def tbuild_job(
+    jvar_file: Path,
+    tpt_file: Path,
+    operation_type: str = "unknown",
+    timeout: Optional[float] = None,
+    table_name: Optional[str] = None,
+) -> TbuildJob:
+    """Build the job for a tbuild command with jobvars and TPT script."""
+    return TbuildJob(
+        name=tpt_file.stem,
+        cmd=tbuild_command(jvar_file, tpt_file),
+        log_file=tbuild_log_file(jvar_file, operation_type, table_name),
+        operation_type=operation_type,
+        timeout=timeout,
+    )
+
+
+async def _terminate(process: asyncio.subprocess.Process) -> None:
+    """Stop a job and every process it started, politely first."""
+    if process.returncode is not None:
+        return
+
+    def send(sig) -> None:
+        try:
+            if os.name == "nt":
+                process.kill()
+            else:
+                # The job leads its own process group, so this reaches its children
+                os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    send(signal.SIGTERM)
+    try:
+        await asyncio.wait_for(process.wait(), KILL_GRACE_SECONDS)
+    except asyncio.TimeoutError:
+        send(getattr(signal, "SIGKILL", signal.SIGTERM))
+        await process.wait()
+
+
+async def stream_tbuild_async(
+    cmd: list[str],
+    log_file: Path,
+    operation_type: str = "unknown",
+    on_event: Optional[Callable[[TbuildEvent], None]] = None,
+    timeout: Optional[float] = None,
+) -> TbuildResult:
+    """
+    Run a tbuild command as an asyncio subprocess, teeing its output into one log file.
+
+    The asyncio counterpart of tpt_runner.stream_tbuild. The job runs in its
+    own process group, which is killed if the job runs past its timeout or
+    the calling task is cancelled.
+
+    Args:
+        cmd: The tbuild command line
+        log_file: File to write the combined output to
+        operation_type: Operation name used in the log and events
+        on_event: Optional callback for progress events
+        timeout: Seconds the job may run for, or None for no limit
+
+    Returns:
+        The job result, with return code 124 if the job timed out
+    """
+    parser = MetricsParser()
+    result = TbuildResult(returncode=-1, log_file=log_file, metrics=parser.metrics)
+    stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+
+    def emit(event: TbuildEvent) -> None:
+        if on_event:
+            on_event(event)
+
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_file, "w", encoding="utf-8", buffering=1) as f:
+        f.write(f"Command: {' '.join(cmd)}\n")
+        f.write(f"Operation: {operation_type}\n")
+        f.write("=" * 80 + "\n")
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=os.name != "nt",
+                limit=LINE_LIMIT,
+            )
+        except OSError as e:
+            logger.error(f"Could not start tbuild: {e}")
+            f.write(f"Could not start tbuild: {e}\n")
+            result.returncode = 127
+            result.stderr_tail = [str(e)]
+            emit(TbuildEvent("finished", operation_type, str(e)))
+            return result
+
+        emit(TbuildEvent("started", operation_type, " ".join(cmd)))
+        logger.debug(f"Writing {operation_type} output to {log_file}")
+
+        async def read(stream: asyncio.StreamReader, name: str) -> None:
+            while raw := await stream.readline():
+                line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                if name == "stderr":
+                    stderr_tail.append(line)
+                    f.write(f"[stderr] {line}\n")
+                else:
+                    f.write(f"{line}\n")
+                event = _event_from_line(line, result, parser, operation_type)
+                if event:
+                    emit(event)
+
+        async def run() -> int:
+            await asyncio.gather(
+                read(process.stdout, "stdout"), read(process.stderr, "stderr")
+            )
+            return await process.wait()
+
+        try:
+            result.returncode = await asyncio.wait_for(run(), timeout)
+        except asyncio.TimeoutError:
+            logger.error(
+                f"{operation_type} job timed out after {timeout}s, stopping it"
+            )
+            f.write(f"Timed out after {timeout}s\n")
+            await _terminate(process)
+            result.returncode = TIMEOUT_RETURN_CODE
+        except asyncio.CancelledError:
+            f.write("Cancelled\n")
+            await _terminate(process)
+            raise
+        result.stderr_tail = list(stderr_tail)
+
+        f.write("=" * 80 + "\n")
+        f.write(f"Return Code: {result.returncode}\n")
+        f.write(f"Success: {result.success}\n")
+
+    emit(
+        TbuildEvent(
+            "finished",
+            operation_type,
+            f"Return code {result.returncode}",
+            result.rows_sent,
+            result.rows_applied,
+        )
+    )
+    return result
+
+
+class TbuildSupervisor:
+    """
+    Run tbuild jobs concurrently on one event loop, without a thread per job.
+
+    Jobs are limited to max_concurrent at a time, retried with jittered
+    exponential backoff when they fail for a transient reason, and stopped along
+    with their child processes on SIGINT. Progress of every job can be
+    followed with the events async iterator.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 16,
+        max_retries: int = 2,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        retry_returncodes: Iterable[int] = TRANSIENT_RETURN_CODES,
+        jitter: float = 0.5,
+    ):
+        """
+        Create a supervisor.
+
+        Args:
+            max_concurrent: Most jobs running at the same time
+            max_retries: Retries of a job after its first attempt
+            backoff: Seconds before the first retry, doubled for each one after
+            max_backoff: Longest wait between retries
+            retry_returncodes: Return codes worth retrying
+            jitter: Most of each wait taken off at random, as a fraction
+        """
+        self.max_concurrent = max_concurrent
+        self.retry_policy = RetryPolicy(max_retries, backoff, max_backoff, jitter)
+        self.retry_returncodes = frozenset(retry_returncodes)
+        self._queues: list[asyncio.Queue] = []
+        self._tasks: list[asyncio.Task] = []
+
+    def should_retry(self, result: TbuildResult) -> bool:
+        """True if a failed attempt is worth retrying."""
+        return classify(result, self.retry_returncodes).retryable
+
+    def retry_delay(self, attempt: int) -> float:
+        """Seconds to wait after a failed attempt before the next one."""
+        return self.retry_policy.delay(attempt)
+
+    def _publish(self, event: Optional[JobEvent]) -> None:
+        for queue in self._queues:
+            queue.put_nowait(event)
+
+    async def events(self) -> AsyncIterator[JobEvent]:
+        """
+        Iterate over the events of every job until the current run finishes.
+
+        Start iterating before the run is awaited, e.g. with the run in a
+        task, as only events published after iteration starts are seen.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._queues.append(queue)
+        try:
+            while (event := await queue.get()) is not None:
+                yield event
+        finally:
+            self._queues.remove(queue)
+
+    async def run_job(self, job: TbuildJob) -> JobResult:
+        """Run one job, retrying transient failures."""
+        outcome = JobResult(job)
+        start = time.perf_counter()
+        try:
+            while True:
+                outcome.attempts += 1
+                attempt = outcome.attempts
+                outcome.result = await stream_tbuild_async(
+                    job.cmd,
+                    job.log_file,
+                    job.operation_type,
+                    lambda event: self._publish(JobEvent(job.name, attempt, event)),
+                    job.timeout,
+                )
+                max_retries = self.retry_policy.max_retries
+                if outcome.result.success or attempt > max_retries:
+                    break
+                if not self.should_retry(outcome.result):
+                    break
+
+                delay = self.retry_delay(attempt)
+                logger.warning(
+                    f"{job.name} failed with return code {outcome.result.returncode}, "
+                    f"retrying in {delay:.1f}s ({attempt}/{max_retries})"
+                )
+                self._publish(
+                    JobEvent(
+                        job.name,
+                        attempt,
+                        TbuildEvent(
+                            "retry", job.operation_type, f"Retry in {delay:.1f}s"
+                        ),
+                    )
+                )
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            outcome.cancelled = True
+            self._publish(
+                JobEvent(
+                    job.name,
+                    outcome.attempts,
+                    TbuildEvent("cancelled", job.operation_type),
+                )
+            )
+        outcome.elapsed = time.perf_counter() - start
+        if outcome.result is not None and not outcome.cancelled:
+            log_tbuild_result(outcome.result, job.operation_type)
+        return outcome
+
+    def cancel(self) -> None:
+        """Stop every running and waiting job, killing their process groups."""
+        for task in self._tasks:
+            task.cancel()
+
+    async def run(self, jobs: Iterable[TbuildJob]) -> list[JobResult]:
+        """
+        Run jobs concurrently, returning their results in the order given.
+
+        SIGINT cancels the run: running jobs are stopped, waiting jobs never
+        start, and both are returned as cancelled.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async def limited(job: TbuildJob) -> JobResult:
+            try:
+                async with semaphore:
+                    return await self.run_job(job)
+            except asyncio.CancelledError:
+                return JobResult(job, cancelled=True)
+
+        loop = asyncio.get_running_loop()
+        handle_sigint = False
+        try:
+            loop.add_signal_handler(signal.SIGINT, self._on_sigint)
+            handle_sigint = True
+        except (NotImplementedError, RuntimeError, ValueError):
+            # Windows, or not the main thread of the main interpreter
+            pass
+
+        self._tasks = [asyncio.ensure_future(limited(job)) for job in jobs]
+        try:
+            return list(await asyncio.gather(*self._tasks))
+        finally:
+            if handle_sigint:
+                loop.remove_signal_handler(signal.SIGINT)
+            self._tasks = []
+            self._publish(None)
+
+    def _on_sigint(self) -> None:
+        logger.warning("Interrupted, stopping all tbuild jobs")
+        self.cancel()
+
+
+def run_tbuild_jobs(jobs: Iterable[TbuildJob], **supervisor_options) -> list[JobResult]:
+    """Run tbuild jobs under a supervisor from synchronous code."""
+    return asyncio.run(TbuildSupervisor(**supervisor_options).run(jobs))
@@ -0,0 +1,163 @@
+"""Checkpointed tbuild jobs that a rerun restarts instead of starting over."""
+
+import json
+import re
+import shutil
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from .logging_config import get_logger
+from .manifest import write_json
+
+logger = get_logger(__name__)
+
+# Default location of the checkpoint state and of the per table checkpoint files
+CHECKPOINT_STATE_FILE = Path("state") / "checkpoints.json"
+CHECKPOINT_DIR = Path("state") / "checkpoints"
+
+# Default seconds between checkpoints taken by tbuild
+CHECKPOINT_INTERVAL = 60
+
+
+@dataclass
+class CheckpointJob:
+    """A checkpointed tbuild job and the input it was started with."""
+
+    table_name: str
+    job_name: str
+    checkpoint_dir: str
+    operation: str
+    csv_file: str
+    csv_size: int
+    csv_mtime_ns: int
+    started_at: str
+
+    def tbuild_args(self, interval: int = CHECKPOINT_INTERVAL) -> list[str]:
+        """tbuild options that checkpoint the job, ending with the job name."""
+        return ["-z", str(interval), "-r", self.checkpoint_dir, self.job_name]
+
+    def matches(self, csv_file: str | Path) -> bool:
+        """True if the CSV file is the one the job was started with, unchanged."""
+        csv_file = Path(csv_file)
+        if str(csv_file.absolute()) != self.csv_file or not csv_file.exists():
+            return False
+        stat = csv_file.stat()
+        return stat.st_size == self.csv_size and stat.st_mtime_ns == self.csv_mtime_ns
+
+
+def job_name(table_name: str, operation: str) -> str:
+    """Name a table's tbuild job, which tbuild uses to find its checkpoint files."""
+    return re.sub(r"\W", "_", f"pytpt_{table_name}_{operation}").lower()
+
+
+class CheckpointStore:
+    """Persistent record of checkpointed jobs that have not yet succeeded."""
+
+    def __init__(
+        self,
+        path: str | Path = CHECKPOINT_STATE_FILE,
+        checkpoint_dir: str | Path = CHECKPOINT_DIR,
+        interval: int = CHECKPOINT_INTERVAL,
+    ):
+        self.path = Path(path)
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self.jobs: dict[str, CheckpointJob] = {}
+
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw_jobs = json.load(f)
+            for table_name, job in raw_jobs.items():
+                self.jobs[table_name] = CheckpointJob(**job)
+
+    @classmethod
+    def from_config(cls, checkpoint_config) -> Optional["CheckpointStore"]:
+        """Create the store from the checkpoint config section, or None if disabled."""
+        if not checkpoint_config or not checkpoint_config.get("enabled", False):
+            return None
+        return cls(
+            checkpoint_config.get("state", CHECKPOINT_STATE_FILE),
+            checkpoint_config.get("dir", CHECKPOINT_DIR),
+            int(checkpoint_config.get("interval", CHECKPOINT_INTERVAL)),
+        )
+
+    def resumable(
+        self,
+        table_name: str,
+        operation: str,
+        csv_file: str | Path,
+    ) -> Optional[CheckpointJob]:
+        """
+        Find a failed job of a table that can restart from its last checkpoint.
+
+        A job whose CSV file has changed since it started is discarded, as its
+        checkpoint no longer matches the input.
+
+        Args:
+            table_name: Name of the target table
+            operation: tbuild operation, "load" or "job"
+            csv_file: CSV file that would be loaded
+
+        Returns:
+            The job to restart, or None to start a new one
+        """
+        with self._lock:
+            job = self.jobs.get(table_name)
+        if job is None or job.operation != operation:
+            return None
+        if not job.matches(csv_file):
+            logger.warning(
+                f"{Path(csv_file).name} changed since {job.job_name} failed, "
+                "discarding its checkpoint"
+            )
+            self.discard(table_name)
+            return None
+        return job
+
+    def start(
+        self, table_name: str, operation: str, csv_file: str | Path
+    ) -> CheckpointJob:
+        """Record a new checkpointed job, removing any earlier checkpoint of the table."""
+        self.discard(table_name)
+
+        csv_file = Path(csv_file)
+        stat = csv_file.stat()
+        job_dir = self.checkpoint_dir / table_name
+        job_dir.mkdir(parents=True, exist_ok=True)
+        job = CheckpointJob(
+            table_name=table_name,
+            job_name=job_name(table_name, operation),
+            checkpoint_dir=str(job_dir),
+            operation=operation,
+            csv_file=str(csv_file.absolute()),
+            csv_size=stat.st_size,
+            csv_mtime_ns=stat.st_mtime_ns,
+            started_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        with self._lock:
+            self.jobs[table_name] = job
+        # Saved straight away, so the job can be restarted even if this process dies
+        self.save()
+        return job
+
+    def discard(self, table_name: str) -> None:
+        """Forget a table's job and delete its checkpoint files."""
+        with self._lock:
+            job = self.jobs.pop(table_name, None)
+        shutil.rmtree(self.checkpoint_dir / table_name, ignore_errors=True)
+        if job is not None:
+            self.save()
+
+    def complete(self, table_name: str) -> None:
+        """Clean up after a table's job succeeded."""
+        self.discard(table_name)
+
+    def save(self) -> None:
+        """Write the state to disk, replacing the old file atomically."""
+        with self._lock:
+            data = {name: asdict(job) for name, job in self.jobs.items()}
+            write_json(self.path, data)
@@ -0,0 +1,582 @@
+"""
+Command line interface to load, plan, render and validate table loads.
+
+Each command imports only the modules it needs, so quick commands such as
+``pytpt plan --list-tables`` start without importing Jinja, and without
+Hydra when the config is plain YAML.
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+# Jobvars lines holding passwords, which change without changing what is loaded
+PASSWORD_LINE_PATTERN = re.compile(r"^.*Password=.*$", re.MULTILINE)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="pytpt", description="Load CSV files to Teradata tables using TPT."
+    )
+    parser.add_argument(
+        "--config-dir",
+        default="conf",
+        help="Directory holding config.yaml (default: conf)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load = commands.add_parser("load", help="Load CSV files to their tables")
+    load.add_argument(
+        "--force",
+        action="store_true",
+        help="Reload every table, even if its CSV and DDL are unchanged",
+    )
+    load.set_defaults(handler=run_load)
+
+    plan = commands.add_parser(
+        "plan", help="Show the tables that would load, in order, without loading"
+    )
+    plan.add_argument(
+        "--list-tables",
+        action="store_true",
+        help="Only print the name of each table, one per line",
+    )
+    plan.set_defaults(handler=run_plan)
+
+    render = commands.add_parser("render", help="Render the TPT scripts of tables")
+    render.add_argument(
+        "--single-job",
+        action="store_true",
+        default=None,
+        help="Render one job per table instead of drop, create and load scripts",
+    )
+    render.set_defaults(handler=run_render)
+
+    validate = commands.add_parser(
+        "validate", help="Check CSV files against their table DDL"
+    )
+    validate.set_defaults(handler=run_validate)
+
+    for command in (load, plan, render, validate):
+        command.add_argument(
+            "tables",
+            nargs="*",
+            metavar="TABLE",
+            help="Tables to include (default: every mapped table)",
+        )
+
+    log = commands.add_parser("log", help="Print the archived TPT output of a table")
+    log.add_argument("table", help="Table whose output to print")
+    log.add_argument(
+        "step",
+        nargs="?",
+        help="Step to print, such as drop, create, load or job (default: every step)",
+    )
+    log.add_argument("--run", help="Run id to read (default: the last run)")
+    log.add_argument(
+        "--attempt", type=int, help="Attempt to read (default: the last one)"
+    )
+    log.set_defaults(handler=run_log)
+    return parser.parse_args(argv)
+
+
+def _setup(args: argparse.Namespace):
+    """Load the config and set up logging from it."""
+    from .config_utils import load_config
+    from .logging_config import setup_logging
+
+    cfg = load_config(args.config_dir)
+    setup_logging(
+        log_dir=cfg.logging.get("dir", "logs"),
+        log_file=cfg.logging.get("file", "pytpt.log"),
+        log_level=cfg.logging.get("level", "INFO"),
+        enqueue=cfg.logging.get("enqueue", False),
+    )
+    return cfg
+
+
+def mapped_csv_files(cfg, tables: list[str] | None = None) -> list[tuple[Path, str]]:
+    """
+    Find the CSV files in the data directory that map to a table.
+
+    Args:
+        cfg: Configuration with the data directory and table mapping
+        tables: Only include these tables (default: every mapped table)
+
+    Returns:
+        (csv_file, table_name) pairs
+    """
+    from .csv_utils import find_csv_files, get_table_mapping, match_csv_to_table
+    from .logging_config import get_logger
+
+    logger = get_logger(__name__)
+    data_dir = cfg.data.dir
+    table_mapping = get_table_mapping(cfg)
+
+    logger.info(f"Looking for CSV files in: {data_dir}")
+    logger.debug(f"Table mapping: {table_mapping}")
+    csv_files = find_csv_files(data_dir)
+    if not csv_files:
+        logger.warning("No CSV files found!")
+        return []
+    logger.info(f"Found {len(csv_files)} CSV files")
+
+    # Filter CSV files to only those with table mappings
+    mapped_files = []
+    skipped_files = []
+    for csv_file in csv_files:
+        table_name = match_csv_to_table(csv_file, table_mapping)
+        if table_name:
+            mapped_files.append((csv_file, table_name))
+            logger.debug(f"Mapped: {csv_file.name} -> {table_name}")
+        else:
+            skipped_files.append(csv_file)
+
+    if skipped_files:
+        logger.warning(
+            f"Skipping {len(skipped_files)} CSV files with no table mapping:"
+        )
+        for skipped_file in skipped_files:
+            logger.warning(f"  - {skipped_file.name} (no mapping found)")
+
+    if tables:
+        wanted = {table.upper() for table in tables}
+        missing = wanted - {table_name for _, table_name in mapped_files}
+        for table_name in sorted(missing):
+            logger.warning(f"No CSV file maps to {table_name}")
+        mapped_files = [item for item in mapped_files if item[1] in wanted]
+
+    if not mapped_files:
+        logger.error("No CSV files have table mappings configured!")
+    return mapped_files
+
+
+def table_ddl_hash(table_name: str, csv_path: str, cfg) -> str:
+    """
+    Hash what a table load depends on besides the contents of its CSV file.
+
+    That is the rendered jobvars and drop, create and load scripts, which
+    include the DDL, target and operator, and the table's column aliases and
+    defaults from the transform config. The CSV path and passwords are left
+    out of the jobvars, as they change without changing what is loaded.
+    """
+    from .manifest import hash_text
+    from .operators import select_operator
+    from .templates import render_tpt_scripts
+
+    choice = select_operator(csv_path, cfg.get("operator", {}))
+    rendered = render_tpt_scripts(
+        table_name,
+        csv_path,
+        cfg,
+        load_operator=choice.operator,
+        operations=("jobvars", "drop", "create", "load"),
+    )
+    jobvars = PASSWORD_LINE_PATTERN.sub("", rendered["jobvars"])
+    rendered["jobvars"] = jobvars.replace(csv_path, "<csv>")
+
+    transform_cfg = cfg.get("transform", {})
+    transform = {
+        "enabled": bool(transform_cfg.get("enabled", False)),
+        "aliases": dict(transform_cfg.get("aliases", {}).get(table_name) or {}),
+        "defaults": dict(transform_cfg.get("defaults", {}).get(table_name) or {}),
+    }
+    return hash_text(
+        "".join(rendered.values()) + json.dumps(transform, sort_keys=True, default=str)
+    )
+
+
+def validate_files(
+    mapped_files: list[tuple[Path, str]], validation_cfg, schema, transform_cfg=None
+):
+    """
+    Validate each CSV against its table DDL, returning valid files and failures.
+
+    With the transform config enabled, CSV columns are matched to the table
+    columns by header, as they are when loading, instead of by position.
+    """
+    from .csv_transform import map_csv_to_table
+    from .logging_config import get_logger
+    from .scheduler import TableLoadResult
+    from .validate import validate_csv
+
+    logger = get_logger(__name__)
+    valid_files = []
+    failures = []
+
+    for csv_file, table_name in mapped_files:
+        table = schema.tables.get(table_name)
+        columns = table.columns if table else []
+        if not columns:
+            logger.warning(f"No DDL columns for {table_name}, skipping validation")
+            valid_files.append((csv_file, table_name))
+            continue
+
+        mapping = None
+        if transform_cfg and transform_cfg.get("enabled", False):
+            try:
+                mapping = map_csv_to_table(table_name, csv_file, columns, transform_cfg)
+            except ValueError as error:
+                logger.error(f"Validation failed for {csv_file.name} -> {table_name}:")
+                logger.error(f"  - header: {error}")
+                failures.append(TableLoadResult(table_name, csv_file, False))
+                continue
+
+        report = validate_csv(
+            csv_file,
+            columns,
+            max_errors=validation_cfg.get("max_errors", 20),
+            mapping=mapping,
+        )
+        if report.valid:
+            logger.info(f"Validated {csv_file.name}: {report.rows_checked:,} rows OK")
+            valid_files.append((csv_file, table_name))
+            continue
+
+        logger.error(f"Validation failed for {csv_file.name} -> {table_name}:")
+        for error in report.errors:
+            location = f"line {error.line_number}"
+            if error.column:
+                location += f", {error.column}={error.value!r}"
+            logger.error(f"  - {location}: {error.message}")
+        failures.append(TableLoadResult(table_name, csv_file, False))
+
+    return valid_files, failures
+
+
+def run_load(args: argparse.Namespace) -> int:
+    """Load every mapped CSV file to its table."""
+    from functools import partial
+
+    from .checkpoint import CheckpointStore
+    from .csv_profile import PROFILE_CACHE_FILE, ProfileCache, profile_csv_files
+    from .ddl import load_schema
+    from .logging_config import get_logger
+    from .manifest import LoadManifest
+    from .metrics import current_run_id
+    from .report import PROMETHEUS_FILE, REPORT_FILE, RunReport
+    from .run_archive import RunArchive
+    from .scheduler import log_load_summary, run_load_plan
+    from .templates import load_env_vars
+    from .tpt_runner import load_table
+
+    cfg = _setup(args)
+    logger = get_logger(__name__)
+    logger.info("Starting CSV to Teradata loading process...")
+
+    # Load environment variables
+    load_env_vars()
+    logger.info("Environment variables loaded")
+    logger.info("Configuration loaded")
+
+    mapped_files = mapped_csv_files(cfg, args.tables)
+    if not mapped_files:
+        return 0
+
+    logger.info(f"Processing {len(mapped_files)} CSV files with table mappings")
+
+    load_cfg = cfg.get("load", {})
+    schema = load_schema(load_cfg.get("ddl_dir", "ddl"))
+
+    # Skip tables whose CSV and DDL are unchanged since their last good load
+    manifest = LoadManifest(load_cfg.get("manifest", "state/load_manifest.json"))
+    ddl_hashes = {
+        table_name: table_ddl_hash(table_name, str(csv_file.absolute()), cfg)
+        for csv_file, table_name in mapped_files
+    }
+    unchanged_files = []
+    if not args.force:
+        unchanged_files = [
+            (csv_file, table_name)
+            for csv_file, table_name in mapped_files
+            if manifest.is_unchanged(table_name, csv_file, ddl_hashes[table_name])
+        ]
+    if unchanged_files:
+        logger.info(
+            f"Skipping {len(unchanged_files)} unchanged tables (use --force to reload):"
+        )
+        for csv_file, table_name in unchanged_files:
+            logger.info(f"  - {csv_file.name} -> {table_name} (unchanged)")
+    files_to_load = [item for item in mapped_files if item not in unchanged_files]
+
+    # Optionally check each CSV against its DDL before any TPT job starts
+    invalid_results = []
+    validation_cfg = cfg.get("validation", {})
+    if validation_cfg.get("enabled", False):
+        files_to_load, invalid_results = validate_files(
+            files_to_load, validation_cfg, schema, cfg.get("transform", {})
+        )
+
+    # Profile the CSV files, so the largest loads can start first
+    profiles = profile_csv_files(
+        [csv_file for csv_file, _ in files_to_load],
+        ProfileCache(load_cfg.get("profile_cache", PROFILE_CACHE_FILE)),
+    )
+    for csv_file, table_name in files_to_load:
+        profile = profiles[csv_file]
+        logger.info(
+            f"{table_name}: {profile.rows:,} rows, {profile.columns} columns, "
+            f"{profile.size / (1024 * 1024):,.1f} MB"
+        )
+    table_sizes = None
+    if load_cfg.get("largest_first", True):
+        table_sizes = {
+            table_name: profiles[csv_file].size
+            for csv_file, table_name in files_to_load
+        }
+
+    # Load tables concurrently, parents before children
+    dependencies = schema.dependencies
+    load_levels = schema.load_levels(
+        table_name for _, table_name in files_to_load if table_name in schema.tables
+    )
+    for level, table_names in enumerate(load_levels):
+        logger.debug(f"Load level {level}: {', '.join(table_names)}")
+
+    # Failed checkpointed jobs restart from their last checkpoint
+    checkpoints = CheckpointStore.from_config(cfg.get("checkpoint", {}))
+    if checkpoints is not None:
+        for table_name, job in checkpoints.jobs.items():
+            logger.info(
+                f"{table_name} will restart from checkpoint {job.job_name} "
+                f"(started {job.started_at})"
+            )
+
+    # TPT output of every job goes into one compressed archive for the run
+    archive = RunArchive.from_config(cfg.get("archive", {}))
+
+    report = RunReport(current_run_id())
+    start = time.perf_counter()
+    results = run_load_plan(
+        files_to_load,
+        dependencies,
+        load_fn=partial(
+            load_table,
+            config=cfg,
+            single_job=load_cfg.get("single_job", False),
+            append=load_cfg.get("append", False),
+            checkpoints=checkpoints,
+            report=report,
+            archive=archive,
+        ),
+        max_workers=load_cfg.get("max_workers", 4),
+        max_jobs_per_host=load_cfg.get("max_jobs_per_host", 2),
+        host=cfg.database.target_host,
+        table_sizes=table_sizes,
+        # Children of a table that failed validation are skipped
+        failed_results=invalid_results,
+    )
+    total_elapsed = time.perf_counter() - start
+
+    for result in results:
+        manifest.record(
+            result.table_name,
+            result.csv_file,
+            ddl_hashes[result.table_name],
+            result.success,
+        )
+    manifest.save()
+
+    success_count = len(unchanged_files)
+    failed_files = []
+
+    for result in results:
+        if result.success:
+            success_count += 1
+            logger.success(f"Successfully processed: {result.csv_file.name}")
+        else:
+            failed_files.append(result.csv_file.name)
+            logger.error(f"Failed to process: {result.csv_file.name}")
+
+    log_load_summary(results, total_elapsed)
+
+    # Per table and step report for dashboards and alerts
+    report_cfg = cfg.get("report", {})
+    report.record_tables(results, unchanged_files)
+    report.write_jsonl(report_cfg.get("jsonl", REPORT_FILE))
+    if report_cfg.get("prometheus", PROMETHEUS_FILE):
+        report.write_prometheus(report_cfg.get("prometheus", PROMETHEUS_FILE))
+    logger.info(f"Run report {report.run_id} written")
+    if archive is not None:
+        logger.info(f"TPT output archived in {archive.archive_file(report.run_id)}")
+        archive.apply_retention()
+
+    # Summary
+    total_files = len(mapped_files)
+    logger.info(
+        f"Load process completed: {success_count}/{total_files} files loaded successfully"
+    )
+
+    if failed_files:
+        logger.error(f"Failed files ({len(failed_files)}): {', '.join(failed_files)}")
+
+    if success_count == total_files:
+        logger.success("All files loaded successfully!")
+    elif success_count > 0:
+        logger.warning(
+            f"Partial success: {success_count} out of {total_files} files loaded"
+        )
+    else:
+        logger.error("No files were loaded successfully")
+    return 0
+
+
+def run_plan(args: argparse.Namespace) -> int:
+    """Print the tables that would load, by load level, with their rows and operator."""
+    from .csv_profile import PROFILE_CACHE_FILE, ProfileCache, profile_csv_files
+    from .ddl import load_schema
+    from .operators import select_operator
+    from .scheduler import load_priorities, resolve_dependencies
+
+    cfg = _setup(args)
+    mapped_files = mapped_csv_files(cfg, args.tables)
+    load_cfg = cfg.get("load", {})
+    schema = load_schema(load_cfg.get("ddl_dir", "ddl"))
+
+    csv_files = {table_name: csv_file for csv_file, table_name in mapped_files}
+    profiles = profile_csv_files(
+        csv_files.values(),
+        ProfileCache(load_cfg.get("profile_cache", PROFILE_CACHE_FILE)),
+    )
+
+    # Within a level, tables start largest first, as in run_load_plan
+    priorities = load_priorities(
+        resolve_dependencies(list(csv_files), schema.dependencies),
+        {
+            table_name: profiles[csv_file].size
+            for table_name, csv_file in csv_files.items()
+        },
+    )
+    load_levels = [
+        sorted(level, key=lambda table_name: (-priorities[table_name], table_name))
+        for level in schema.load_levels(
+            table_name for table_name in csv_files if table_name in schema.tables
+        )
+    ]
+    # Tables without DDL load with no dependencies, as in the first level
+    no_ddl = sorted(
+        (name for name in csv_files if name not in schema.tables),
+        key=lambda table_name: (-priorities[table_name], table_name),
+    )
+
+    if args.list_tables:
+        for table_name in [name for level in load_levels for name in level] + no_ddl:
+            print(table_name)
+        return 0
+
+    append = load_cfg.get("append", False)
+    levels = [("Level", i, names) for i, names in enumerate(load_levels)]
+    if no_ddl:
+        levels.append(("No DDL", None, no_ddl))
+    for label, level, table_names in levels:
+        print(f"{label} {level}:" if level is not None else f"{label}:")
+        for table_name in table_names:
+            csv_file = csv_files[table_name]
+            choice = select_operator(csv_file, cfg.get("operator", {}), append)
+            profile = profiles[csv_file]
+            size_mb = profile.size / (1024 * 1024)
+            print(
+                f"  {table_name:<20} {csv_file.name:<24} {profile.rows:>12,} rows "
+                f"{size_mb:>9,.1f} MB  ${choice.operator} ({choice.reason})"
+            )
+    return 0
+
+
+def run_render(args: argparse.Namespace) -> int:
+    """Render the TPT scripts of each mapped table into render_tmp."""
+    from .operators import select_operator
+    from .templates import create_tpt_files, create_tpt_job_files, load_env_vars
+
+    cfg = _setup(args)
+    load_env_vars()
+    load_cfg = cfg.get("load", {})
+    single_job = args.single_job
+    if single_job is None:
+        single_job = load_cfg.get("single_job", False)
+    append = load_cfg.get("append", False)
+
+    for csv_file, table_name in mapped_csv_files(cfg, args.tables):
+        csv_path = str(csv_file.absolute())
+        choice = select_operator(csv_file, cfg.get("operator", {}), append)
+        if single_job:
+            files = create_tpt_job_files(
+                table_name, csv_path, cfg, load_operator=choice.operator, append=append
+            )
+        else:
+            files = create_tpt_files(
+                table_name, csv_path, cfg, load_operator=choice.operator
+            )
+        for path in files:
+            print(path)
+    return 0
+
+
+def run_validate(args: argparse.Namespace) -> int:
+    """Validate each mapped CSV file against its table DDL, failing if any is invalid."""
+    from .ddl import load_schema
+
+    cfg = _setup(args)
+    mapped_files = mapped_csv_files(cfg, args.tables)
+    schema = load_schema(cfg.get("load", {}).get("ddl_dir", "ddl"))
+
+    valid_files, failures = validate_files(
+        mapped_files, cfg.get("validation", {}), schema, cfg.get("transform", {})
+    )
+    for csv_file, table_name in valid_files:
+        print(f"OK      {table_name:<20} {csv_file.name}")
+    for failure in failures:
+        print(f"FAILED  {failure.table_name:<20} {failure.csv_file.name}")
+    return 1 if failures else 0
+
+
+def run_log(args: argparse.Namespace) -> int:
+    """Print the output of a table's jobs from the run archive."""
+    from .config_utils import load_config
+    from .run_archive import ARCHIVE_DIR, RunArchive
+
+    # Only reads the archive, so the log files are left alone
+    cfg = load_config(args.config_dir)
+    archive_cfg = cfg.get("archive", {})
+    archive = RunArchive(archive_cfg.get("dir", ARCHIVE_DIR))
+
+    table = args.table.upper()
+    run_id = args.run
+    if run_id is None:
+        runs = [entry.run_id for entry in archive.entries(table=table)]
+        if not runs:
+            print(f"No archived output of {table}", file=sys.stderr)
+            return 1
+        run_id = runs[-1]
+
+    steps = [args.step] if args.step else []
+    if not steps:
+        entries = archive.entries(run_id, table)
+        steps = list(dict.fromkeys(entry.step for entry in entries))
+    try:
+        for step in steps:
+            print(f"==> {run_id} {table} {step} <==")
+            print(archive.read(run_id, table, step, args.attempt), end="")
+    except KeyError as e:
+        print(e.args[0], file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a pytpt command, returning its exit status."""
+    args = parse_args(argv)
+    try:
+        return args.handler(args)
+    except Exception as e:
+        from .logging_config import get_logger
+
+        get_logger(__name__).exception(f"pytpt {args.command} failed with error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,66 @@
 """Configuration utilities."""
 
+import threading
 from pathlib import Path
-from hydra import compose, initialize_config_dir
+from omegaconf import DictConfig, OmegaConf
 
+# Hydra keeps global state while composing, so only one thread may compose at a time
+_config_lock = threading.Lock()
+
+# Process-wide cache of composed configs: config dir -> (yaml mtime, config)
+_config_cache: dict[Path, tuple[float, DictConfig]] = {}
+
+
+def _config_mtime(config_dir: Path) -> float:
+    """Get the latest modification time of any YAML file in the config directory."""
+    return max(
+        (path.stat().st_mtime for path in config_dir.rglob("*.yaml")),
+        default=0.0,
+    )
+
+
+def clear_config_cache() -> None:
+    """Invalidate the cached configuration so the next load recomposes it."""
+    with _config_lock:
+        _config_cache.clear()
+
+
+def load_config(
+    config_dir: str | Path = "conf",
+    force_reload: bool = False,
+) -> DictConfig:
+    """
+    Load configuration, composing it with Hydra if it has a defaults list.
+
+    A config.yaml without a defaults list is plain YAML and is loaded
+    directly, so Hydra is never imported. The composed config is cached for
+    the whole process and only recomposed when forced, when the cache is
+    cleared or when a YAML file changes. The returned config is read-only as
+    it is shared between callers.
+
+    Args:
+        config_dir: Directory holding config.yaml (default: "conf")
+        force_reload: Recompose the config even if a cached copy exists
+
+    Returns:
+        The composed configuration
+    """
+    config_dir = Path(config_dir).absolute()
+    mtime = _config_mtime(config_dir)
+
+    with _config_lock:
+        cached = _config_cache.get(config_dir)
+        if cached and not force_reload and cached[0] == mtime:
+            return cached[1]
+
+        cfg = OmegaConf.load(config_dir / "config.yaml")
+        if "defaults" in cfg:
+            # Imported here as Hydra takes longer to import than the rest of pytpt
+            from hydra import compose, initialize_config_dir
+
+            with initialize_config_dir(config_dir=str(config_dir), version_base=None):
+                cfg = compose(config_name="config")
+        OmegaConf.set_readonly(cfg, True)
+        _config_cache[config_dir] = (mtime, cfg)
 
-def load_config():
-    """Load configuration using Hydra."""
-    config_dir = Path("conf").absolute()
-    with initialize_config_dir(config_dir=str(config_dir), version_base=None):
-        cfg = compose(config_name="config")
     return cfg
@@ -0,0 +1,228 @@
+"""Profile CSV files before loading: row count, size, columns and header."""
+
+import csv
+import json
+import mmap
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .logging_config import get_logger
+from .manifest import write_json
+
+logger = get_logger(__name__)
+
+# Default location of the cached profiles
+PROFILE_CACHE_FILE = Path("state") / "csv_profiles.json"
+
+# Bytes of the mapped file scanned at a time
+SCAN_BLOCK_SIZE = 16 * 1024 * 1024
+
+# Every byte but a double quote and a newline
+NOT_QUOTE_OR_NEWLINE = bytes(byte for byte in range(256) if byte not in b'"\n')
+
+
+@dataclass
+class CsvProfile:
+    """Size and shape of a CSV file."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    rows: int
+    columns: int
+    header: list[str] = field(default_factory=list)
+    quoted_newlines: bool = False
+
+    def matches(self, csv_file: str | Path) -> bool:
+        """True if the file is unchanged since it was profiled."""
+        try:
+            stat = Path(csv_file).stat()
+        except FileNotFoundError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+
+def _count_quoted_block(block: bytes, in_quotes: bool) -> tuple[int, bool, bool]:
+    """
+    Count the records ended in a block that has double quotes in it.
+
+    Everything but quotes and newlines is deleted and pairs of adjacent
+    quotes, such as an escaped quote or an empty field, are dropped, as they
+    leave the quoting unchanged. What is left has a quote only where a line
+    opens or closes a field across a newline, so the loop below runs a few
+    times per such field rather than once per byte.
+
+    Returns:
+        Records ended, whether the block ends inside quotes, and whether any
+        newline in the block was inside quotes
+    """
+    block = block.translate(None, NOT_QUOTE_OR_NEWLINE).replace(b'""', b"")
+    records = 0
+    quoted_newlines = False
+    position = 0
+    while True:
+        quote = block.find(b'"', position)
+        end = len(block) if quote == -1 else quote
+        newlines = block.count(b"\n", position, end)
+        if in_quotes:
+            quoted_newlines = quoted_newlines or newlines > 0
+        else:
+            records += newlines
+        if quote == -1:
+            return records, in_quotes, quoted_newlines
+        in_quotes = not in_quotes
+        position = quote + 1
+
+
+def count_records(csv_file: str | Path) -> tuple[int, bool]:
+    """
+    Count the records in a CSV file, including the header.
+
+    The file is memory mapped and newlines are counted a block at a time
+    with bytes.count. A block with a double quote in it, or that starts
+    inside a quoted field, is reduced to its quotes and newlines first, so
+    a newline inside a quoted field does not end a record.
+
+    Args:
+        csv_file: CSV file to count
+
+    Returns:
+        Number of records and whether any newline was inside quotes
+    """
+    csv_file = Path(csv_file)
+    size = csv_file.stat().st_size
+    if size == 0:
+        # An empty file cannot be mapped
+        return 0, False
+
+    records = 0
+    in_quotes = False
+    quoted_newlines = False
+    with open(csv_file, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        for start in range(0, size, SCAN_BLOCK_SIZE):
+            block = mapped[start : start + SCAN_BLOCK_SIZE]
+            if not in_quotes and b'"' not in block:
+                # Fast path: every newline in the block ends a record
+                records += block.count(b"\n")
+                continue
+            block_records, in_quotes, block_quoted = _count_quoted_block(
+                block, in_quotes
+            )
+            records += block_records
+            quoted_newlines = quoted_newlines or block_quoted
+        if mapped[size - 1 : size] != b"\n":
+            # The last record has no newline
+            records += 1
+    return records, quoted_newlines
+
+
+def read_header(csv_file: str | Path) -> list[str]:
+    """Read the header row of a CSV file."""
+    with open(csv_file, "r", encoding="utf-8", errors="replace", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def profile_csv(csv_file: str | Path) -> CsvProfile:
+    """Profile one CSV file with a header row."""
+    csv_file = Path(csv_file)
+    stat = csv_file.stat()
+    records, quoted_newlines = count_records(csv_file)
+    header = read_header(csv_file)
+    return CsvProfile(
+        path=str(csv_file.absolute()),
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        rows=max(records - 1, 0),
+        columns=len(header),
+        header=header,
+        quoted_newlines=quoted_newlines,
+    )
+
+
+class ProfileCache:
+    """Persistent profiles of CSV files, reused while a file is unchanged."""
+
+    def __init__(self, path: str | Path = PROFILE_CACHE_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.profiles: dict[str, CsvProfile] = {}
+
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw_profiles = json.load(f)
+            for csv_path, profile in raw_profiles.items():
+                self.profiles[csv_path] = CsvProfile(**profile)
+
+    def get(self, csv_file: str | Path) -> Optional[CsvProfile]:
+        """The cached profile of a file, or None if missing or the file changed."""
+        with self._lock:
+            profile = self.profiles.get(str(Path(csv_file).absolute()))
+        if profile is not None and profile.matches(csv_file):
+            return profile
+        return None
+
+    def put(self, profile: CsvProfile) -> None:
+        """Cache a profile."""
+        with self._lock:
+            self.profiles[profile.path] = profile
+
+    def save(self) -> None:
+        """Write the cache to disk, replacing the old file atomically."""
+        with self._lock:
+            data = {path: asdict(profile) for path, profile in self.profiles.items()}
+            write_json(self.path, data)
+
+
+def profile_csv_files(
+    csv_files: Iterable[str | Path],
+    cache: Optional[ProfileCache] = None,
+    max_workers: Optional[int] = None,
+) -> dict[Path, CsvProfile]:
+    """
+    Profile CSV files, in a process pool for those not already cached.
+
+    Args:
+        csv_files: CSV files to profile
+        cache: Cache of earlier profiles, updated and saved with the new ones
+        max_workers: Most processes to profile with (default: one per CPU)
+
+    Returns:
+        Profile of each file, keyed by the path given
+    """
+    csv_files = [Path(csv_file) for csv_file in csv_files]
+    profiles = {}
+    to_profile = []
+    for csv_file in csv_files:
+        cached = cache.get(csv_file) if cache is not None else None
+        if cached is not None:
+            profiles[csv_file] = cached
+        else:
+            to_profile.append(csv_file)
+
+    if len(to_profile) > 1 and max_workers != 1:
+        workers = min(len(to_profile), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            new_profiles = list(executor.map(profile_csv, to_profile))
+    else:
+        new_profiles = [profile_csv(csv_file) for csv_file in to_profile]
+
+    for csv_file, profile in zip(to_profile, new_profiles):
+        profiles[csv_file] = profile
+        if profile.quoted_newlines:
+            logger.debug(f"{csv_file.name} has newlines inside quoted fields")
+    if cache is not None and new_profiles:
+        for profile in new_profiles:
+            cache.put(profile)
+        cache.save()
+
+    logger.debug(
+        f"Profiled {len(csv_files)} CSV files, "
+        f"{len(csv_files) - len(to_profile)} from cache"
+    )
+    return {csv_file: profiles[csv_file] for csv_file in csv_files}
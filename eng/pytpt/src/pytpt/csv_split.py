@@ -0,0 +1,200 @@
+"""Split large CSV files into chunks for parallel TPT FileReader instances."""
+
+import math
+import re
+import shutil
+from pathlib import Path
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Read and copy files in 1 MiB blocks
+BLOCK_SIZE = 1024 * 1024
+
+# Defaults for choosing the number of chunks
+TARGET_CHUNK_BYTES = 64 * 1024 * 1024
+MAX_CHUNKS = 8
+
+# Pattern to match the bytes that change CSV record state
+QUOTE_OR_NEWLINE = re.compile(rb'["\n]')
+
+
+def choose_chunk_count(
+    file_size: int,
+    target_chunk_bytes: int = TARGET_CHUNK_BYTES,
+    max_chunks: int = MAX_CHUNKS,
+) -> int:
+    """Choose how many chunks to split a file of a given size into."""
+    if file_size <= target_chunk_bytes:
+        return 1
+    return max(1, min(max_chunks, math.ceil(file_size / target_chunk_bytes)))
+
+
+def find_record_boundaries(path: Path, targets: list[int]) -> list[int]:
+    """
+    Find the end of the first complete CSV record at or after each target offset.
+
+    Newlines inside double quoted fields do not end a record, so the quote
+    state is tracked from the start of the file.
+
+    Args:
+        path: CSV file to scan
+        targets: Byte offsets to find boundaries for
+
+    Returns:
+        Sorted, de-duplicated offsets just past a record ending newline
+    """
+    pending = sorted(targets)
+    boundaries = []
+    in_quotes = False
+    block_start = 0
+
+    with open(path, "rb") as f:
+        while pending:
+            block = f.read(BLOCK_SIZE)
+            if not block:
+                break
+            block_end = block_start + len(block)
+
+            if b'"' not in block:
+                # Fast path: quote state is constant across the whole block
+                while not in_quotes and pending and pending[0] < block_end:
+                    newline = block.find(b"\n", max(pending[0] - block_start, 0))
+                    if newline == -1:
+                        break
+                    boundary = block_start + newline + 1
+                    boundaries.append(boundary)
+                    pending = [target for target in pending if target >= boundary]
+            else:
+                for match in QUOTE_OR_NEWLINE.finditer(block):
+                    if match.group() == b'"':
+                        in_quotes = not in_quotes
+                        continue
+                    offset = block_start + match.start()
+                    if not in_quotes and pending and offset >= pending[0]:
+                        boundary = offset + 1
+                        boundaries.append(boundary)
+                        pending = [target for target in pending if target >= boundary]
+                        if not pending:
+                            break
+
+            block_start = block_end
+
+    return sorted(set(boundaries))
+
+
+def _copy_range(source, target, start: int, end: int) -> None:
+    """Copy bytes start..end of an open source file to an open target file."""
+    source.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        block = source.read(min(BLOCK_SIZE, remaining))
+        if not block:
+            break
+        target.write(block)
+        remaining -= len(block)
+
+
+def split_csv(
+    csv_file: Path,
+    output_dir: Path,
+    chunk_count: int,
+) -> list[Path]:
+    """
+    Split a CSV file into chunks along record boundaries.
+
+    Every chunk starts with the header row so each FileReader instance can
+    skip it. Existing chunks in the output directory are removed first.
+
+    Args:
+        csv_file: CSV file to split
+        output_dir: Directory to write the chunks to
+        chunk_count: Requested number of chunks (fewer are written for small files)
+
+    Returns:
+        Paths of the chunk files, in order
+    """
+    csv_file = Path(csv_file)
+    file_size = csv_file.stat().st_size
+
+    header_end = find_record_boundaries(csv_file, [0])
+    header_end = header_end[0] if header_end else file_size
+
+    body_size = file_size - header_end
+    targets = [
+        header_end + body_size * index // chunk_count for index in range(1, chunk_count)
+    ]
+    cuts = [
+        boundary
+        for boundary in find_record_boundaries(csv_file, targets)
+        if header_end < boundary < file_size
+    ]
+    starts = [header_end, *cuts]
+    ends = [*cuts, file_size]
+
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    output_dir.mkdir(parents=True)
+
+    chunks = []
+    with open(csv_file, "rb") as source:
+        header = source.read(header_end)
+        for index, (start, end) in enumerate(zip(starts, ends), 1):
+            chunk_path = output_dir / f"{csv_file.stem}_part{index:03d}.csv"
+            with open(chunk_path, "wb") as target:
+                target.write(header)
+                _copy_range(source, target, start, end)
+            chunks.append(chunk_path)
+
+    return chunks
+
+
+def prepare_reader_input(
+    table_name: str,
+    csv_file_path: str,
+    split_config: dict | None = None,
+) -> tuple[str, int]:
+    """
+    Split a large CSV for parallel reading, if splitting is enabled.
+
+    Args:
+        table_name: Name of the target table, used for the chunk directory
+        csv_file_path: Path to the CSV file to load
+        split_config: The `split` section of the config
+
+    Returns:
+        Tuple of the path to give the FileReader (a wildcard pattern when the
+        file was split) and the number of reader instances to use
+    """
+    split_config = split_config or {}
+    if not split_config.get("enabled", False):
+        return csv_file_path, 1
+
+    csv_file = Path(csv_file_path)
+    if not csv_file.is_file():
+        # Leave reporting a missing file to TPT
+        return csv_file_path, 1
+
+    chunk_count = choose_chunk_count(
+        csv_file.stat().st_size,
+        int(split_config.get("target_chunk_mb", 64)) * 1024 * 1024,
+        int(split_config.get("max_readers", MAX_CHUNKS)),
+    )
+    if chunk_count == 1:
+        return csv_file_path, 1
+
+    output_dir = Path(split_config.get("dir", "render_tmp/chunks")) / table_name
+    chunks = split_csv(csv_file, output_dir, chunk_count)
+    logger.info(f"Split {csv_file.name} into {len(chunks)} chunks in {output_dir}")
+
+    pattern = output_dir.absolute() / f"{csv_file.stem}_part*.csv"
+    return str(pattern), len(chunks)
+
+
+def remove_chunks(table_name: str, split_config: dict | None = None) -> None:
+    """Remove any chunk files written for a table."""
+    split_config = split_config or {}
+    output_dir = Path(split_config.get("dir", "render_tmp/chunks")) / table_name
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
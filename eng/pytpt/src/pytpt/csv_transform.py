@@ -0,0 +1,455 @@
+"""Map CSV columns to table columns by header, streaming a TPT-ready copy if they differ."""
+
+import csv
+import io
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from operator import itemgetter
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+from .csv_profile import count_records, read_header
+from .csv_split import BLOCK_SIZE
+from .ddl import Column
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Default directory of the transformed files and named pipes, one per table
+TRANSFORM_DIR = Path("render_tmp") / "transform"
+
+
+@dataclass
+class ColumnMapping:
+    """Where each table column comes from in a CSV file."""
+
+    header: list[str]
+    columns: list[str]
+    # Index of each table column in the CSV, or None to use its default
+    sources: list[Optional[int]]
+    defaults: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def passthrough(self) -> bool:
+        """
+        True if the CSV can be read as it is.
+
+        The FileReader skips the header row and truncates extra columns at
+        the end of each row, so a CSV whose first columns are the table's,
+        in order, needs no rewriting, whatever their headers are.
+        """
+        return self.sources == list(range(len(self.columns)))
+
+    @property
+    def append_only(self) -> bool:
+        """True if every CSV column is kept in order and defaults follow them."""
+        kept = len(self.header)
+        return (
+            self.sources[:kept] == list(range(kept))
+            and len(self.sources) > kept
+            and all(source is None for source in self.sources[kept:])
+        )
+
+    @property
+    def dropped(self) -> list[str]:
+        """CSV columns not loaded to the table."""
+        used = set(self.sources)
+        return [name for index, name in enumerate(self.header) if index not in used]
+
+
+def map_columns(
+    header: list[str],
+    columns: list[Column],
+    aliases: Optional[dict[str, str]] = None,
+    defaults: Optional[dict[str, str]] = None,
+) -> ColumnMapping:
+    """
+    Map the columns of a CSV file to the columns of its table.
+
+    CSV headers match table columns by name, ignoring case, or through an
+    alias from a CSV header to a table column. A table column missing from
+    the CSV takes its default, or is loaded as null if it is nullable.
+
+    Args:
+        header: Header row of the CSV file
+        columns: Columns of the table, in order, from its DDL
+        aliases: CSV header to table column, for columns named differently
+        defaults: Table column to the value loaded when it is not in the CSV
+
+    Returns:
+        The mapping of the table columns to the CSV columns
+
+    Raises:
+        ValueError: If a NOT NULL column is not in the CSV and has no default
+    """
+    aliases = {name.casefold(): column for name, column in (aliases or {}).items()}
+    defaults = {name.casefold(): str(value) for name, value in (defaults or {}).items()}
+
+    positions: dict[str, int] = {}
+    for index, name in enumerate(header):
+        column = aliases.get(name.strip().casefold(), name.strip())
+        positions.setdefault(column.casefold(), index)
+
+    sources = []
+    fill = {}
+    missing = []
+    for column in columns:
+        key = column.name.casefold()
+        source = positions.get(key)
+        sources.append(source)
+        if source is not None:
+            continue
+        if key in defaults:
+            fill[column.name] = defaults[key]
+        elif column.nullable:
+            fill[column.name] = ""
+        else:
+            missing.append(column.name)
+
+    if missing:
+        raise ValueError(
+            f"NOT NULL columns not in the CSV header and without a default: "
+            f"{', '.join(missing)}"
+        )
+    return ColumnMapping(
+        list(header), [column.name for column in columns], sources, fill
+    )
+
+
+def map_csv_to_table(
+    table_name: str,
+    csv_file: str | Path,
+    columns: list[Column],
+    transform_config: dict | None = None,
+) -> ColumnMapping:
+    """
+    Map a CSV file to its table's columns with the table's aliases and defaults.
+
+    Raises:
+        ValueError: If the CSV columns cannot be mapped to the table
+    """
+    transform_config = transform_config or {}
+    return map_columns(
+        read_header(Path(csv_file)),
+        columns,
+        transform_config.get("aliases", {}).get(table_name),
+        transform_config.get("defaults", {}).get(table_name),
+    )
+
+
+def _format_field(value: str) -> str:
+    """Quote a CSV field if it has a comma, quote or line end in it."""
+    if any(char in value for char in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _format_row(values: list[str]) -> str:
+    """Format values as a CSV row, without a line end."""
+    return ",".join(_format_field(value) for value in values)
+
+
+def _has_quotes(csv_file: Path) -> bool:
+    """True if a file has a double quote in it."""
+    with open(csv_file, "rb") as f:
+        while block := f.read(BLOCK_SIZE):
+            if b'"' in block:
+                return True
+    return False
+
+
+def choose_method(csv_file: str | Path, mapping: ColumnMapping) -> str:
+    """
+    Choose the cheapest way to rewrite a CSV for a mapping.
+
+    Returns:
+        "passthrough" to read the CSV as it is, "append" to add the default
+        columns to the end of each line, "split" to reorder the fields of
+        each line split on commas, or "csv" to reorder rows parsed with the
+        csv module, for files with quoted fields
+    """
+    if mapping.passthrough:
+        return "passthrough"
+    has_quotes = _has_quotes(Path(csv_file))
+    if mapping.append_only and not (has_quotes and count_records(csv_file)[1]):
+        # The end of each line is the end of a record
+        return "append"
+    return "csv" if has_quotes else "split"
+
+
+def _line_terminator(header_line: bytes) -> bytes:
+    """Line terminator of a CSV file, from its header line."""
+    return b"\r\n" if header_line.endswith(b"\r\n") else b"\n"
+
+
+def _default_values(mapping: ColumnMapping) -> list[str]:
+    """Values of the table columns missing from the CSV, in table order."""
+    return [
+        mapping.defaults[name]
+        for name, source in zip(mapping.columns, mapping.sources)
+        if source is None
+    ]
+
+
+def _picker(mapping: ColumnMapping) -> Callable[[list], tuple]:
+    """
+    Pick the table's fields, in order, from a row's fields followed by the defaults.
+
+    The defaults are picked counting from the end of the fields.
+    """
+    indexes = []
+    default_index = -mapping.sources.count(None)
+    for source in mapping.sources:
+        if source is None:
+            indexes.append(default_index)
+            default_index += 1
+        else:
+            indexes.append(source)
+    if len(indexes) == 1:
+        # itemgetter of one index returns the field, not a tuple of fields
+        return lambda fields: (fields[indexes[0]],)
+    return itemgetter(*indexes)
+
+
+def _write_appended(source: BinaryIO, output: BinaryIO, mapping: ColumnMapping) -> None:
+    """Add the default columns to the end of each data line."""
+    header_line = source.readline()
+    newline = _line_terminator(header_line)
+    output.write(_format_row(mapping.columns).encode("utf-8") + newline)
+
+    suffix = ("," + _format_row(_default_values(mapping))).encode("utf-8")
+    carry = b""
+    ended = True
+    while block := source.read(BLOCK_SIZE):
+        block = carry + block
+        # Keep a \r at the end of the block for the \n that may follow it
+        carry = block[-1:] if newline == b"\r\n" and block.endswith(b"\r") else b""
+        block = block[: len(block) - len(carry)]
+        output.write(block.replace(newline, suffix + newline))
+        ended = block.endswith(newline)
+    output.write(carry)
+    if not ended or carry:
+        # The last line has no line end
+        output.write(suffix + newline)
+
+
+def _write_split(source: BinaryIO, output: BinaryIO, mapping: ColumnMapping) -> None:
+    """Reorder the fields of each line, split on commas, a block of lines at a time."""
+    header_line = source.readline()
+    newline = _line_terminator(header_line)
+    output.write(_format_row(mapping.columns).encode("utf-8") + newline)
+
+    defaults = [value.encode("utf-8") for value in _default_values(mapping)]
+    pick = _picker(mapping)
+
+    width = len(mapping.header)
+    rest = b""
+    while True:
+        block = source.read(BLOCK_SIZE)
+        if block:
+            block = rest + block
+            end = block.rfind(newline) + len(newline)
+            if end < len(newline):
+                # No complete line in the block yet
+                rest = block
+                continue
+            chunk, rest = block[:end], block[end:]
+            lines = chunk.split(newline)[:-1]
+        elif rest:
+            # The last line has no line end
+            chunk, rest = rest, b""
+            lines = [chunk]
+        else:
+            break
+
+        rows = [line.split(b",") for line in lines]
+        # Every row must have the header's width, or its fields would shift
+        if set(map(len, rows)) != {width}:
+            bad = next(row for row in rows if len(row) != width)
+            raise ValueError(
+                f"A row has {len(bad)} columns, not the {width} of the header: "
+                f"{b','.join(bad)[:80]!r}"
+            )
+        output.write(
+            newline.join([b",".join(pick(row + defaults)) for row in rows]) + newline
+        )
+
+
+def _write_csv(source: BinaryIO, output: BinaryIO, mapping: ColumnMapping) -> None:
+    """Reorder the fields of each row parsed with the csv module."""
+    reader = csv.reader(io.TextIOWrapper(source, encoding="utf-8", newline=""))
+    text_output = io.TextIOWrapper(output, encoding="utf-8", newline="")
+    writer = csv.writer(text_output, lineterminator="\n")
+
+    next(reader, None)
+    writer.writerow(mapping.columns)
+    width = len(mapping.header)
+    defaults = _default_values(mapping)
+    pick = _picker(mapping)
+    for row in reader:
+        if len(row) != width:
+            raise ValueError(
+                f"Line {reader.line_num} has {len(row)} columns, not the {width} "
+                f"of the header"
+            )
+        writer.writerow(pick(row + defaults))
+    text_output.flush()
+    text_output.detach()
+
+
+WRITERS = {"append": _write_appended, "split": _write_split, "csv": _write_csv}
+
+
+def transform_csv(
+    csv_file: str | Path,
+    output: BinaryIO,
+    mapping: ColumnMapping,
+    method: Optional[str] = None,
+) -> None:
+    """
+    Stream a CSV file with its columns in table order to an open binary file.
+
+    Args:
+        csv_file: CSV file to transform
+        output: File or pipe to write to
+        mapping: Mapping of the table columns to the CSV columns
+        method: How to rewrite the CSV (default: chosen with choose_method)
+    """
+    method = method or choose_method(csv_file, mapping)
+    if method == "passthrough":
+        with open(csv_file, "rb") as source:
+            shutil.copyfileobj(source, output, BLOCK_SIZE)
+        return
+    with open(csv_file, "rb") as source:
+        WRITERS[method](source, output, mapping)
+
+
+class PipeFeed:
+    """
+    Write a transformed CSV into a named pipe while a TPT job reads it.
+
+    Each job attempt needs its own feed, as the pipe is empty once read.
+    """
+
+    def __init__(
+        self, csv_file: Path, pipe_path: Path, mapping: ColumnMapping, method: str
+    ):
+        self.csv_file = csv_file
+        self.pipe_path = pipe_path
+        self.mapping = mapping
+        self.method = method
+        self.error: Optional[BaseException] = None
+
+    def _write(self) -> None:
+        """Write the transformed CSV into the pipe, once the job opens it."""
+        try:
+            with open(self.pipe_path, "wb") as pipe:
+                transform_csv(self.csv_file, pipe, self.mapping, self.method)
+        except BrokenPipeError:
+            logger.debug(f"TPT closed {self.pipe_path.name} before reading all of it")
+        except Exception as error:
+            self.error = error
+            logger.error(f"Failed to write {self.pipe_path.name}: {error}")
+
+    def _release_writer(self, writer: threading.Thread) -> None:
+        """Unblock a writer whose job exited without opening or reading the pipe."""
+        while writer.is_alive():
+            # Opening the read end lets the writer's open return, and closing
+            # it makes the writer's next write fail
+            try:
+                fd = os.open(self.pipe_path, os.O_RDONLY | os.O_NONBLOCK)
+                os.close(fd)
+            except FileNotFoundError:
+                pass
+            writer.join(0.1)
+
+    @contextmanager
+    def feeding(self):
+        """Feed the pipe while the body runs the job that reads it."""
+        self.error = None
+        writer = threading.Thread(
+            target=self._write, name=f"feed-{self.pipe_path.stem}", daemon=True
+        )
+        writer.start()
+        try:
+            yield self
+        finally:
+            self._release_writer(writer)
+
+
+def transform_dir(table_name: str, transform_config: dict | None = None) -> Path:
+    """Directory of a table's transformed CSV or named pipe."""
+    transform_config = transform_config or {}
+    return Path(transform_config.get("dir", TRANSFORM_DIR)) / table_name
+
+
+def prepare_transform(
+    table_name: str,
+    csv_file_path: str,
+    columns: list[Column],
+    transform_config: dict | None = None,
+    allow_pipe: bool = True,
+) -> tuple[str, Optional[PipeFeed]]:
+    """
+    Map a CSV to its table's columns, writing a TPT-ready copy if they differ.
+
+    Args:
+        table_name: Name of the target table
+        csv_file_path: Path to the CSV file to load
+        columns: Columns of the table from its DDL
+        transform_config: The `transform` section of the config
+        allow_pipe: False if the job must be able to read its input again,
+            as a checkpointed load restarting part way through does
+
+    Returns:
+        Tuple of the path to give the FileReader and, when it is a named
+        pipe, the feed to run around each job that reads it
+
+    Raises:
+        ValueError: If the CSV columns cannot be mapped to the table
+    """
+    transform_config = transform_config or {}
+    csv_file = Path(csv_file_path)
+    if not transform_config.get("enabled", False) or not columns:
+        return csv_file_path, None
+    if not csv_file.is_file():
+        # Leave reporting a missing file to TPT
+        return csv_file_path, None
+
+    mapping = map_csv_to_table(table_name, csv_file, columns, transform_config)
+    if mapping.dropped:
+        logger.info(
+            f"{table_name}: not loading CSV columns {', '.join(mapping.dropped)}"
+        )
+    method = choose_method(csv_file, mapping)
+    if method == "passthrough":
+        return csv_file_path, None
+
+    output_dir = transform_dir(table_name, transform_config)
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    output_dir.mkdir(parents=True)
+
+    if allow_pipe and transform_config.get("pipe", False) and hasattr(os, "mkfifo"):
+        pipe_path = output_dir / f"{csv_file.stem}.pipe"
+        os.mkfifo(pipe_path)
+        logger.info(f"Feeding {csv_file.name} to TPT through {pipe_path} ({method})")
+        return str(pipe_path.absolute()), PipeFeed(csv_file, pipe_path, mapping, method)
+
+    output_file = output_dir / csv_file.name
+    with open(output_file, "wb") as output:
+        transform_csv(csv_file, output, mapping, method)
+    logger.info(
+        f"Wrote {csv_file.name} in table column order to {output_file} ({method})"
+    )
+    return str(output_file.absolute()), None
+
+
+def remove_transform(table_name: str, transform_config: dict | None = None) -> None:
+    """Remove any transformed CSV or named pipe of a table."""
+    output_dir = transform_dir(table_name, transform_config)
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
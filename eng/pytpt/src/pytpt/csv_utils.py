@@ -1,12 +1,13 @@
 """Simple CSV discovery functions."""
 
 from pathlib import Path
+from omegaconf import DictConfig
 from .config_utils import load_config as _load_config
 
 
-def load_config():
+def load_config(force_reload: bool = False) -> DictConfig:
     """Load configuration using Hydra."""
-    return _load_config()
+    return _load_config(force_reload=force_reload)
 
 
 def find_csv_files(
@@ -17,9 +18,10 @@ def find_csv_files(
     return list(data_path.glob("*.csv"))
 
 
-def get_table_mapping():
+def get_table_mapping(cfg: DictConfig | None = None):
     """Get CSV to table name mapping from config."""
-    cfg = load_config()
+    if cfg is None:
+        cfg = load_config()
     return dict(cfg.tables)
 
 
@@ -0,0 +1,389 @@
+"""Simple DDL parsing functions."""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .manifest import FileFingerprint, fingerprint_file
+from .scheduler import dependency_levels
+
+# Pattern to match: create table PRD_ADS_PYTHON_NFL_DB.GAME (
+CREATE_TABLE_PATTERN = re.compile(r"create\s+table\s+([\w.\"]+)", re.IGNORECASE)
+
+# Pattern to match: foreign key (GAME_ID) references PRD_ADS_PYTHON_NFL_DB.GAME (GAME_ID)
+FOREIGN_KEY_PATTERN = re.compile(
+    r"foreign\s+key\s*\(([^)]*)\)\s*references\s+([\w.\"]+)\s*(?:\(([^)]*)\))?",
+    re.IGNORECASE,
+)
+
+# Pattern to match: primary key (GAME_ID)
+PRIMARY_KEY_PATTERN = re.compile(r"primary\s+key\s*(?:\(([^)]*)\))?", re.IGNORECASE)
+
+
+# Pattern to match a column definition: GAME_TYPE char(3) character set LATIN
+COLUMN_PATTERN = re.compile(
+    r"^\"?(\w+)\"?\s+(\w+)(?:\s*\(\s*(\d+)(?:\s*,\s*(\d+))?\s*\))?(.*)$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Leading keywords of table level definitions that are not columns
+CONSTRAINT_KEYWORDS = ("constraint", "primary", "foreign", "unique", "check", "index")
+
+# Width of each type when written as delimited text, for types without a length
+DELIMITED_WIDTHS = {
+    "BYTEINT": 4,
+    "SMALLINT": 6,
+    "INTEGER": 11,
+    "INT": 11,
+    "BIGINT": 20,
+    "FLOAT": 30,
+    "REAL": 30,
+    "DATE": 10,
+    "TIME": 15,
+    "TIMESTAMP": 32,
+}
+
+# Bytes per character for character columns in the UTF8 session character set
+UTF8_BYTES_PER_CHAR = 3
+
+
+@dataclass
+class Column:
+    """A column definition parsed from a create table statement."""
+
+    name: str
+    data_type: str
+    length: int | None = None
+    scale: int | None = None
+    nullable: bool = True
+
+    @property
+    def delimited_width(self) -> int:
+        """Maximum width of the column as delimited UTF8 text."""
+        if self.data_type in ("CHAR", "VARCHAR", "CHARACTER"):
+            return (self.length or 1) * UTF8_BYTES_PER_CHAR
+        if self.data_type in ("DECIMAL", "NUMERIC"):
+            # Digits plus sign and decimal point
+            return (self.length or 5) + 2
+        return DELIMITED_WIDTHS.get(self.data_type, 255)
+
+
+def strip_sql_comments(ddl_content: str) -> str:
+    """Remove -- line comments and /* */ block comments from SQL."""
+    ddl_content = re.sub(r"/\*.*?\*/", "", ddl_content, flags=re.DOTALL)
+    return re.sub(r"--[^\n]*", "", ddl_content)
+
+
+def split_top_level(text: str) -> list[str]:
+    """Split text on commas that are not inside parentheses."""
+    parts = []
+    depth = 0
+    current = []
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+
+def table_body(ddl_content: str) -> str:
+    """Get the text between the parentheses of the first create table statement."""
+    ddl_content = strip_sql_comments(ddl_content)
+    table_match = CREATE_TABLE_PATTERN.search(ddl_content)
+    if not table_match:
+        return ""
+
+    start = ddl_content.find("(", table_match.end())
+    if start == -1:
+        return ""
+
+    depth = 0
+    for position in range(start, len(ddl_content)):
+        if ddl_content[position] == "(":
+            depth += 1
+        elif ddl_content[position] == ")":
+            depth -= 1
+            if depth == 0:
+                return ddl_content[start + 1 : position]
+    return ddl_content[start + 1 :]
+
+
+def parse_columns(ddl_content: str) -> list[Column]:
+    """
+    Parse the column definitions of a create table statement.
+
+    Args:
+        ddl_content: The DDL text for one table
+
+    Returns:
+        List of columns in table order (empty if no create table was found)
+    """
+    columns = []
+    for definition in split_top_level(table_body(ddl_content)):
+        if definition.lower().startswith(CONSTRAINT_KEYWORDS):
+            continue
+        column_match = COLUMN_PATTERN.match(definition)
+        if not column_match:
+            continue
+        name, data_type, length, scale, rest = column_match.groups()
+        columns.append(
+            Column(
+                name=name.upper(),
+                data_type=data_type.upper(),
+                length=int(length) if length else None,
+                scale=int(scale) if scale else None,
+                nullable=not re.search(r"\bnot\s+null\b", rest, re.IGNORECASE),
+            )
+        )
+    return columns
+
+
+def normalise_table_name(name: str) -> str:
+    """Strip any database prefix and quotes from a table name and uppercase it."""
+    return name.split(".")[-1].strip('"').upper()
+
+
+def _column_names(text: Optional[str]) -> list[str]:
+    """Split a parenthesised column list such as 'GAME_ID, "TEAM_ID"' into names."""
+    if not text:
+        return []
+    return [name.strip().strip('"').upper() for name in text.split(",") if name.strip()]
+
+
+@dataclass
+class ForeignKey:
+    """A foreign key from columns of one table to another table."""
+
+    columns: list[str]
+    referenced_table: str
+    referenced_columns: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Table:
+    """A table parsed from a create table statement."""
+
+    name: str
+    columns: list[Column] = field(default_factory=list)
+    primary_key: list[str] = field(default_factory=list)
+    foreign_keys: list[ForeignKey] = field(default_factory=list)
+
+    @property
+    def references(self) -> set[str]:
+        """Names of the other tables this table references."""
+        return {
+            foreign_key.referenced_table
+            for foreign_key in self.foreign_keys
+            if foreign_key.referenced_table != self.name
+        }
+
+
+def parse_table(ddl_content: str) -> Optional[Table]:
+    """
+    Parse the first create table statement in some DDL into a Table.
+
+    Foreign keys are read even when they are commented out, as the files in
+    `ddl/` keep them as comments so the tables can be created in any order.
+
+    Args:
+        ddl_content: The DDL text for one table
+
+    Returns:
+        The table, or None if no create table was found
+    """
+    table_match = CREATE_TABLE_PATTERN.search(ddl_content)
+    if not table_match:
+        return None
+
+    table = Table(
+        normalise_table_name(table_match.group(1)), parse_columns(ddl_content)
+    )
+
+    for definition in split_top_level(table_body(ddl_content)):
+        key_match = PRIMARY_KEY_PATTERN.search(definition)
+        if not key_match:
+            continue
+        if definition.lower().startswith(CONSTRAINT_KEYWORDS):
+            table.primary_key = _column_names(key_match.group(1))
+        else:
+            # Column level: GAME_ID integer not null primary key
+            table.primary_key = [definition.split()[0].strip('"').upper()]
+
+    for match in FOREIGN_KEY_PATTERN.finditer(ddl_content):
+        columns, referenced_table, referenced_columns = match.groups()
+        table.foreign_keys.append(
+            ForeignKey(
+                _column_names(columns),
+                normalise_table_name(referenced_table),
+                _column_names(referenced_columns),
+            )
+        )
+
+    return table
+
+
+def parse_table_dependencies(ddl_content: str) -> tuple[str | None, set[str]]:
+    """
+    Parse a single table DDL for the tables it references.
+
+    Args:
+        ddl_content: The DDL text for one table
+
+    Returns:
+        Tuple of the table name (None if no create table was found) and the
+        set of referenced table names
+    """
+    table = parse_table(ddl_content)
+    if table is None:
+        return None, set()
+    return table.name, table.references
+
+
+def split_create_statements(sql: str) -> list[str]:
+    """Split a script into its create table statements, each up to the next one."""
+    starts = [match.start() for match in CREATE_TABLE_PATTERN.finditer(sql)]
+    return [sql[start:end] for start, end in zip(starts, [*starts[1:], len(sql)])]
+
+
+def parse_tables(sql: str) -> list[Table]:
+    """Parse every create table statement in a script."""
+    tables = []
+    for statement in split_create_statements(sql):
+        table = parse_table(statement)
+        if table is not None:
+            tables.append(table)
+    return tables
+
+
+@dataclass
+class Schema:
+    """In-memory model of the tables in a set of DDL files."""
+
+    tables: dict[str, Table] = field(default_factory=dict)
+    _levels: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @property
+    def dependencies(self) -> dict[str, set[str]]:
+        """Table name to the set of referenced table names."""
+        return {name: table.references for name, table in self.tables.items()}
+
+    def load_levels(
+        self, table_names: Optional[Iterable[str]] = None
+    ) -> list[list[str]]:
+        """
+        Group tables into levels that can each be loaded in parallel, parents first.
+
+        Args:
+            table_names: Tables to plan, defaults to every table in the schema
+
+        Returns:
+            Levels of sorted table names
+
+        Raises:
+            ValueError: If the foreign keys contain a cycle
+        """
+        names = sorted(self.tables if table_names is None else set(table_names))
+        key = tuple(names)
+        if key not in self._levels:
+            self._levels[key] = dependency_levels(names, self.dependencies)
+        return [list(level) for level in self._levels[key]]
+
+    def load_order(self, table_names: Optional[Iterable[str]] = None) -> list[str]:
+        """Order tables so each comes after every table it references."""
+        return [name for level in self.load_levels(table_names) for name in level]
+
+
+# Parsed tables of each DDL file, and schemas of each set of files, keyed on content hashes
+_file_cache: dict[str, tuple[FileFingerprint, list[Table]]] = {}
+_schema_cache: dict[tuple, Schema] = {}
+_cache_lock = threading.Lock()
+
+
+def ddl_files(ddl_path: str | Path) -> list[Path]:
+    """List the DDL files in a directory, or the file itself if given a script."""
+    ddl_path = Path(ddl_path)
+    if ddl_path.is_file():
+        return [ddl_path]
+    return sorted(ddl_path.glob("*.sql"))
+
+
+def read_ddl_tables(path: Path) -> tuple[str, list[Table]]:
+    """
+    Parse the tables in a DDL file, reusing the last parse if its content is unchanged.
+
+    Returns:
+        Tuple of the file's content hash and its tables
+    """
+    key = str(Path(path).absolute())
+    with _cache_lock:
+        cached = _file_cache.get(key)
+
+    fingerprint = fingerprint_file(Path(path), cached[0] if cached else None)
+    if cached and cached[0].content_hash == fingerprint.content_hash:
+        tables = cached[1]
+    else:
+        tables = parse_tables(Path(path).read_text(encoding="utf-8"))
+
+    with _cache_lock:
+        _file_cache[key] = (fingerprint, tables)
+    return fingerprint.content_hash, tables
+
+
+def load_schema(*ddl_paths: str | Path) -> Schema:
+    """
+    Load the schema model of some DDL, cached on the content hash of each file.
+
+    Tables defined in more than one file take the later definition. The
+    returned schema is shared between callers and must not be modified.
+
+    Args:
+        *ddl_paths: Directories of one .sql file per table, or scripts with
+            several create table statements (defaults to "ddl")
+
+    Returns:
+        Schema of every table found
+    """
+    files = [path for ddl_path in ddl_paths or ("ddl",) for path in ddl_files(ddl_path)]
+    parsed = [(path, *read_ddl_tables(path)) for path in files]
+    key = tuple(
+        (str(path.absolute()), content_hash) for path, content_hash, _ in parsed
+    )
+
+    with _cache_lock:
+        schema = _schema_cache.get(key)
+        if schema is None:
+            schema = Schema(
+                {table.name: table for _, _, tables in parsed for table in tables}
+            )
+            _schema_cache[key] = schema
+    return schema
+
+
+def clear_schema_cache() -> None:
+    """Forget every parsed DDL file and schema."""
+    with _cache_lock:
+        _file_cache.clear()
+        _schema_cache.clear()
+
+
+def read_table_dependencies(ddl_path: str | Path = "ddl") -> dict[str, set[str]]:
+    """
+    Read the foreign key dependencies of every table in the DDL.
+
+    Args:
+        ddl_path: Directory of one .sql file per table, or a single script
+            with several create table statements (such as python-nfl-ddl.sql)
+
+    Returns:
+        Table name to the set of referenced table names
+    """
+    return load_schema(ddl_path).dependencies
@@ -0,0 +1,351 @@
+"""Parallel export of Teradata tables to partitioned Parquet or gzip CSV files."""
+
+import csv
+import gzip
+import math
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .logging_config import get_logger
+from .sql_reader import FETCH_SIZE
+
+logger = get_logger(__name__)
+
+# Tables in a database with their column counts, as in python-teradata.py
+CATALOG_QUERY = """
+select
+  TableName
+  , count(*) as ColumnCount
+from
+  dbc.columnsv
+where
+  databasename = ?
+group by
+  TableName
+order by
+  TableName
+"""
+
+# Leading integer column of each table's primary key or primary index
+KEY_COLUMNS_QUERY = """
+select
+  i.TableName
+  , i.ColumnName
+from
+  dbc.indicesv i
+  inner join dbc.columnsv c
+    on c.DatabaseName = i.DatabaseName
+    and c.TableName = i.TableName
+    and c.ColumnName = i.ColumnName
+where
+  i.DatabaseName = ?
+  and i.IndexType in ('K', 'P', 'Q')
+  and i.ColumnPosition = 1
+  and trim(c.ColumnType) in ('I', 'I1', 'I2', 'I8')
+order by
+  i.TableName
+  , i.IndexType
+"""
+
+# Export formats and the file suffix of each partition
+FORMATS = {"parquet": ".parquet", "csv": ".csv.gz"}
+
+# Tables with more rows than this are split into slices exported in parallel
+SLICE_ROWS = 1_000_000
+MAX_SLICES = 8
+
+
+@dataclass
+class ExportSlice:
+    """A range of a table exported to one partition file."""
+
+    table_name: str
+    index: int
+    sql: str
+    params: tuple = ()
+
+
+@dataclass
+class TableExportResult:
+    """Outcome of exporting one table."""
+
+    table_name: str
+    rows: int = 0
+    bytes_written: int = 0
+    elapsed: float = 0.0
+    files: list[Path] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def mb_per_sec(self) -> float:
+        """Write throughput in MB per second."""
+        if not self.elapsed:
+            return 0.0
+        return self.bytes_written / (1024 * 1024) / self.elapsed
+
+
+def list_tables(con, database: str) -> list[str]:
+    """List the tables in a database from the catalog."""
+    cursor = con.cursor()
+    try:
+        cursor.execute(CATALOG_QUERY, [database])
+        return [row[0].strip() for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def key_columns(con, database: str) -> dict[str, str]:
+    """Find an integer key column to split each table's export on."""
+    cursor = con.cursor()
+    try:
+        cursor.execute(KEY_COLUMNS_QUERY, [database])
+        keys = {}
+        for table_name, column_name in cursor.fetchall():
+            # Ordered by index type, so a primary key wins over a primary index
+            keys.setdefault(table_name.strip(), column_name.strip())
+        return keys
+    finally:
+        cursor.close()
+
+
+def plan_slices(
+    con,
+    qualified_name: str,
+    table_name: str,
+    key_column: Optional[str],
+    slice_rows: int = SLICE_ROWS,
+    max_slices: int = MAX_SLICES,
+) -> list[ExportSlice]:
+    """
+    Split a table into key ranges of roughly slice_rows rows each.
+
+    The ranges assume keys are spread evenly between their minimum and
+    maximum. Rows with a NULL key are exported with the first slice.
+
+    Args:
+        con: DB-API connection
+        qualified_name: Table name with its database, used in queries
+        table_name: Table name, used to name the output
+        key_column: Integer column to split on, or None to export in one slice
+        slice_rows: Target rows per slice
+        max_slices: Maximum number of slices
+
+    Returns:
+        Slices covering every row of the table
+    """
+    select_all = f"select * from {qualified_name}"
+    if key_column is None:
+        return [ExportSlice(table_name, 0, select_all)]
+
+    cursor = con.cursor()
+    try:
+        cursor.execute(
+            f"select min({key_column}), max({key_column}), count(*) "
+            f"from {qualified_name}"
+        )
+        low, high, row_count = cursor.fetchone()
+    finally:
+        cursor.close()
+
+    slice_count = min(max_slices, math.ceil(row_count / slice_rows)) if row_count else 1
+    if slice_count <= 1 or low is None:
+        return [ExportSlice(table_name, 0, select_all)]
+
+    low, high = int(low), int(high)
+    step = math.ceil((high - low + 1) / slice_count)
+    slices = []
+    for index, start in enumerate(range(low, high + 1, step)):
+        end = min(start + step - 1, high)
+        sql = f"{select_all} where {key_column} between ? and ?"
+        if index == 0:
+            sql += f" or {key_column} is null"
+        slices.append(ExportSlice(table_name, index, sql, (start, end)))
+    return slices
+
+
+def _write_parquet(con, table_slice: ExportSlice, path: Path, fetch_size: int) -> int:
+    """Stream a slice into a Parquet file, returning the number of rows written."""
+    import pyarrow.parquet as pq
+
+    from .sql_reader import read_sql_arrow
+
+    rows = 0
+    writer = None
+    try:
+        for batch in read_sql_arrow(
+            con, table_slice.sql, table_slice.params or None, fetch_size
+        ):
+            if writer is None:
+                writer = pq.ParquetWriter(path, batch.schema, compression="zstd")
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _write_csv(con, table_slice: ExportSlice, path: Path, fetch_size: int) -> int:
+    """Stream a slice into a gzip CSV file, returning the number of rows written."""
+    rows = 0
+    cursor = con.cursor()
+    try:
+        if table_slice.params:
+            cursor.execute(table_slice.sql, table_slice.params)
+        else:
+            cursor.execute(table_slice.sql)
+        with gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6) as f:
+            writer = csv.writer(f)
+            writer.writerow(column[0] for column in cursor.description)
+            while batch := cursor.fetchmany(fetch_size):
+                writer.writerows(batch)
+                rows += len(batch)
+    finally:
+        cursor.close()
+    return rows
+
+
+def export_slice(
+    pool,
+    table_slice: ExportSlice,
+    table_dir: Path,
+    file_format: str = "parquet",
+    fetch_size: int = FETCH_SIZE,
+) -> tuple[int, Optional[Path]]:
+    """
+    Export one slice of a table to a partition file.
+
+    The file is written under a temporary name and renamed once complete.
+
+    Returns:
+        Tuple of the rows written and the partition path, or None if the slice was empty
+    """
+    path = table_dir / f"part-{table_slice.index:05d}{FORMATS[file_format]}"
+    temp_path = path.with_name(path.name + ".tmp")
+    write = _write_parquet if file_format == "parquet" else _write_csv
+
+    try:
+        with pool.connection() as con:
+            rows = write(con, table_slice, temp_path, fetch_size)
+    except Exception:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    if not temp_path.exists():
+        # No batches, so no Parquet file was started
+        return rows, None
+    os.replace(temp_path, path)
+    return rows, path
+
+
+def export_tables(
+    pool,
+    database: str,
+    output_dir: str | Path = "data",
+    file_format: str = "parquet",
+    tables: Optional[Sequence[str]] = None,
+    max_workers: int = 4,
+    slice_rows: int = SLICE_ROWS,
+    max_slices: int = MAX_SLICES,
+    fetch_size: int = FETCH_SIZE,
+) -> list[TableExportResult]:
+    """
+    Export tables to output_dir/<table>/part-NNNNN files using a pool of workers.
+
+    Large tables are split into key ranges that are exported in parallel,
+    and every slice is streamed to disk so memory use stays bounded.
+
+    Args:
+        pool: ConnectionPool the workers check sessions out of
+        database: Database the tables are in
+        output_dir: Directory to write a sub-directory per table to
+        file_format: "parquet" or "csv" (gzip compressed)
+        tables: Tables to export, defaults to every table in the database
+        max_workers: Number of slices exported at the same time
+        slice_rows: Target rows per slice
+        max_slices: Maximum slices per table
+        fetch_size: Rows fetched in each fetchmany call
+
+    Returns:
+        List of results, one per table
+    """
+    if file_format not in FORMATS:
+        raise ValueError(
+            f"Unknown export format '{file_format}', expected one of {list(FORMATS)}"
+        )
+
+    output_dir = Path(output_dir)
+    with pool.connection() as con:
+        table_names = list(tables) if tables else list_tables(con, database)
+        keys = key_columns(con, database)
+        slices = []
+        for table_name in table_names:
+            slices.extend(
+                plan_slices(
+                    con,
+                    f"{database}.{table_name}",
+                    table_name,
+                    keys.get(table_name),
+                    slice_rows,
+                    max_slices,
+                )
+            )
+
+    results = {name: TableExportResult(name) for name in table_names}
+    started: dict[str, float] = {}
+    finished: dict[str, float] = {}
+    lock = threading.Lock()
+
+    for table_name in table_names:
+        table_dir = output_dir / table_name.lower()
+        if table_dir.exists():
+            shutil.rmtree(table_dir)
+        table_dir.mkdir(parents=True)
+
+    def run_slice(table_slice: ExportSlice) -> tuple[int, Optional[Path]]:
+        with lock:
+            started.setdefault(table_slice.table_name, time.perf_counter())
+        try:
+            return export_slice(
+                pool,
+                table_slice,
+                output_dir / table_slice.table_name.lower(),
+                file_format,
+                fetch_size,
+            )
+        finally:
+            with lock:
+                finished[table_slice.table_name] = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_slice, item): item for item in slices}
+        for future in as_completed(futures):
+            result = results[futures[future].table_name]
+            try:
+                rows, path = future.result()
+            except Exception as e:
+                logger.exception(f"Export of {result.table_name} failed: {e}")
+                result.error = str(e)
+                continue
+            result.rows += rows
+            if path is not None:
+                result.files.append(path)
+                result.bytes_written += path.stat().st_size
+
+    for table_name, result in results.items():
+        result.files.sort()
+        if table_name in started:
+            result.elapsed = finished[table_name] - started[table_name]
+        if result.error is None:
+            logger.info(
+                f"Exported {result.rows:,} rows of {table_name} to {len(result.files)} "
+                f"file(s), {result.bytes_written / (1024 * 1024):.2f} MB in "
+                f"{result.elapsed:.2f}s ({result.mb_per_sec:.2f} MB/s)"
+            )
+    return list(results.values())
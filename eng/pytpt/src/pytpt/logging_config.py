@@ -9,14 +9,21 @@ def setup_logging(
     log_dir: str | Path = "logs",
     log_file: str = "pytpt.log",
     log_level: str = "INFO",
+    enqueue: bool = False,
 ) -> None:
     """
     Configure loguru logging for TPT operations.
 
+    In queued mode each sink writes from its own thread, so a log call only
+    puts the message on a queue, and neither file writes nor the compression
+    of a rotated file hold up the loads. Queued messages are written by the
+    time the process exits, or when logger.complete() is called.
+
     Args:
         log_dir: Directory to store log files (default: "logs")
         log_file: Name of the log file to write to (default: "pytpt.log")
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR)
+        enqueue: Write log messages from a queue instead of the calling thread
     """
     # Ensure log directory exists
     log_path = Path(log_dir)
@@ -34,6 +41,7 @@ def setup_logging(
         level=log_level,
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
         colorize=True,
+        enqueue=enqueue,
     )
 
     # Add file handler with detailed format
@@ -44,9 +52,13 @@ def setup_logging(
         rotation="10 MB",
         retention="30 days",
         compression="zip",
+        enqueue=enqueue,
     )
 
-    logger.info(f"Logging configured - Console: {log_level}, File: {full_log_path}")
+    mode = "queued" if enqueue else "direct"
+    logger.info(
+        f"Logging configured - Console: {log_level}, File: {full_log_path} ({mode})"
+    )
 
 
 def get_logger(name: str = None):
@@ -0,0 +1,161 @@
+"""Manifest of loaded CSV files, used to skip tables whose inputs are unchanged."""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# Default location of the manifest file
+MANIFEST_FILE = Path("state") / "load_manifest.json"
+
+# Read files in 1 MiB chunks when hashing
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: Path) -> str:
+    """Hash the content of a file with BLAKE2b."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """Hash a string with BLAKE2b."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def write_json(path: Path, data: dict) -> None:
+    """Write data to a JSON file, replacing the old file atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+@dataclass
+class FileFingerprint:
+    """Size, modification time and content hash of a file."""
+
+    size: int
+    mtime_ns: int
+    content_hash: str
+
+
+@dataclass
+class ManifestEntry:
+    """Inputs and outcome of the last load of a table."""
+
+    csv_file: str
+    fingerprint: FileFingerprint
+    ddl_hash: str
+    success: bool
+    loaded_at: str
+
+
+def fingerprint_file(
+    path: Path,
+    previous: Optional[FileFingerprint] = None,
+) -> FileFingerprint:
+    """
+    Fingerprint a file, reusing the previous hash if size and mtime are unchanged.
+
+    Args:
+        path: File to fingerprint
+        previous: Fingerprint from the last run, if any
+
+    Returns:
+        The file's fingerprint
+    """
+    stat = path.stat()
+    if (
+        previous is not None
+        and previous.size == stat.st_size
+        and previous.mtime_ns == stat.st_mtime_ns
+    ):
+        return previous
+    return FileFingerprint(stat.st_size, stat.st_mtime_ns, hash_file(path))
+
+
+class LoadManifest:
+    """Persistent record of the inputs of each table's last load."""
+
+    def __init__(self, path: str | Path = MANIFEST_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.entries: dict[str, ManifestEntry] = {}
+
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw_entries = json.load(f)
+            for table_name, entry in raw_entries.items():
+                entry["fingerprint"] = FileFingerprint(**entry["fingerprint"])
+                self.entries[table_name] = ManifestEntry(**entry)
+
+    def is_unchanged(
+        self,
+        table_name: str,
+        csv_file: Path,
+        ddl_hash: str,
+    ) -> bool:
+        """
+        Check whether a table was loaded successfully from the same inputs.
+
+        Args:
+            table_name: Name of the target table
+            csv_file: CSV file that would be loaded
+            ddl_hash: Hash of the rendered DDL for the table
+
+        Returns:
+            True if the last load succeeded with the same CSV content and DDL
+        """
+        entry = self.entries.get(table_name)
+        if entry is None or not entry.success or entry.ddl_hash != ddl_hash:
+            return False
+        if entry.csv_file != str(csv_file.absolute()):
+            return False
+
+        previous = entry.fingerprint
+        current = fingerprint_file(csv_file, previous)
+        if current.content_hash != previous.content_hash:
+            return False
+
+        if current is not previous:
+            # Touched but identical, remember the new mtime to skip hashing next time
+            with self._lock:
+                entry.fingerprint = current
+        return True
+
+    def record(
+        self,
+        table_name: str,
+        csv_file: Path,
+        ddl_hash: str,
+        success: bool,
+    ) -> None:
+        """Record the inputs and outcome of a table load."""
+        previous = self.entries.get(table_name)
+        fingerprint = fingerprint_file(
+            csv_file, previous.fingerprint if previous else None
+        )
+        entry = ManifestEntry(
+            csv_file=str(csv_file.absolute()),
+            fingerprint=fingerprint,
+            ddl_hash=ddl_hash,
+            success=success,
+            loaded_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        with self._lock:
+            self.entries[table_name] = entry
+
+    def save(self) -> None:
+        """Write the manifest to disk, replacing the old file atomically."""
+        with self._lock:
+            data = {name: asdict(entry) for name, entry in self.entries.items()}
+        write_json(self.path, data)
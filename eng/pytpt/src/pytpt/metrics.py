@@ -0,0 +1,213 @@
+"""TPT operator statistics parsing, and the id of the current load run."""
+
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Iterable, Optional
+
+# Pattern to match operator lines: $LOAD: ... or $FILE_READER[1]: ...
+OPERATOR_LINE_PATTERN = re.compile(r"^\s*\$(\w+)(?:\[(\d+)\])?:\s*(.*)$")
+
+# Pattern to match: Job start: Mon Sep 29 17:11:32 2025
+JOB_TIME_PATTERN = re.compile(r"^\s*Job (start|end):\s*(.+?)\s*$")
+JOB_TIME_FORMAT = "%a %b %d %H:%M:%S %Y"
+
+# Pattern to match the seconds in: 3 second(s), 1,234.5 seconds or < 1 second
+SECONDS_PATTERN = re.compile(r"(<)?\s*([\d,.]+)\s*second", re.IGNORECASE)
+
+# Operator statistic prefixes (lowercase) mapped to TptMetrics count fields
+COUNT_STATISTICS = {
+    "total rows sent to rdbms": "rows_sent",
+    "total rows applied": "rows_applied",
+    "total rows in error table 1": "error_table_rows",
+    "total rows in error table 2": "uv_table_rows",
+    "total duplicate rows": "duplicate_rows",
+    "number of records processed": "rows_read",
+    "total files processed": "files_processed",
+    "total blocks sent": "blocks_sent",
+    "total bytes sent": "bytes_sent",
+    "number of sessions": "sessions",
+    "sessions connected": "sessions",
+}
+
+# Operator statistic prefixes (lowercase) mapped to TptMetrics elapsed time fields
+ELAPSED_STATISTICS = {
+    "elapsed time from start to acquisition phase": "start_to_acquisition_seconds",
+    "elapsed time in acquisition phase": "acquisition_seconds",
+    "elapsed time in application phase": "application_seconds",
+    "elapsed time from application phase to end": "application_to_end_seconds",
+}
+
+# Counts reported once per reader instance, which are summed
+SUMMED_STATISTICS = {"rows_read", "files_processed"}
+
+
+@dataclass
+class TptMetrics:
+    """Operator statistics from one TPT job."""
+
+    rows_sent: Optional[int] = None
+    rows_applied: Optional[int] = None
+    rows_read: Optional[int] = None
+    error_table_rows: Optional[int] = None
+    uv_table_rows: Optional[int] = None
+    duplicate_rows: Optional[int] = None
+    files_processed: Optional[int] = None
+    sessions: Optional[int] = None
+    blocks_sent: Optional[int] = None
+    bytes_sent: Optional[int] = None
+    start_to_acquisition_seconds: Optional[float] = None
+    acquisition_seconds: Optional[float] = None
+    application_seconds: Optional[float] = None
+    application_to_end_seconds: Optional[float] = None
+    acquisition_mb_per_sec: Optional[float] = None
+    job_seconds: Optional[float] = None
+    operator_cpu_seconds: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def cpu_seconds(self) -> Optional[float]:
+        """Total processor time used across all operators."""
+        if not self.operator_cpu_seconds:
+            return None
+        return sum(self.operator_cpu_seconds.values())
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON serialisable dictionary."""
+        metrics = asdict(self)
+        metrics["cpu_seconds"] = self.cpu_seconds
+        return metrics
+
+
+def _parse_seconds(text: str) -> Optional[float]:
+    """Parse an elapsed time such as '3 second(s)', counting '< 1 second' as 0."""
+    match = SECONDS_PATTERN.search(text)
+    if not match:
+        return None
+    if match.group(1):
+        return 0.0
+    return _parse_float(match.group(2))
+
+
+def _parse_count(text: str) -> Optional[int]:
+    """Parse a count such as '1,234' or '32.' into an integer."""
+    digits = text.strip().rstrip(".").replace(",", "")
+    return int(digits) if digits.isdigit() else None
+
+
+def _parse_float(text: str) -> Optional[float]:
+    """Parse a number such as '1,234.56' into a float, or None if it is not one."""
+    try:
+        return float(text.strip().replace(",", ""))
+    except ValueError:
+        return None
+
+
+class MetricsParser:
+    """Single-pass parser that builds TptMetrics from TPT output lines."""
+
+    def __init__(self):
+        self.metrics = TptMetrics()
+        self._job_start: Optional[datetime] = None
+
+    def feed(self, line: str) -> Optional[str]:
+        """
+        Parse one line of TPT output.
+
+        Args:
+            line: A single line of stdout or stderr
+
+        Returns:
+            Name of the metric the line updated, or None
+        """
+        operator_match = OPERATOR_LINE_PATTERN.match(line)
+        if not operator_match:
+            return self._feed_job_line(line)
+
+        operator, _, text = operator_match.groups()
+        statistic, separator, value = text.partition(":")
+        if not separator:
+            statistic, separator, value = text.partition("=")
+        if not separator:
+            return None
+        statistic = statistic.strip().lower()
+
+        if statistic in COUNT_STATISTICS:
+            name = COUNT_STATISTICS[statistic]
+            count = _parse_count(value)
+            if count is None:
+                return None
+            if name in SUMMED_STATISTICS:
+                count += getattr(self.metrics, name) or 0
+            setattr(self.metrics, name, count)
+            return name
+
+        if statistic in ELAPSED_STATISTICS:
+            name = ELAPSED_STATISTICS[statistic]
+            setattr(self.metrics, name, _parse_seconds(value))
+            return name
+
+        if statistic == "mb/sec in acquisition phase":
+            mb_per_sec = _parse_float(value)
+            if mb_per_sec is None:
+                return None
+            self.metrics.acquisition_mb_per_sec = mb_per_sec
+            return "acquisition_mb_per_sec"
+
+        if statistic == "total processor time used":
+            seconds = _parse_seconds(value)
+            if seconds is not None:
+                cpu = self.metrics.operator_cpu_seconds
+                cpu[operator] = cpu.get(operator, 0.0) + seconds
+            return "operator_cpu_seconds"
+
+        return None
+
+    def _feed_job_line(self, line: str) -> Optional[str]:
+        """Parse the job start and end lines into the job elapsed time."""
+        job_match = JOB_TIME_PATTERN.match(line)
+        if not job_match:
+            return None
+
+        try:
+            timestamp = datetime.strptime(job_match.group(2), JOB_TIME_FORMAT)
+        except ValueError:
+            return None
+
+        if job_match.group(1) == "start":
+            self._job_start = timestamp
+            return None
+        if self._job_start:
+            self.metrics.job_seconds = (timestamp - self._job_start).total_seconds()
+            return "job_seconds"
+        return None
+
+
+def parse_metrics(lines: Iterable[str] | str) -> TptMetrics:
+    """
+    Parse TPT output into a metrics record in a single pass.
+
+    Args:
+        lines: TPT output, either as one string or an iterable of lines
+            (such as an open log file)
+
+    Returns:
+        Parsed metrics
+    """
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+
+    parser = MetricsParser()
+    for line in lines:
+        parser.feed(line)
+    return parser.metrics
+
+
+_run_id: Optional[str] = None
+
+
+def current_run_id() -> str:
+    """Get the identifier of this process's load run, based on its start time."""
+    global _run_id
+    if _run_id is None:
+        _run_id = datetime.now().strftime("%Y%m%dT%H%M%S")
+    return _run_id
@@ -0,0 +1,171 @@
+"""Choose the TPT consumer operator for a table load from its data volume."""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Consumer operators, as named by the TPT operator templates ($LOAD, $UPDATE, ...)
+OPERATORS = ("LOAD", "UPDATE", "STREAM", "INSERTER")
+
+# Defaults for choosing an operator
+INSERTER_MAX_ROWS = 1_000
+STREAM_MAX_ROWS = 100_000
+BULK_MIN_MB = 256
+SAMPLE_BYTES = 64 * 1024
+
+
+@dataclass
+class OperatorThresholds:
+    """Data volumes at which a load moves to a heavier operator."""
+
+    inserter_max_rows: int = INSERTER_MAX_ROWS
+    stream_max_rows: int = STREAM_MAX_ROWS
+    bulk_min_bytes: int = BULK_MIN_MB * 1024 * 1024
+    sample_bytes: int = SAMPLE_BYTES
+
+    @classmethod
+    def from_config(cls, operator_config) -> "OperatorThresholds":
+        """Read the thresholds from the operator config section."""
+        operator_config = operator_config or {}
+        return cls(
+            inserter_max_rows=int(
+                operator_config.get("inserter_max_rows", INSERTER_MAX_ROWS)
+            ),
+            stream_max_rows=int(
+                operator_config.get("stream_max_rows", STREAM_MAX_ROWS)
+            ),
+            bulk_min_bytes=int(
+                float(operator_config.get("bulk_min_mb", BULK_MIN_MB)) * 1024 * 1024
+            ),
+            sample_bytes=int(operator_config.get("sample_kb", SAMPLE_BYTES // 1024))
+            * 1024,
+        )
+
+
+@dataclass
+class OperatorChoice:
+    """The operator chosen for a table load and why."""
+
+    operator: str
+    reason: str
+    csv_bytes: int = 0
+    estimated_rows: int = 0
+
+
+def estimate_csv_rows(csv_file: str | Path, sample_bytes: int = SAMPLE_BYTES) -> int:
+    """
+    Estimate the data rows in a CSV file from the line length of a sample.
+
+    Files no larger than the sample are counted exactly. Larger files are
+    estimated from the average length of the lines in the sample, which
+    is enough to choose an operator without reading the whole file.
+
+    Args:
+        csv_file: CSV file with a header row
+        sample_bytes: Bytes read from the start of the file
+
+    Returns:
+        Estimated number of data rows
+    """
+    csv_file = Path(csv_file)
+    file_size = csv_file.stat().st_size
+    with open(csv_file, "rb") as f:
+        sample = f.read(sample_bytes)
+
+    lines = sample.count(b"\n")
+    if len(sample) >= file_size:
+        if sample and not sample.endswith(b"\n"):
+            lines += 1
+        return max(lines - 1, 0)
+    if lines == 0:
+        # A single line longer than the sample
+        return 1
+    return max(round(file_size * lines / len(sample)) - 1, 0)
+
+
+def choose_operator(
+    csv_bytes: int,
+    estimated_rows: int,
+    target_exists: bool = False,
+    thresholds: Optional[OperatorThresholds] = None,
+) -> OperatorChoice:
+    """
+    Choose the consumer operator for a load.
+
+    Small loads use SQL inserts ($INSERTER) and medium loads $STREAM, neither
+    of which takes a load slot or needs an empty table. Large loads use
+    $LOAD (FastLoad) into a new, empty table, or $UPDATE (MultiLoad) when
+    appending to a table that already exists, which FastLoad cannot do.
+
+    Args:
+        csv_bytes: Size of the CSV file
+        estimated_rows: Estimated data rows in the CSV file
+        target_exists: True if the rows are added to an existing table
+        thresholds: Volumes at which to change operator
+
+    Returns:
+        The chosen operator and the reason for it
+    """
+    thresholds = thresholds or OperatorThresholds()
+    bulk = "UPDATE" if target_exists else "LOAD"
+    target = "existing table" if target_exists else "empty table"
+
+    if csv_bytes >= thresholds.bulk_min_bytes:
+        reason = (
+            f"{csv_bytes / (1024 * 1024):,.1f} MB >= "
+            f"{thresholds.bulk_min_bytes / (1024 * 1024):,.0f} MB into {target}"
+        )
+        return OperatorChoice(bulk, reason, csv_bytes, estimated_rows)
+    if estimated_rows <= thresholds.inserter_max_rows:
+        reason = f"~{estimated_rows:,} rows <= {thresholds.inserter_max_rows:,}"
+        return OperatorChoice("INSERTER", reason, csv_bytes, estimated_rows)
+    if estimated_rows <= thresholds.stream_max_rows:
+        reason = f"~{estimated_rows:,} rows <= {thresholds.stream_max_rows:,}"
+        return OperatorChoice("STREAM", reason, csv_bytes, estimated_rows)
+    reason = f"~{estimated_rows:,} rows > {thresholds.stream_max_rows:,} into {target}"
+    return OperatorChoice(bulk, reason, csv_bytes, estimated_rows)
+
+
+def select_operator(
+    csv_file: str | Path,
+    operator_config=None,
+    target_exists: bool = False,
+) -> OperatorChoice:
+    """
+    Select the operator for loading a CSV file, as set in the operator config.
+
+    Args:
+        csv_file: CSV file to load
+        operator_config: The operator config section, with a mode of "auto"
+            or a fixed operator, and the thresholds used by "auto"
+        target_exists: True if the rows are added to an existing table
+
+    Returns:
+        The chosen operator and the reason for it
+    """
+    operator_config = operator_config or {}
+    mode = str(operator_config.get("mode", "auto")).upper().lstrip("$")
+    if mode in OPERATORS:
+        if mode == "LOAD" and target_exists:
+            logger.warning("$LOAD needs an empty table, using $UPDATE to append")
+            return OperatorChoice("UPDATE", "appending to existing table")
+        return OperatorChoice(mode, "set in config")
+    if mode != "AUTO":
+        raise ValueError(
+            f"Unknown operator mode '{mode}', expected auto or one of {OPERATORS}"
+        )
+
+    csv_file = Path(csv_file)
+    if not csv_file.is_file():
+        # Nothing to measure, so load as before the operator was chosen
+        bulk = "UPDATE" if target_exists else "LOAD"
+        return OperatorChoice(bulk, f"{csv_file.name} not found to measure")
+
+    thresholds = OperatorThresholds.from_config(operator_config)
+    csv_bytes = csv_file.stat().st_size
+    estimated_rows = estimate_csv_rows(csv_file, thresholds.sample_bytes)
+    return choose_operator(csv_bytes, estimated_rows, target_exists, thresholds)
@@ -0,0 +1,318 @@
+"""Thread-safe pool of DB-API connections shared by loaders and readers."""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Query run to check that an idle connection is still usable
+HEALTH_CHECK_SQL = "select 1"
+
+
+@dataclass
+class PoolStats:
+    """Counters describing how a pool has been used."""
+
+    created: int = 0
+    closed: int = 0
+    checkouts: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+    failed_health_checks: int = 0
+
+
+@dataclass
+class _PooledConnection:
+    """A connection with the time it was last used."""
+
+    con: object
+    last_used: float
+    needs_check: bool = False
+
+
+class ConnectionPool:
+    """
+    Pool of connections with a minimum and maximum size.
+
+    Idle connections are health checked before reuse once they have been idle
+    for health_check_interval seconds, and closed once they have been idle for
+    idle_timeout seconds, down to min_size connections.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], object],
+        min_size: int = 1,
+        max_size: int = 4,
+        idle_timeout: float = 300.0,
+        health_check_interval: float = 30.0,
+        acquire_timeout: float = 60.0,
+    ):
+        """
+        Create a pool, opening min_size connections up front.
+
+        Args:
+            connect: Function that opens a new DB-API connection
+            min_size: Connections kept open while idle
+            max_size: Maximum number of open connections
+            idle_timeout: Seconds after which idle connections above min_size are closed
+            health_check_interval: Seconds of idleness after which a connection is checked
+            acquire_timeout: Default seconds to wait for a free connection
+        """
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(f"Invalid pool size: min {min_size}, max {max_size}")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self.stats = PoolStats()
+
+        self._condition = threading.Condition()
+        self._idle: deque[_PooledConnection] = deque()
+        self._in_use: dict[int, _PooledConnection] = {}
+        # Checkouts are served in arrival order so busy threads cannot starve others
+        self._waiters: deque[object] = deque()
+        self._size = 0
+        self._closed = False
+
+        for _ in range(min_size):
+            with self._condition:
+                self._size += 1
+            self._idle.append(self._open())
+
+    @property
+    def size(self) -> int:
+        """Number of open connections, idle or checked out."""
+        with self._condition:
+            return self._size
+
+    @property
+    def idle(self) -> int:
+        """Number of idle connections."""
+        with self._condition:
+            return len(self._idle)
+
+    def _open(self) -> _PooledConnection:
+        """Open a connection for a slot already counted in _size."""
+        try:
+            con = self._connect()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify_all()
+            raise
+        with self._condition:
+            self.stats.created += 1
+        return _PooledConnection(con, time.monotonic())
+
+    def _close(self, pooled: _PooledConnection) -> None:
+        """Close a connection whose slot has already been released."""
+        try:
+            pooled.con.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled connection: {e}")
+        with self._condition:
+            self.stats.closed += 1
+
+    def _is_healthy(self, pooled: _PooledConnection) -> bool:
+        """Run the health check query on a connection."""
+        try:
+            cursor = pooled.con.cursor()
+            try:
+                cursor.execute(HEALTH_CHECK_SQL)
+                cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception as e:
+            logger.warning(f"Pooled connection failed its health check: {e}")
+            return False
+        pooled.needs_check = False
+        return True
+
+    def _evict_idle(self, now: float) -> list[_PooledConnection]:
+        """Remove idle connections past idle_timeout, must be called holding the lock."""
+        evicted = []
+        # The least recently used connections are at the left
+        while (
+            self._idle
+            and self._size > self.min_size
+            and now - self._idle[0].last_used > self.idle_timeout
+        ):
+            evicted.append(self._idle.popleft())
+            self._size -= 1
+        return evicted
+
+    def evict_idle(self) -> int:
+        """Close idle connections past idle_timeout, returning how many were closed."""
+        with self._condition:
+            evicted = self._evict_idle(time.monotonic())
+        for pooled in evicted:
+            self._close(pooled)
+        return len(evicted)
+
+    def acquire(self, timeout: Optional[float] = None) -> object:
+        """
+        Check a connection out of the pool, waiting for one if the pool is full.
+
+        Args:
+            timeout: Seconds to wait, defaults to acquire_timeout
+
+        Returns:
+            A DB-API connection, to be given back with release()
+
+        Raises:
+            TimeoutError: If no connection became free in time
+            RuntimeError: If the pool has been closed
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            pooled = None
+            evicted = []
+            ticket = object()
+            try:
+                with self._condition:
+                    self._waiters.append(ticket)
+                    waited_from = None
+                    while True:
+                        if self._closed:
+                            raise RuntimeError("Connection pool is closed")
+                        now = time.monotonic()
+                        evicted.extend(self._evict_idle(now))
+                        if self._waiters[0] is ticket:
+                            if self._idle:
+                                # Reuse the most recently used connection
+                                pooled = self._idle.pop()
+                                break
+                            if self._size < self.max_size:
+                                self._size += 1
+                                break
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            raise TimeoutError(
+                                f"No connection free after {timeout:.1f}s "
+                                f"(max_size {self.max_size})"
+                            )
+                        if waited_from is None:
+                            waited_from = now
+                            self.stats.waits += 1
+                        self._condition.wait(remaining)
+                    if waited_from is not None:
+                        self.stats.wait_seconds += time.monotonic() - waited_from
+            finally:
+                with self._condition:
+                    self._waiters.remove(ticket)
+                    self._condition.notify_all()
+                # Close evicted connections without holding the lock
+                for stale in evicted:
+                    self._close(stale)
+
+            if pooled is None:
+                pooled = self._open()
+            elif (
+                pooled.needs_check
+                or time.monotonic() - pooled.last_used > self.health_check_interval
+            ):
+                if not self._is_healthy(pooled):
+                    with self._condition:
+                        self.stats.failed_health_checks += 1
+                        self._size -= 1
+                        self._condition.notify_all()
+                    self._close(pooled)
+                    continue
+
+            with self._condition:
+                self.stats.checkouts += 1
+                self._in_use[id(pooled.con)] = pooled
+            return pooled.con
+
+    def release(self, con: object, healthy: bool = True) -> None:
+        """
+        Give a connection back to the pool.
+
+        Args:
+            con: Connection from acquire()
+            healthy: False to health check the connection before it is reused
+        """
+        with self._condition:
+            pooled = self._in_use.pop(id(con))
+            pooled.last_used = time.monotonic()
+            if not healthy:
+                pooled.needs_check = True
+            if self._closed:
+                self._size -= 1
+            else:
+                self._idle.append(pooled)
+                self._condition.notify_all()
+                return
+        self._close(pooled)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[object]:
+        """
+        Check a connection out for the duration of a with block.
+
+        A connection used by a block that raised is health checked before reuse.
+        """
+        con = self.acquire(timeout)
+        healthy = False
+        try:
+            yield con
+            healthy = True
+        finally:
+            self.release(con, healthy)
+
+    def close(self) -> None:
+        """Close idle connections now and checked out connections when released."""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for pooled in idle:
+            self._close(pooled)
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def teradata_pool(
+    host: str,
+    user: str,
+    password: str,
+    database: Optional[str] = None,
+    **pool_kwargs,
+) -> ConnectionPool:
+    """
+    Create a pool of teradatasql connections.
+
+    Args:
+        host: Teradata host name
+        user: User to log on as
+        password: Password for the user
+        database: Default database for the sessions
+        **pool_kwargs: Passed on to ConnectionPool
+
+    Returns:
+        Connection pool
+    """
+    import teradatasql
+
+    params = {"host": host, "user": user, "password": password}
+    if database:
+        params["database"] = database
+    return ConnectionPool(lambda: teradatasql.connect(**params), **pool_kwargs)
@@ -0,0 +1,380 @@
+"""Machine-readable report of a load run, as JSONL and a Prometheus textfile.
+
+The JSONL file, appended each run, is also the history of the TPT operator
+statistics of every step, to compare throughput across runs.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .metrics import TptMetrics
+from .scheduler import TableLoadResult
+
+# Default report outputs; point prometheus at the node-exporter textfile directory
+REPORT_FILE = Path("logs") / "run_report.jsonl"
+PROMETHEUS_FILE = Path("logs") / "pytpt.prom"
+
+
+def _timestamp(epoch: Optional[float]) -> Optional[str]:
+    """Format seconds since the epoch as a local ISO timestamp."""
+    if epoch is None:
+        return None
+    return datetime.fromtimestamp(epoch).isoformat(timespec="milliseconds")
+
+
+@dataclass
+class StepRecord:
+    """One tbuild step of a table load, after any retries."""
+
+    table_name: str
+    step: str
+    started_at: float
+    ended_at: float
+    returncode: int
+    bytes_read: int = 0
+    attempts: int = 1
+    load_operator: Optional[str] = None
+    metrics: TptMetrics = field(default_factory=TptMetrics)
+
+    @property
+    def rows_sent(self) -> Optional[int]:
+        """Rows sent to the RDBMS by the step's last attempt."""
+        return self.metrics.rows_sent
+
+    @property
+    def rows_applied(self) -> Optional[int]:
+        """Rows applied by the step's last attempt."""
+        return self.metrics.rows_applied
+
+    @property
+    def duration(self) -> float:
+        """Seconds from the first attempt starting to the last one ending."""
+        return self.ended_at - self.started_at
+
+    @property
+    def success(self) -> bool:
+        """True if the step's last attempt succeeded."""
+        return self.returncode == 0
+
+    @property
+    def retries(self) -> int:
+        """Attempts after the first."""
+        return max(self.attempts - 1, 0)
+
+
+@dataclass
+class TableRecord:
+    """Outcome of one table in the run."""
+
+    table_name: str
+    csv_file: str
+    status: str  # ok, failed, skipped or unchanged
+    duration: float = 0.0
+    bytes_read: int = 0
+    steps: list[StepRecord] = field(default_factory=list)
+
+    @property
+    def rows_applied(self) -> Optional[int]:
+        """Rows applied by the table's load steps."""
+        rows = [
+            step.rows_applied for step in self.steps if step.rows_applied is not None
+        ]
+        return sum(rows) if rows else None
+
+
+class RunReport:
+    """Collects the steps and tables of a load run, shared by concurrent loads."""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.started_at = time.time()
+        self.ended_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._steps: dict[str, list[StepRecord]] = {}
+        self.tables: list[TableRecord] = []
+
+    def record_step(
+        self,
+        table_name: str,
+        step: str,
+        started_at: float,
+        result,
+        bytes_read: int = 0,
+        load_operator: Optional[str] = None,
+    ) -> StepRecord:
+        """
+        Record a finished step from its TbuildResult.
+
+        A step run again, such as a FastLoad retried from the drop of its
+        table, is merged into its earlier record: the first start is kept,
+        the result is that of the last run, and the attempts of every run
+        are counted.
+
+        Args:
+            table_name: Name of the target table
+            step: Operation of the step, such as drop, create, load or job
+            started_at: Seconds since the epoch when the first attempt started
+            result: TbuildResult of the last attempt
+            bytes_read: Bytes of CSV input the step read
+            load_operator: Consumer operator of a load step
+
+        Returns:
+            The recorded step
+        """
+        record = StepRecord(
+            table_name=table_name,
+            step=step,
+            started_at=started_at,
+            ended_at=time.time(),
+            returncode=result.returncode,
+            bytes_read=bytes_read,
+            attempts=result.attempts,
+            load_operator=load_operator,
+            metrics=result.metrics,
+        )
+        with self._lock:
+            steps = self._steps.setdefault(table_name, [])
+            earlier = next((s for s in steps if s.step == step), None)
+            if earlier is None:
+                steps.append(record)
+                return record
+            record.started_at = earlier.started_at
+            record.attempts += earlier.attempts
+            steps[steps.index(earlier)] = record
+        return record
+
+    def record_tables(
+        self,
+        results: Iterable[TableLoadResult],
+        unchanged: Iterable[tuple[Path, str]] = (),
+    ) -> None:
+        """Record the outcome of every table, including those left unchanged."""
+        for result in results:
+            if result.skipped:
+                status = "skipped"
+            else:
+                status = "ok" if result.success else "failed"
+            self._add_table(result.table_name, result.csv_file, status, result.elapsed)
+        for csv_file, table_name in unchanged:
+            self._add_table(table_name, csv_file, "unchanged")
+        self.ended_at = time.time()
+
+    def _add_table(
+        self, table_name: str, csv_file: Path, status: str, duration: float = 0.0
+    ) -> None:
+        with self._lock:
+            steps = self._steps.get(table_name, [])
+        self.tables.append(
+            TableRecord(
+                table_name=table_name,
+                csv_file=str(csv_file),
+                status=status,
+                duration=duration,
+                bytes_read=max((step.bytes_read for step in steps), default=0),
+                steps=steps,
+            )
+        )
+
+    @property
+    def duration(self) -> float:
+        """Seconds from the report being created to the tables being recorded."""
+        return (self.ended_at or time.time()) - self.started_at
+
+    def records(self) -> list[dict]:
+        """
+        The report as JSON serialisable records: steps, then tables, then the run.
+
+        Each step record has the TPT operator statistics of its last attempt.
+        """
+        records = []
+        for table in self.tables:
+            for step in table.steps:
+                record = asdict(step)
+                del record["metrics"]
+                record.update(step.metrics.to_dict())
+                record.update(
+                    started_at=_timestamp(step.started_at),
+                    ended_at=_timestamp(step.ended_at),
+                    duration_seconds=round(step.duration, 3),
+                    retries=step.retries,
+                    success=step.success,
+                )
+                records.append({"record": "step", "run_id": self.run_id, **record})
+
+        for table in self.tables:
+            records.append(
+                {
+                    "record": "table",
+                    "run_id": self.run_id,
+                    "table_name": table.table_name,
+                    "csv_file": table.csv_file,
+                    "status": table.status,
+                    "duration_seconds": round(table.duration, 3),
+                    "bytes_read": table.bytes_read,
+                    "rows_applied": table.rows_applied,
+                    "retries": sum(step.retries for step in table.steps),
+                }
+            )
+
+        statuses = [table.status for table in self.tables]
+        records.append(
+            {
+                "record": "run",
+                "run_id": self.run_id,
+                "started_at": _timestamp(self.started_at),
+                "ended_at": _timestamp(self.ended_at),
+                "duration_seconds": round(self.duration, 3),
+                "tables": {
+                    status: statuses.count(status)
+                    for status in ("ok", "failed", "skipped", "unchanged")
+                },
+                "bytes_read": sum(table.bytes_read for table in self.tables),
+                "rows_applied": sum(table.rows_applied or 0 for table in self.tables),
+            }
+        )
+        return records
+
+    def write_jsonl(self, path: str | Path = REPORT_FILE) -> None:
+        """Append the report to a JSONL file, one record per line."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for record in self.records():
+                f.write(json.dumps(record) + "\n")
+
+    def prometheus_text(self) -> str:
+        """The report in the Prometheus text exposition format."""
+        metrics: dict[str, tuple[str, list[str]]] = {}
+
+        def add(name: str, help_text: str, value, **labels) -> None:
+            if value is None:
+                return
+            label_text = ",".join(
+                f'{key}="{_escape_label(str(label))}"' for key, label in labels.items()
+            )
+            sample = f"pytpt_{name}{{{label_text}}}" if labels else f"pytpt_{name}"
+            metrics.setdefault(name, (help_text, []))[1].append(f"{sample} {value}")
+
+        add("run_timestamp_seconds", "End time of the last load run.", self.ended_at)
+        add("run_duration_seconds", "Duration of the last load run.", self.duration)
+        statuses = [table.status for table in self.tables]
+        for status in ("ok", "failed", "skipped", "unchanged"):
+            add(
+                "run_tables",
+                "Tables in the last load run by status.",
+                statuses.count(status),
+                status=status,
+            )
+
+        for table in self.tables:
+            name = table.table_name
+            add(
+                "table_success",
+                "1 if the table loaded or was unchanged, 0 if not.",
+                int(table.status in ("ok", "unchanged")),
+                table=name,
+            )
+            if table.status == "unchanged":
+                continue
+            add(
+                "table_duration_seconds",
+                "Duration of the table load.",
+                table.duration,
+                table=name,
+            )
+            add("table_bytes_read", "Bytes of CSV read.", table.bytes_read, table=name)
+            add(
+                "table_rows_applied",
+                "Rows applied to the table.",
+                table.rows_applied,
+                table=name,
+            )
+            if table.rows_applied is not None and table.duration > 0:
+                add(
+                    "table_rows_per_second",
+                    "Rows applied per second of the table load.",
+                    round(table.rows_applied / table.duration, 3),
+                    table=name,
+                )
+            for step in table.steps:
+                labels = {"table": name, "step": step.step}
+                add(
+                    "step_duration_seconds",
+                    "Duration of the step, including retries.",
+                    round(step.duration, 3),
+                    **labels,
+                )
+                add(
+                    "step_returncode",
+                    "tbuild return code of the step's last attempt.",
+                    step.returncode,
+                    **labels,
+                )
+                add(
+                    "step_retries",
+                    "Retries of the step.",
+                    step.retries,
+                    **labels,
+                )
+                add(
+                    "step_rows_sent",
+                    "Rows sent to the database by the step.",
+                    step.rows_sent,
+                    **labels,
+                )
+                add(
+                    "step_rows_applied",
+                    "Rows applied by the step.",
+                    step.rows_applied,
+                    **labels,
+                )
+
+        lines = []
+        for name, (help_text, samples) in metrics.items():
+            lines.append(f"# HELP pytpt_{name} {help_text}")
+            lines.append(f"# TYPE pytpt_{name} gauge")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | Path = PROMETHEUS_FILE) -> None:
+        """Write the report as a node-exporter textfile, replacing the old one atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written alongside, so the collector never reads a partial file
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(temp_path, path)
+
+
+def read_step_records(
+    path: str | Path = REPORT_FILE,
+    table_name: Optional[str] = None,
+) -> list[dict]:
+    """Read the step records of every run, oldest first, optionally for one table."""
+    path = Path(path)
+    if not path.exists():
+        return []
+
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record["record"] != "step":
+                continue
+            if table_name is None or record["table_name"] == table_name:
+                records.append(record)
+    return records
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,163 @@
+"""Bulk reset of tables, deleting or dropping them in foreign key order."""
+
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from .logging_config import get_logger
+from .scheduler import dependency_levels
+
+logger = get_logger(__name__)
+
+# Reset modes: empty the tables or drop them
+RESET_MODES = ("delete", "drop")
+
+# Error tables TPT creates alongside each loaded table
+ERROR_TABLE_SUFFIXES = ("_ET", "_UV")
+
+# Teradata error code for an object that does not exist
+OBJECT_NOT_FOUND = "3807"
+
+
+@dataclass
+class ResetResult:
+    """Outcome of one reset request, covering one or more tables of a level."""
+
+    level: int
+    tables: list[str]
+    success: bool
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+def qualify(table_name: str, database: Optional[str] = None) -> str:
+    """Prefix a table name with its database, if given."""
+    return f"{database}.{table_name}" if database else table_name
+
+
+def reset_statements(
+    table_name: str,
+    mode: str = "delete",
+    database: Optional[str] = None,
+) -> list[str]:
+    """Build the statements that reset a table."""
+    name = qualify(table_name, database)
+    if mode == "delete":
+        return [f"delete {name} all"]
+    if mode == "drop":
+        return [f"drop table {name}"]
+    raise ValueError(f"Unknown reset mode '{mode}', expected one of {RESET_MODES}")
+
+
+def _execute_request(pool, statements: list[str]) -> None:
+    """Send statements to the database as one multi-statement request."""
+    with pool.connection() as con:
+        cursor = con.cursor()
+        try:
+            cursor.execute(";\n".join(statements))
+        finally:
+            cursor.close()
+
+
+def drop_error_tables(pool, table_name: str, database: Optional[str] = None) -> None:
+    """Drop a table's TPT error tables, ignoring any that do not exist."""
+    for suffix in ERROR_TABLE_SUFFIXES:
+        try:
+            # Separate requests, so a missing table does not fail the others
+            _execute_request(
+                pool, [f"drop table {qualify(table_name + suffix, database)}"]
+            )
+        except Exception as e:
+            if OBJECT_NOT_FOUND not in str(e):
+                raise
+
+
+def reset_tables(
+    pool,
+    table_names: list[str],
+    dependencies: dict[str, set[str]],
+    mode: str = "delete",
+    database: Optional[str] = None,
+    max_workers: int = 4,
+    tables_per_request: Optional[int] = None,
+    include_error_tables: bool = False,
+) -> list[ResetResult]:
+    """
+    Delete all rows from, or drop, tables level by level in foreign key order.
+
+    Tables that reference others are reset first. The tables of each level
+    are split into up to max_workers requests that run concurrently, and the
+    next level starts once the whole level is done. Deletes are batched into
+    multi-statement requests; drops, being DDL, are sent one per request.
+    Nothing more is reset after a request fails, as the tables it references
+    would still be referenced.
+
+    Args:
+        pool: ConnectionPool the requests check sessions out of
+        table_names: Tables to reset
+        dependencies: Table name to referenced table names, from the DDL
+        mode: "delete" to run DELETE ALL, "drop" to drop the tables
+        database: Database the tables are in
+        max_workers: Maximum number of concurrent requests
+        tables_per_request: Tables deleted per request, defaults to spreading
+            each level evenly over max_workers requests
+        include_error_tables: Also drop each table's _ET and _UV error tables
+
+    Returns:
+        List of results, one per request, in the order they ran
+    """
+    if mode not in RESET_MODES:
+        raise ValueError(f"Unknown reset mode '{mode}', expected one of {RESET_MODES}")
+
+    levels = dependency_levels(table_names, dependencies)
+    results = []
+
+    def run(level: int, tables: list[str]) -> ResetResult:
+        statements = [
+            statement
+            for table_name in tables
+            for statement in reset_statements(table_name, mode, database)
+        ]
+        start = time.perf_counter()
+        try:
+            _execute_request(pool, statements)
+            if include_error_tables:
+                for table_name in tables:
+                    drop_error_tables(pool, table_name, database)
+        except Exception as e:
+            logger.error(f"Failed to {mode} {', '.join(tables)}: {e}")
+            return ResetResult(
+                level, tables, False, time.perf_counter() - start, str(e)
+            )
+        return ResetResult(level, tables, True, time.perf_counter() - start)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Children first, so no table is reset while another still references it
+        for level, tables in reversed(list(enumerate(levels))):
+            if mode == "drop":
+                # Teradata only allows one DDL statement per request
+                per_request = 1
+            else:
+                per_request = tables_per_request or math.ceil(len(tables) / max_workers)
+            groups = [
+                tables[start : start + per_request]
+                for start in range(0, len(tables), per_request)
+            ]
+            logger.info(
+                f"Reset level {level}: {mode} {', '.join(tables)} "
+                f"in {len(groups)} request(s)"
+            )
+            level_results = list(executor.map(lambda group: run(level, group), groups))
+            results.extend(level_results)
+
+            if not all(result.success for result in level_results):
+                skipped = [table for lower in levels[:level] for table in lower]
+                if skipped:
+                    logger.error(
+                        f"Not resetting referenced tables: {', '.join(skipped)}"
+                    )
+                break
+
+    return results
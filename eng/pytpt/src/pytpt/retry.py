@@ -0,0 +1,233 @@
+"""Classify failed tbuild jobs as retryable or fatal, and retry the retryable ones."""
+
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional
+
+from .logging_config import get_logger
+
+if TYPE_CHECKING:
+    # tpt_runner retries its steps with this module
+    from .tpt_runner import TbuildResult
+
+logger = get_logger(__name__)
+
+# Semaphore held by each thread that it gives up while waiting to retry
+_backoff = threading.local()
+
+# Teradata and CLI error codes of conditions that clear up by themselves
+RETRYABLE_ERROR_CODES = {
+    210: "network connection to the database failed",
+    2631: "transaction aborted due to deadlock",
+    2633: "too many load/unload tasks running",
+    2639: "too many simultaneous transactions",
+    2825: "database restarted before the request finished",
+    2826: "request output lost in a database restart",
+    2828: "request aborted by a database restart",
+    3111: "transaction timed out by the dispatcher",
+    3120: "request aborted by database recovery",
+    3598: "concurrent change conflict on the database",
+    8024: "all virtual circuits in use",
+}
+
+# Error codes that a retry cannot fix, checked first
+FATAL_ERROR_CODES = {
+    2652: "table is being loaded by an earlier job",
+    3523: "user lacks a privilege",
+    3524: "user lacks a privilege",
+    3706: "syntax error",
+    3807: "object does not exist",
+    8017: "user id or password invalid",
+}
+
+# Codes of DDLErrorList in scripts/jobvars-template.jvar, which the DDL operator
+# ignores; TPT still prints them, such as 3807 for each drop of a table that
+# does not exist, so they say nothing about why a job failed
+IGNORED_DDL_ERROR_CODES = {3706, 3802, 3807}
+
+# Messages of transient conditions that carry no error code
+RETRYABLE_MESSAGES = [
+    (re.compile(r"too many load/unload tasks", re.IGNORECASE), "no free load slot"),
+    (re.compile(r"deadlock", re.IGNORECASE), "deadlock"),
+    (
+        re.compile(r"(?:logon|connect)\w* (?:failed|failure|timed out)", re.IGNORECASE),
+        "session logon failed",
+    ),
+    (re.compile(r"teradata (?:database )?restart", re.IGNORECASE), "database restart"),
+]
+
+# Error code in messages such as "RDBMS error 2631:" or "CLI error: 210"
+ERROR_CODE_PATTERN = re.compile(r"\berror\b\W{0,3}(\d{3,5})\b", re.IGNORECASE)
+
+
+@dataclass
+class Failure:
+    """Why a tbuild job failed and whether it is worth retrying."""
+
+    retryable: bool
+    reason: str
+    error_code: Optional[int] = None
+
+
+def classify(
+    result: "TbuildResult",
+    retry_returncodes: Iterable[int] = (),
+    ignored_codes: Iterable[int] = IGNORED_DDL_ERROR_CODES,
+) -> Failure:
+    """
+    Classify a failed tbuild job from its error messages and return code.
+
+    Error codes in the output decide first, fatal before retryable, then
+    messages of transient conditions. A job with neither is retried only
+    if its return code is one of retry_returncodes.
+
+    Args:
+        result: Result of the failed job
+        retry_returncodes: Return codes to retry when the output gives no reason
+        ignored_codes: Error codes the job was told to ignore, which are
+            skipped (default: those of DDLErrorList in the jobvars template)
+
+    Returns:
+        The failure classification
+    """
+    lines = result.error_lines + result.stderr_tail
+    ignored_codes = set(ignored_codes)
+    codes = [
+        int(match.group(1))
+        for line in lines
+        for match in ERROR_CODE_PATTERN.finditer(line)
+        if int(match.group(1)) not in ignored_codes
+    ]
+
+    for code in codes:
+        if code in FATAL_ERROR_CODES:
+            return Failure(False, f"error {code}: {FATAL_ERROR_CODES[code]}", code)
+    for code in codes:
+        if code in RETRYABLE_ERROR_CODES:
+            return Failure(True, f"error {code}: {RETRYABLE_ERROR_CODES[code]}", code)
+    for line in lines:
+        for pattern, reason in RETRYABLE_MESSAGES:
+            if pattern.search(line):
+                return Failure(True, reason)
+
+    if result.returncode in set(retry_returncodes):
+        return Failure(True, f"return code {result.returncode}")
+    reason = f"return code {result.returncode}"
+    if codes:
+        reason += f", error {codes[0]}"
+    return Failure(False, reason, codes[0] if codes else None)
+
+
+@dataclass
+class RetryPolicy:
+    """How often and how long to wait before retrying a retryable failure."""
+
+    max_retries: int = 3
+    backoff: float = 5.0
+    max_backoff: float = 300.0
+    jitter: float = 0.5
+
+    @classmethod
+    def from_config(cls, retry_config) -> "RetryPolicy":
+        """Read the policy from the retry config section."""
+        retry_config = retry_config or {}
+        return cls(
+            max_retries=int(retry_config.get("max_retries", 3)),
+            backoff=float(retry_config.get("backoff", 5.0)),
+            max_backoff=float(retry_config.get("max_backoff", 300.0)),
+            jitter=float(retry_config.get("jitter", 0.5)),
+        )
+
+    def delay(
+        self, attempt: int, random_fraction: Callable[[], float] = random.random
+    ) -> float:
+        """
+        Seconds to wait after a failed attempt, doubling each time up to max_backoff.
+
+        Up to a jitter fraction of the delay is taken off at random, so jobs
+        that failed together, such as on a shortage of load slots, do not all
+        retry at the same moment.
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * random_fraction())
+
+
+@contextmanager
+def release_during_backoff(semaphore: threading.Semaphore) -> Iterator[None]:
+    """
+    Give up a semaphore held by this thread while it waits to retry a job.
+
+    A table load waiting out its backoff then leaves its host slot to the
+    loads queued behind it.
+    """
+    _backoff.semaphore = semaphore
+    try:
+        yield
+    finally:
+        _backoff.semaphore = None
+
+
+def backoff_sleep(seconds: float) -> None:
+    """Wait before a retry, releasing the semaphore this thread holds meanwhile."""
+    semaphore = getattr(_backoff, "semaphore", None)
+    if semaphore is None:
+        time.sleep(seconds)
+        return
+    semaphore.release()
+    try:
+        time.sleep(seconds)
+    finally:
+        semaphore.acquire()
+
+
+def run_with_retries(
+    run: Callable[[], "TbuildResult"],
+    policy: Optional[RetryPolicy] = None,
+    description: str = "tbuild job",
+    sleep: Optional[Callable[[float], None]] = None,
+) -> "TbuildResult":
+    """
+    Run a tbuild job, running it again after each retryable failure.
+
+    Args:
+        run: Runs the job once and returns its result
+        policy: Retry policy, by default 3 retries from a 5 second backoff
+        description: What the job does, for the log
+        sleep: Function to wait with (default: backoff_sleep)
+
+    Returns:
+        Result of the last attempt, with the number of attempts made
+    """
+    policy = policy or RetryPolicy()
+    sleep = sleep or backoff_sleep
+    attempt = 1
+    while True:
+        result = run()
+        result.attempts = attempt
+        if result.success:
+            return result
+
+        failure = classify(result)
+        if not failure.retryable:
+            if attempt > 1:
+                logger.error(f"{description} failed, not retrying: {failure.reason}")
+            return result
+        if attempt > policy.max_retries:
+            if policy.max_retries:
+                logger.error(
+                    f"{description} still failing after {policy.max_retries} "
+                    f"retries: {failure.reason}"
+                )
+            return result
+
+        delay = policy.delay(attempt)
+        logger.warning(
+            f"{description} failed ({failure.reason}), retrying in {delay:.1f}s "
+            f"({attempt}/{policy.max_retries})"
+        )
+        sleep(delay)
+        attempt += 1
@@ -0,0 +1,250 @@
+"""Compressed, append-only archive of the TPT output of every job in a run."""
+
+import gzip
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Default location of the run archives and their index
+ARCHIVE_DIR = Path("logs") / "archive"
+INDEX_FILE_NAME = "index.jsonl"
+
+# Default number of runs kept
+KEEP_RUNS = 20
+
+# File suffix of each compression
+SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+@dataclass
+class ArchiveEntry:
+    """Where the output of one job attempt is in a run archive."""
+
+    run_id: str
+    table: str
+    step: str
+    attempt: int
+    archive: str
+    offset: int
+    length: int
+    size: int
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    """Compress data as one self-contained gzip member or zstd frame."""
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor().compress(data)
+    return gzip.compress(data)
+
+
+def _compression_of(archive_name: str) -> str:
+    """Compression of an archive from its file suffix."""
+    for compression, suffix in SUFFIXES.items():
+        if archive_name.endswith(suffix):
+            return compression
+    raise ValueError(f"Unknown archive type: {archive_name}")
+
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    """Decompress one gzip member or zstd frame."""
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class RunArchive:
+    """
+    One compressed file per run holding the output of every job, with an index.
+
+    The output of each job is compressed on its own and appended to its run's
+    file, so one job can be read back by seeking to its offset without
+    decompressing the rest. The members concatenate into a valid gzip or zstd
+    stream, so ``zcat`` reads a whole run. The index, one JSON line per job,
+    is shared by all runs and maps (run_id, table, step, attempt) to where the
+    job's output is.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path = ARCHIVE_DIR,
+        compression: str = "gzip",
+        keep_runs: int = KEEP_RUNS,
+    ):
+        if compression not in SUFFIXES:
+            raise ValueError(
+                f"Unknown compression '{compression}', expected one of {list(SUFFIXES)}"
+            )
+        self.directory = Path(directory)
+        self.compression = compression
+        self.keep_runs = keep_runs
+        self.index_file = self.directory / INDEX_FILE_NAME
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, archive_config) -> Optional["RunArchive"]:
+        """Create the archive from the archive config section, or None if disabled."""
+        if not archive_config or not archive_config.get("enabled", False):
+            return None
+        return cls(
+            archive_config.get("dir", ARCHIVE_DIR),
+            archive_config.get("compression", "gzip"),
+            int(archive_config.get("keep_runs", KEEP_RUNS)),
+        )
+
+    def archive_file(self, run_id: str) -> Path:
+        """Path of a run's archive."""
+        return self.directory / f"{run_id}.tpt.log{SUFFIXES[self.compression]}"
+
+    def add(
+        self, run_id: str, table: str, step: str, data: bytes, attempt: int = 1
+    ) -> ArchiveEntry:
+        """
+        Append the output of a job to its run's archive and index it.
+
+        Args:
+            run_id: Identifier of the load run
+            table: Name of the target table
+            step: Operation of the job, such as drop, create, load or job
+            data: The job's output
+            attempt: Attempt of the job, from 1
+
+        Returns:
+            The index entry of the output
+        """
+        compressed = _compress(data, self.compression)
+        archive_file = self.archive_file(run_id)
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(archive_file, "ab") as f:
+                offset = f.tell()
+                f.write(compressed)
+            entry = ArchiveEntry(
+                run_id,
+                table,
+                step,
+                attempt,
+                archive_file.name,
+                offset,
+                len(compressed),
+                len(data),
+            )
+            with open(self.index_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(asdict(entry)) + "\n")
+        return entry
+
+    def add_file(
+        self,
+        run_id: str,
+        table: str,
+        step: str,
+        log_file: Path,
+        attempt: int = 1,
+    ) -> Optional[ArchiveEntry]:
+        """Move a job's log file into the archive, returning its entry or None if missing."""
+        try:
+            data = log_file.read_bytes()
+        except FileNotFoundError:
+            return None
+        entry = self.add(run_id, table, step, data, attempt)
+        log_file.unlink()
+        logger.debug(
+            f"Archived {table} {step} output to {entry.archive} at offset {entry.offset}"
+        )
+        return entry
+
+    def entries(
+        self,
+        run_id: Optional[str] = None,
+        table: Optional[str] = None,
+        step: Optional[str] = None,
+    ) -> list[ArchiveEntry]:
+        """Index entries in the order they were added, optionally filtered."""
+        if not self.index_file.exists():
+            return []
+        entries = []
+        with open(self.index_file, "r", encoding="utf-8") as f:
+            for line in f:
+                entry = ArchiveEntry(**json.loads(line))
+                if run_id is not None and entry.run_id != run_id:
+                    continue
+                if table is not None and entry.table != table:
+                    continue
+                if step is not None and entry.step != step:
+                    continue
+                entries.append(entry)
+        return entries
+
+    def runs(self) -> list[str]:
+        """Run ids in the archive, oldest first."""
+        return list(dict.fromkeys(entry.run_id for entry in self.entries()))
+
+    def read(
+        self,
+        run_id: str,
+        table: str,
+        step: str,
+        attempt: Optional[int] = None,
+    ) -> str:
+        """
+        Read the output of one job from the archive.
+
+        Args:
+            run_id: Identifier of the load run
+            table: Name of the target table
+            step: Operation of the job
+            attempt: Attempt to read (default: the last one)
+
+        Returns:
+            The job's output
+
+        Raises:
+            KeyError: If the archive has no such job
+        """
+        entries = [
+            entry
+            for entry in self.entries(run_id, table, step)
+            if attempt is None or entry.attempt == attempt
+        ]
+        if not entries:
+            raise KeyError(f"No output of {table} {step} in run {run_id}")
+        entry = entries[-1]
+        with open(self.directory / entry.archive, "rb") as f:
+            f.seek(entry.offset)
+            data = f.read(entry.length)
+        data = _decompress(data, _compression_of(entry.archive))
+        return data.decode("utf-8", errors="replace")
+
+    def apply_retention(self) -> list[str]:
+        """Delete all but the newest keep_runs runs, returning the deleted run ids."""
+        with self._lock:
+            runs = self.runs()
+            expired = runs[: max(len(runs) - self.keep_runs, 0)]
+            if not expired:
+                return []
+
+            entries = self.entries()
+            kept = [entry for entry in entries if entry.run_id not in expired]
+            expired_files = {
+                entry.archive for entry in entries if entry.run_id in expired
+            }
+            temp_path = self.index_file.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for entry in kept:
+                    f.write(json.dumps(asdict(entry)) + "\n")
+            os.replace(temp_path, self.index_file)
+
+            for archive_name in expired_files:
+                (self.directory / archive_name).unlink(missing_ok=True)
+        logger.info(f"Removed {len(expired)} old runs from the TPT output archive")
+        return expired
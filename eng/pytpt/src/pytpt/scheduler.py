@@ -0,0 +1,315 @@
+"""Dependency-aware parallel scheduling of table loads."""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from .logging_config import get_logger
+from .retry import release_during_backoff
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class TableLoadResult:
+    """Outcome of loading a single table."""
+
+    table_name: str
+    csv_file: Path
+    success: bool
+    elapsed: float = 0.0
+    skipped: bool = False
+
+
+class HostSlots:
+    """Limit the number of concurrent TPT jobs against each host."""
+
+    def __init__(self, max_jobs_per_host: int):
+        self.max_jobs_per_host = max_jobs_per_host
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+
+    def slot(self, host: str) -> threading.BoundedSemaphore:
+        """Get the semaphore guarding job slots for a host."""
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(
+                    self.max_jobs_per_host
+                )
+            return self._semaphores[host]
+
+
+def resolve_dependencies(
+    table_names: list[str],
+    dependencies: dict[str, set[str]],
+) -> dict[str, set[str]]:
+    """
+    Restrict dependencies to the tables being loaded and check for cycles.
+
+    Args:
+        table_names: Tables included in this run
+        dependencies: Table name to referenced table names, from the DDL
+
+    Returns:
+        Table name to the set of parent tables that are part of this run
+
+    Raises:
+        ValueError: If the dependencies contain a cycle
+    """
+    resolved = _included_parents(table_names, dependencies)
+
+    # Only to confirm every table can eventually run
+    _topological_levels(resolved)
+
+    return resolved
+
+
+def _included_parents(
+    table_names: list[str],
+    dependencies: dict[str, set[str]],
+) -> dict[str, set[str]]:
+    """Restrict each table's parents to the other tables being loaded."""
+    included = set(table_names)
+    return {
+        table: {
+            parent
+            for parent in dependencies.get(table, set())
+            if parent in included and parent != table
+        }
+        for table in table_names
+    }
+
+
+def _topological_levels(parents: dict[str, set[str]]) -> list[list[str]]:
+    """
+    Group tables into levels with Kahn's algorithm, in time linear in the graph size.
+
+    Raises:
+        ValueError: If the dependencies contain a cycle
+    """
+    children: dict[str, list[str]] = {table: [] for table in parents}
+    waiting = {}
+    for table, table_parents in parents.items():
+        waiting[table] = len(table_parents)
+        for parent in table_parents:
+            children[parent].append(table)
+
+    levels = []
+    level = sorted(table for table, count in waiting.items() if count == 0)
+    placed = 0
+    while level:
+        levels.append(level)
+        placed += len(level)
+        next_level = []
+        for table in level:
+            for child in children[table]:
+                waiting[child] -= 1
+                if waiting[child] == 0:
+                    next_level.append(child)
+        level = sorted(next_level)
+
+    if placed < len(parents):
+        remaining = sorted(table for table, count in waiting.items() if count > 0)
+        raise ValueError(f"Circular table dependencies: {', '.join(remaining)}")
+
+    return levels
+
+
+def dependency_levels(
+    table_names: list[str],
+    dependencies: dict[str, set[str]],
+) -> list[list[str]]:
+    """
+    Group tables into levels where each table comes after every table it references.
+
+    Tables in the same level do not depend on each other, so can be loaded
+    (or, in reverse level order, emptied) concurrently.
+
+    Args:
+        table_names: Tables to group
+        dependencies: Table name to referenced table names, from the DDL
+
+    Returns:
+        Levels of sorted table names, parents first
+
+    Raises:
+        ValueError: If the dependencies contain a cycle
+    """
+    return _topological_levels(_included_parents(table_names, dependencies))
+
+
+def load_priorities(
+    parents: dict[str, set[str]],
+    table_sizes: dict[str, int],
+) -> dict[str, int]:
+    """
+    Bytes on the largest chain of loads from each table to the end of the plan.
+
+    A table without children is ranked by its own size, and a parent by its
+    size plus that of its largest chain of descendants, so the loads the
+    plan waits longest for start first.
+
+    Args:
+        parents: Table name to the parents it waits for, without cycles
+        table_sizes: Table name to bytes to load
+
+    Returns:
+        Table name to priority, larger first
+    """
+    children: dict[str, list[str]] = {table: [] for table in parents}
+    for table, table_parents in parents.items():
+        for parent in table_parents:
+            children[parent].append(table)
+
+    priorities: dict[str, int] = {}
+    # Children before their parents, so each child's priority is known
+    for level in reversed(_topological_levels(parents)):
+        for table in level:
+            priorities[table] = table_sizes.get(table, 0) + max(
+                (priorities[child] for child in children[table]), default=0
+            )
+    return priorities
+
+
+def run_load_plan(
+    mapped_files: list[tuple[Path, str]],
+    dependencies: dict[str, set[str]],
+    load_fn: Callable[[str, str], bool],
+    max_workers: int = 4,
+    max_jobs_per_host: int = 2,
+    host: str = "default",
+    table_sizes: dict[str, int] | None = None,
+    failed_results: list[TableLoadResult] | None = None,
+) -> list[TableLoadResult]:
+    """
+    Load tables concurrently, starting each table once its parents are loaded.
+
+    Tables whose parent failed to load, or failed before the run such as on
+    validation, are skipped and reported as failed.
+    With table sizes, the tables ready to load start largest first, counting
+    the tables waiting on them, so no big load starts last and holds up the
+    end of the run. Without them, they start in name order.
+
+    Args:
+        mapped_files: List of (csv_file, table_name) pairs to load
+        dependencies: Table name to referenced table names, from the DDL
+        load_fn: Function called as load_fn(table_name, csv_path) returning success
+        max_workers: Maximum number of tables loading at the same time
+        max_jobs_per_host: Maximum number of TPT jobs running against the host
+        host: Host the TPT jobs run against
+        table_sizes: Table name to bytes to load, to start large loads first
+        failed_results: Results of tables that failed before the run, which
+            are not loaded but whose descendants are skipped
+
+    Returns:
+        List of results, those failed before the run first, then in the order
+        the tables finished
+
+    Raises:
+        ValueError: If a table is mapped from more than one CSV file, or the
+            dependencies contain a cycle
+    """
+    failed_results = failed_results or []
+    csv_by_table = {}
+    for csv_file, table_name in mapped_files + [
+        (result.csv_file, result.table_name) for result in failed_results
+    ]:
+        if table_name in csv_by_table:
+            raise ValueError(
+                f"{table_name} is mapped from both {csv_by_table[table_name].name} "
+                f"and {csv_file.name}"
+            )
+        csv_by_table[table_name] = csv_file
+    parents = resolve_dependencies(list(csv_by_table), dependencies)
+    children = {table: set() for table in parents}
+    for table, table_parents in parents.items():
+        for parent in table_parents:
+            children[parent].add(table)
+    priorities = load_priorities(parents, table_sizes or {})
+
+    host_slots = HostSlots(max_jobs_per_host)
+    waiting = {table: set(table_parents) for table, table_parents in parents.items()}
+    results = []
+
+    def run_one(table_name: str) -> TableLoadResult:
+        csv_file = csv_by_table[table_name]
+        slot = host_slots.slot(host)
+        with slot, release_during_backoff(slot):
+            start = time.perf_counter()
+            success = load_fn(table_name, str(csv_file.absolute()))
+            elapsed = time.perf_counter() - start
+        return TableLoadResult(table_name, csv_file, success, elapsed)
+
+    def skip_descendants(table_name: str) -> None:
+        for child in sorted(children[table_name]):
+            if child not in waiting:
+                continue
+            del waiting[child]
+            logger.error(f"Skipping {child}: parent table {table_name} failed to load")
+            results.append(
+                TableLoadResult(child, csv_by_table[child], False, skipped=True)
+            )
+            skip_descendants(child)
+
+    for result in failed_results:
+        del waiting[result.table_name]
+        results.append(result)
+    for result in failed_results:
+        skip_descendants(result.table_name)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+
+        def submit_ready() -> None:
+            ready = sorted(
+                (table for table, pending in waiting.items() if not pending),
+                key=lambda table: (-priorities[table], table),
+            )
+            for table_name in ready:
+                del waiting[table_name]
+                logger.info(f"Scheduling load: {table_name}")
+                running[executor.submit(run_one, table_name)] = table_name
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                table_name = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.exception(f"Load of {table_name} raised an error: {e}")
+                    result = TableLoadResult(
+                        table_name, csv_by_table[table_name], False
+                    )
+                results.append(result)
+
+                if result.success:
+                    for child in children[table_name]:
+                        if child in waiting:
+                            waiting[child].discard(table_name)
+                else:
+                    skip_descendants(table_name)
+            submit_ready()
+
+    return results
+
+
+def log_load_summary(
+    results: list[TableLoadResult],
+    total_elapsed: float,
+) -> None:
+    """Log per-table and total elapsed time for a load run."""
+    logger.info("Table load timings:")
+    for result in sorted(results, key=lambda r: r.elapsed, reverse=True):
+        if result.skipped:
+            status = "SKIPPED"
+        elif result.success:
+            status = "OK"
+        else:
+            status = "FAILED"
+        logger.info(f"  {result.table_name:<30} {status:<8} {result.elapsed:8.2f}s")
+    logger.info(f"Total elapsed time: {total_elapsed:.2f}s")
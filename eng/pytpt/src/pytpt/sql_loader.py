@@ -0,0 +1,250 @@
+"""Batched loading of CSV files and DataFrames through a DB-API connection."""
+
+import csv
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Rows sent to the database in each executemany request
+BATCH_SIZE = 10_000
+
+# Row count from which the driver is asked to use FastLoad
+FASTLOAD_THRESHOLD = 100_000
+
+# Read files in 1 MiB blocks when counting rows
+BLOCK_SIZE = 1024 * 1024
+
+# Driver escape functions, see the teradatasql documentation
+FASTLOAD_ESCAPE = "{fn teradata_try_fastload}"
+AUTOCOMMIT_OFF = "{fn teradata_nativesql}{fn teradata_autocommit_off}"
+AUTOCOMMIT_ON = "{fn teradata_nativesql}{fn teradata_autocommit_on}"
+GET_ERRORS = "{fn teradata_nativesql}{fn teradata_get_errors}"
+
+
+@dataclass
+class LoadStats:
+    """Outcome of loading rows into one table."""
+
+    table_name: str
+    rows: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+    fastload: bool = False
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        """Load throughput in rows per second."""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def insert_statement(
+    table_name: str,
+    column_names: Sequence[str],
+    fastload: bool = False,
+    positional: bool = False,
+) -> str:
+    """
+    Build a parameterised insert for a table, optionally as a FastLoad.
+
+    A positional insert has no column list, so the values go to the table's
+    columns in order and column_names only counts them.
+    """
+    markers = ", ".join("?" for _ in column_names)
+    prefix = FASTLOAD_ESCAPE if fastload else ""
+    if positional:
+        return f"{prefix}insert into {table_name} values ({markers})"
+    columns = ", ".join(column_names)
+    return f"{prefix}insert into {table_name} ({columns}) values ({markers})"
+
+
+def count_csv_rows(csv_file: str | Path, skip_rows: int = 1) -> int:
+    """Count the data rows in a CSV file from its newlines, without parsing it."""
+    newlines = 0
+    last = b"\n"
+    with open(csv_file, "rb") as f:
+        while block := f.read(BLOCK_SIZE):
+            newlines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        newlines += 1
+    return max(newlines - skip_rows, 0)
+
+
+def _batches(rows: Iterable[Sequence[Any]], batch_size: int):
+    """Yield lists of up to batch_size rows."""
+    iterator = iter(rows)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def _fetch_messages(cursor, sql: str) -> list[str]:
+    """Fetch FastLoad errors reported by the driver for a statement."""
+    cursor.execute(GET_ERRORS + sql)
+    return [row[0] for row in cursor.fetchall() if row and row[0]]
+
+
+def load_rows(
+    con,
+    table_name: str,
+    column_names: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    row_count: Optional[int] = None,
+    batch_size: int = BATCH_SIZE,
+    fastload_threshold: Optional[int] = FASTLOAD_THRESHOLD,
+    positional: bool = False,
+) -> LoadStats:
+    """
+    Insert rows into a table in batches with executemany.
+
+    When row_count reaches fastload_threshold the insert is run as a FastLoad
+    in a single transaction; the driver falls back to a regular insert if the
+    table cannot be FastLoaded.
+
+    Args:
+        con: DB-API connection (teradatasql or stub_driver)
+        table_name: Name of the target table
+        column_names: Columns the row values are inserted into, in order
+        rows: Row values, one sequence per row
+        row_count: Number of rows, if known, used to choose FastLoad
+        batch_size: Rows sent in each request
+        fastload_threshold: Row count from which to use FastLoad, None to never use it
+        positional: Insert into the table's columns in order rather than by name
+
+    Returns:
+        Load statistics, including rows per second and any FastLoad errors
+    """
+    fastload = (
+        fastload_threshold is not None
+        and row_count is not None
+        and row_count >= fastload_threshold
+    )
+    sql = insert_statement(table_name, column_names, fastload, positional)
+    stats = LoadStats(table_name, fastload=fastload)
+
+    start = time.perf_counter()
+    cursor = con.cursor()
+    try:
+        if fastload:
+            # FastLoad must run in one transaction
+            cursor.execute(AUTOCOMMIT_OFF)
+        try:
+            for batch in _batches(rows, batch_size):
+                cursor.executemany(sql, batch)
+                stats.rows += len(batch)
+                stats.batches += 1
+            if fastload:
+                stats.errors = _fetch_messages(cursor, sql)
+                if stats.errors:
+                    con.rollback()
+                else:
+                    con.commit()
+        finally:
+            if fastload:
+                cursor.execute(AUTOCOMMIT_ON)
+    finally:
+        cursor.close()
+    stats.elapsed = time.perf_counter() - start
+
+    if stats.errors:
+        logger.error(f"Load of {table_name} failed with {len(stats.errors)} error(s):")
+        for error in stats.errors:
+            logger.error(f"  - {error}")
+    else:
+        method = "FastLoad" if fastload else "insert"
+        logger.info(
+            f"Loaded {stats.rows:,} rows into {table_name} by {method} in "
+            f"{stats.batches} batches, {stats.elapsed:.2f}s "
+            f"({stats.rows_per_second:,.0f} rows/s)"
+        )
+    return stats
+
+
+def load_csv(
+    con,
+    table_name: str,
+    csv_file: str | Path,
+    batch_size: int = BATCH_SIZE,
+    fastload_threshold: Optional[int] = FASTLOAD_THRESHOLD,
+    transform: Optional[Callable[[list[str]], Sequence[Any]]] = None,
+    column_names: Optional[Sequence[str]] = None,
+) -> LoadStats:
+    """
+    Stream a CSV file with a header row into a table in batches.
+
+    Empty fields are loaded as NULL, as teradata_read_csv does.
+
+    Args:
+        con: DB-API connection
+        table_name: Name of the target table
+        csv_file: CSV file to load
+        batch_size: Rows sent in each request
+        fastload_threshold: Row count from which to use FastLoad, None to never use it
+        transform: Optional function applied to each row's values before inserting
+        column_names: Columns to insert into (default: the table's columns, by
+            position, as the header may name them differently)
+
+    Returns:
+        Load statistics
+    """
+    row_count = count_csv_rows(csv_file) if fastload_threshold is not None else None
+
+    with open(csv_file, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        rows = ([value if value != "" else None for value in row] for row in reader)
+        if transform is not None:
+            rows = map(transform, rows)
+
+        return load_rows(
+            con,
+            table_name,
+            column_names or header,
+            rows,
+            row_count,
+            batch_size,
+            fastload_threshold,
+            positional=column_names is None,
+        )
+
+
+def load_dataframe(
+    con,
+    table_name: str,
+    df,
+    batch_size: int = BATCH_SIZE,
+    fastload_threshold: Optional[int] = FASTLOAD_THRESHOLD,
+) -> LoadStats:
+    """
+    Load a pandas DataFrame into a table in batches, one column per DataFrame column.
+
+    Missing values are loaded as NULL.
+
+    Args:
+        con: DB-API connection
+        table_name: Name of the target table
+        df: DataFrame to load
+        batch_size: Rows sent in each request
+        fastload_threshold: Row count from which to use FastLoad, None to never use it
+
+    Returns:
+        Load statistics
+    """
+    # Object dtype gives the driver Python scalars rather than NumPy ones
+    values = df.astype(object).where(df.notna(), None)
+    rows = values.itertuples(index=False, name=None)
+    return load_rows(
+        con,
+        table_name,
+        [str(column) for column in df.columns],
+        rows,
+        len(df),
+        batch_size,
+        fastload_threshold,
+    )
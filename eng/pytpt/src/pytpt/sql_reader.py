@@ -0,0 +1,211 @@
+"""Streaming query results from a DB-API connection as DataFrames or Arrow batches."""
+
+import datetime
+import decimal
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Any, Iterator, Optional, Sequence
+
+import numpy as np
+
+# Rows fetched from the database in each fetchmany call
+FETCH_SIZE = 10_000
+
+# Python types reported by the driver mapped to the NumPy dtype of their column
+NUMPY_DTYPES = {int: np.int64, float: np.float64, bool: np.bool_}
+
+
+@dataclass
+class ColumnBatch:
+    """A batch of query results as one array per column."""
+
+    names: list[str]
+    arrays: list[np.ndarray]
+    masks: list[Optional[np.ndarray]]
+    rows: int
+    # DB-API description of each column, with the type reported by the driver
+    description: list[tuple] = field(default_factory=list)
+
+
+def _column_dtype(type_code: Any, rows: list[tuple], index: int):
+    """Choose the NumPy dtype of a column from the driver type or the values."""
+    if isinstance(type_code, type):
+        python_type = type_code
+    else:
+        # The driver did not report a Python type, so use the first value
+        python_type = next(
+            (type(row[index]) for row in rows if row[index] is not None), object
+        )
+    return NUMPY_DTYPES.get(python_type, object)
+
+
+def _column_array(
+    rows: list[tuple],
+    index: int,
+    dtype,
+) -> tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Copy one column of a batch into a preallocated array.
+
+    Returns:
+        Tuple of the values and a mask of NULLs, or None when there are no NULLs
+    """
+    count = len(rows)
+    values = map(itemgetter(index), rows)
+    if dtype is object:
+        return np.fromiter(values, dtype=object, count=count), None
+
+    try:
+        return np.fromiter(values, dtype=dtype, count=count), None
+    except TypeError:
+        # NULLs in a typed column, so fill them with zero and keep a mask
+        column = [row[index] for row in rows]
+        mask = np.fromiter((value is None for value in column), dtype=bool, count=count)
+        filled = np.fromiter(
+            (0 if value is None else value for value in column),
+            dtype=dtype,
+            count=count,
+        )
+        return filled, mask
+
+
+def iter_column_batches(
+    con,
+    sql: str,
+    params: Optional[Sequence[Any]] = None,
+    fetch_size: int = FETCH_SIZE,
+) -> Iterator[ColumnBatch]:
+    """
+    Run a query and yield its results in batches of columns.
+
+    Only one batch of rows is held in memory at a time.
+
+    Args:
+        con: DB-API connection
+        sql: Query to run
+        params: Optional query parameters
+        fetch_size: Rows fetched in each fetchmany call
+
+    Yields:
+        Batches of up to fetch_size rows
+    """
+    cursor = con.cursor()
+    try:
+        if params is None:
+            cursor.execute(sql)
+        else:
+            cursor.execute(sql, params)
+        cursor.arraysize = fetch_size
+
+        description = cursor.description or []
+        names = [column[0] for column in description]
+        dtypes = None
+
+        while rows := cursor.fetchmany(fetch_size):
+            if dtypes is None:
+                dtypes = [
+                    _column_dtype(column[1], rows, index)
+                    for index, column in enumerate(description)
+                ]
+            arrays = []
+            masks = []
+            for index, dtype in enumerate(dtypes):
+                array, mask = _column_array(rows, index, dtype)
+                arrays.append(array)
+                masks.append(mask)
+            yield ColumnBatch(names, arrays, masks, len(rows), description)
+    finally:
+        cursor.close()
+
+
+def read_sql_chunks(
+    con,
+    sql: str,
+    params: Optional[Sequence[Any]] = None,
+    fetch_size: int = FETCH_SIZE,
+):
+    """
+    Run a query and yield its results as pandas DataFrames of up to fetch_size rows.
+
+    Like pd.read_sql, integer columns with NULLs become float columns with NaN.
+
+    Args:
+        con: DB-API connection
+        sql: Query to run
+        params: Optional query parameters
+        fetch_size: Rows fetched in each fetchmany call
+
+    Yields:
+        DataFrames, one per fetched batch
+    """
+    import pandas as pd
+
+    for batch in iter_column_batches(con, sql, params, fetch_size):
+        columns = {}
+        for name, array, mask in zip(batch.names, batch.arrays, batch.masks):
+            if mask is not None:
+                array = array.astype(np.float64)
+                array[mask] = np.nan
+            columns[name] = array
+        yield pd.DataFrame(columns, copy=False)
+
+
+def _arrow_type(pa, column: tuple):
+    """Arrow type of a column from the Python type the driver reports, or None."""
+    type_code = column[1]
+    if type_code is decimal.Decimal:
+        # Precision and scale, when the driver reports them
+        precision, scale = column[4:6] if len(column) >= 6 else (None, None)
+        if precision and scale is not None and precision <= 38:
+            return pa.decimal128(precision, scale)
+        return None
+    return {
+        bool: pa.bool_(),
+        int: pa.int64(),
+        float: pa.float64(),
+        str: pa.string(),
+        bytes: pa.binary(),
+        datetime.datetime: pa.timestamp("us"),
+        datetime.date: pa.date32(),
+        datetime.time: pa.time64("us"),
+    }.get(type_code)
+
+
+def read_sql_arrow(
+    con,
+    sql: str,
+    params: Optional[Sequence[Any]] = None,
+    fetch_size: int = FETCH_SIZE,
+):
+    """
+    Run a query and yield its results as pyarrow RecordBatches of up to fetch_size rows.
+
+    Column types are taken from the cursor description. A column the driver
+    reports no type for takes the type of its first values, so it is a null
+    column in the batches before them, which pyarrow promotes when batches
+    are combined, e.g. with pa.concat_tables(..., promote_options="default").
+
+    Args:
+        con: DB-API connection
+        sql: Query to run
+        params: Optional query parameters
+        fetch_size: Rows fetched in each fetchmany call
+
+    Yields:
+        RecordBatches, one per fetched batch
+    """
+    import pyarrow as pa
+
+    types = None
+    for batch in iter_column_batches(con, sql, params, fetch_size):
+        if types is None:
+            types = [_arrow_type(pa, column) for column in batch.description]
+        arrays = [
+            pa.array(array, mask=mask, type=arrow_type)
+            for array, mask, arrow_type in zip(batch.arrays, batch.masks, types)
+        ]
+        # A column without a driver type keeps the type of its first values
+        for index, array in enumerate(arrays):
+            if types[index] is None and array.null_count < len(array):
+                types[index] = array.type
+        yield pa.RecordBatch.from_arrays(arrays, names=batch.names)
@@ -0,0 +1,276 @@
+"""In-memory stand-in for the teradatasql DB-API driver, for tests and benchmarks."""
+
+import re
+import threading
+import time
+from typing import Any, Optional, Sequence
+
+# Pattern to match the driver escape functions that prefix a statement: {fn teradata_try_fastload}
+ESCAPE_PATTERN = re.compile(r"^\s*\{fn\s+(\w+)(?:\(([^)]*)\))?\}", re.IGNORECASE)
+
+# Pattern to match: insert into TABLE (A, B) values (?, ?)
+INSERT_PATTERN = re.compile(
+    r"^\s*insert\s+into\s+([\w.]+)\s*(?:\(([^)]*)\))?", re.IGNORECASE
+)
+
+# Pattern to match: delete from TABLE, delete TABLE all
+DELETE_PATTERN = re.compile(
+    r"^\s*delete\s+(?:from\s+)?([\w.]+)(?:\s+all)?\s*$", re.IGNORECASE
+)
+
+# Pattern to match: drop table TABLE
+DROP_PATTERN = re.compile(r"^\s*drop\s+table\s+([\w.]+)\s*$", re.IGNORECASE)
+
+# Pattern to match: select * from TABLE
+SELECT_PATTERN = re.compile(r"^\s*select\s+\*\s+from\s+([\w.]+)\s*$", re.IGNORECASE)
+
+# Pattern to match: select * from TABLE where KEY between ? and ? [or KEY is null]
+RANGE_PATTERN = re.compile(
+    r"^\s*select\s+\*\s+from\s+([\w.]+)\s+where\s+(\w+)\s+between\s+\?\s+and\s+\?"
+    r"(\s+or\s+\2\s+is\s+null)?\s*$",
+    re.IGNORECASE,
+)
+
+# Pattern to match: select min(KEY), max(KEY), count(*) from TABLE
+KEY_RANGE_PATTERN = re.compile(
+    r"^\s*select\s+min\((\w+)\),\s*max\(\1\),\s*count\(\*\)\s+from\s+([\w.]+)\s*$",
+    re.IGNORECASE,
+)
+
+
+class Error(Exception):
+    """Base class of the stub driver's errors, as in DB-API 2.0."""
+
+
+class OperationalError(Error):
+    """Raised when the connection is closed or a table does not exist."""
+
+
+class StubDatabase:
+    """
+    Shared state of the stub driver: tables, canned query results and a statement log.
+
+    Latencies let benchmarks model logon and request round trips, and
+    load_errors are returned to {fn teradata_get_errors} requests.
+    """
+
+    def __init__(self, connect_latency: float = 0.0, request_latency: float = 0.0):
+        self.connect_latency = connect_latency
+        self.request_latency = request_latency
+        self.tables: dict[str, list[tuple]] = {}
+        self.columns: dict[str, list[str]] = {}
+        self.results: dict[str, tuple[list[str], list[tuple]]] = {
+            "select 1": (["1"], [(1,)])
+        }
+        self.statements: list[str] = []
+        self.load_errors: list[str] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def create_table(self, table_name: str, columns: list[str], rows=()) -> None:
+        """Create a table with the given columns and rows."""
+        name = _table_key(table_name)
+        self.columns[name] = list(columns)
+        self.tables[name] = [tuple(row) for row in rows]
+
+    def add_result(self, sql: str, columns: list[str], rows: list[tuple]) -> None:
+        """Register the result set returned for a query."""
+        self.results[_normalise_sql(sql)] = (list(columns), list(rows))
+
+    def connect(self, **kwargs) -> "Connection":
+        """Open a connection, as teradatasql.connect does."""
+        time.sleep(self.connect_latency)
+        with self._lock:
+            self.connections += 1
+        return Connection(self, kwargs)
+
+
+def _table_key(table_name: str) -> str:
+    """Key tables by their upper case name without a database prefix."""
+    return table_name.split(".")[-1].upper()
+
+
+def _normalise_sql(sql: str) -> str:
+    """Collapse whitespace and case so queries can be looked up."""
+    return " ".join(sql.split()).lower()
+
+
+class Connection:
+    """DB-API connection to a StubDatabase."""
+
+    def __init__(self, database: StubDatabase, params: dict):
+        self.database = database
+        self.params = params
+        self.autocommit = True
+        self.closed = False
+        self.commits = 0
+
+    def cursor(self) -> "Cursor":
+        self._check_open()
+        return Cursor(self)
+
+    def commit(self) -> None:
+        self._check_open()
+        self.commits += 1
+
+    def rollback(self) -> None:
+        self._check_open()
+
+    def close(self) -> None:
+        self.closed = True
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise OperationalError("Connection is closed")
+
+    def __enter__(self) -> "Connection":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class Cursor:
+    """DB-API cursor over a stub connection."""
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+        self.description: Optional[list[tuple]] = None
+        self.rowcount = -1
+        self.arraysize = 1
+        self._rows: list[tuple] = []
+        self._position = 0
+
+    def execute(self, sql: str, params: Optional[Sequence[Any]] = None) -> None:
+        """Execute a statement, with one row of parameters for an insert."""
+        self.executemany(sql, [params] if params is not None else [])
+
+    def executemany(self, sql: str, seq_of_params: Sequence[Sequence[Any]]) -> None:
+        """Execute a statement once for each row of parameters, in one request."""
+        self.connection._check_open()
+        database = self.connection.database
+        time.sleep(database.request_latency)
+
+        with database._lock:
+            database.statements.append(sql)
+
+        # Escape functions only change how the driver runs the statement
+        body = sql
+        escapes = []
+        while match := ESCAPE_PATTERN.match(body):
+            escapes.append(match.group(1).lower())
+            body = body[match.end() :]
+
+        self.description = None
+        self._rows = []
+        self._position = 0
+        self.rowcount = -1
+
+        if "teradata_autocommit_off" in escapes:
+            self.connection.autocommit = False
+        if "teradata_autocommit_on" in escapes:
+            self.connection.autocommit = True
+        messages = {"teradata_get_errors", "teradata_get_warnings"} & set(escapes)
+        if messages or not body.strip():
+            self.description = [("Message", str, None, None, None, None, True)]
+            if "teradata_get_errors" in escapes:
+                self._rows = [(error,) for error in database.load_errors]
+            return
+
+        for statement in [part for part in body.split(";") if part.strip()]:
+            self._execute_one(statement, seq_of_params)
+
+    def _execute_one(self, sql: str, seq_of_params: Sequence[Sequence[Any]]) -> None:
+        database = self.connection.database
+
+        if match := INSERT_PATTERN.match(sql):
+            table = self._table(match.group(1))
+            with database._lock:
+                database.tables[table].extend(tuple(row) for row in seq_of_params)
+            self.rowcount = len(seq_of_params)
+            return
+
+        if match := DELETE_PATTERN.match(sql):
+            table = self._table(match.group(1))
+            with database._lock:
+                self.rowcount = len(database.tables[table])
+                database.tables[table] = []
+            return
+
+        if match := DROP_PATTERN.match(sql):
+            table = self._table(match.group(1))
+            with database._lock:
+                del database.tables[table]
+                del database.columns[table]
+            self.rowcount = 0
+            return
+
+        key = _normalise_sql(sql)
+        if key in database.results:
+            columns, rows = database.results[key]
+        elif match := SELECT_PATTERN.match(sql):
+            table = self._table(match.group(1))
+            columns, rows = database.columns[table], database.tables[table]
+        elif match := RANGE_PATTERN.match(sql):
+            table = self._table(match.group(1))
+            columns = database.columns[table]
+            key = columns.index(match.group(2).upper())
+            low, high = seq_of_params[0]
+            rows = [
+                row
+                for row in database.tables[table]
+                if (row[key] is None and match.group(3))
+                or (row[key] is not None and low <= row[key] <= high)
+            ]
+        elif match := KEY_RANGE_PATTERN.match(sql):
+            table = self._table(match.group(2))
+            key = database.columns[table].index(match.group(1).upper())
+            keys = [row[key] for row in database.tables[table] if row[key] is not None]
+            columns = ["Minimum", "Maximum", "Count"]
+            rows = [
+                (
+                    min(keys, default=None),
+                    max(keys, default=None),
+                    len(database.tables[table]),
+                )
+            ]
+        else:
+            raise Error(f"Stub driver cannot run: {sql}")
+
+        self.description = [
+            (name, None, None, None, None, None, True) for name in columns
+        ]
+        self._rows = list(rows)
+        self.rowcount = len(self._rows)
+
+    def _table(self, table_name: str) -> str:
+        name = _table_key(table_name)
+        if name not in self.connection.database.tables:
+            raise OperationalError(
+                f"[Error 3807] Object '{table_name}' does not exist."
+            )
+        return name
+
+    def fetchone(self) -> Optional[tuple]:
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size: Optional[int] = None) -> list[tuple]:
+        size = self.arraysize if size is None else size
+        rows = self._rows[self._position : self._position + size]
+        self._position += len(rows)
+        return rows
+
+    def fetchall(self) -> list[tuple]:
+        rows = self._rows[self._position :]
+        self._position = len(self._rows)
+        return rows
+
+    def close(self) -> None:
+        self._rows = []
+
+    def __enter__(self) -> "Cursor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
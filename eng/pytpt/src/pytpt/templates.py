@@ -1,10 +1,14 @@
 """Simple template processing functions."""
 
 import os
+import threading
 from pathlib import Path
-from jinja2 import Template
+from typing import Iterable
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
 from dotenv import load_dotenv
+from omegaconf import DictConfig
 from .config_utils import load_config
+from .ddl import parse_columns
 
 
 def load_env_vars():
@@ -12,9 +16,10 @@ def load_env_vars():
     load_dotenv()
 
 
-def get_credentials():
+def get_credentials(config: DictConfig | None = None):
     """Get credentials from environment variables and config."""
-    config = load_config()
+    if config is None:
+        config = load_config()
 
     return {
         "ddl_username": os.getenv("DDL_USERNAME", "mortch"),
@@ -41,6 +46,84 @@ def render_template(
     return template.render(**kwargs)
 
 
+class TemplateEngine:
+    """Load and compile the TPT templates once and render them to strings."""
+
+    # Operation name -> template file in the scripts directory
+    TEMPLATE_FILES = {
+        "jobvars": "jobvars-template.jvar",
+        "drop": "drop-table.tpt",
+        "create": "create-table.tpt",
+        "load": "load-table.tpt",
+        "job": "table-job.tpt",
+    }
+
+    def __init__(
+        self,
+        scripts_dir: str | Path = "scripts",
+        cache_dir: str | Path | None = None,
+    ):
+        """
+        Create a template engine over a scripts directory.
+
+        Args:
+            scripts_dir: Directory holding the Jinja templates (default: "scripts")
+            cache_dir: Directory for the compiled bytecode cache (default: a
+                per-user directory under the system temp directory)
+        """
+        self.scripts_dir = Path(scripts_dir)
+        bytecode_cache = FileSystemBytecodeCache(
+            str(cache_dir) if cache_dir is not None else None
+        )
+        self.environment = Environment(
+            loader=FileSystemLoader(str(self.scripts_dir)),
+            bytecode_cache=bytecode_cache,
+            auto_reload=False,
+        )
+        self._templates = {
+            operation: self.environment.get_template(file_name)
+            for operation, file_name in self.TEMPLATE_FILES.items()
+        }
+
+    def render(self, operation: str, **kwargs) -> str:
+        """Render the template for an operation (jobvars, drop, create, load or job)."""
+        return self._templates[operation].render(**kwargs)
+
+    def render_all(
+        self, operations: Iterable[str] | None = None, **kwargs
+    ) -> dict[str, str]:
+        """
+        Render templates with the same variables, keyed by operation.
+
+        Args:
+            operations: Operations to render (default: every template)
+            **kwargs: Template variables
+
+        Returns:
+            Dictionary of operation to rendered template
+        """
+        if operations is None:
+            operations = self._templates
+        return {
+            operation: self._templates[operation].render(**kwargs)
+            for operation in operations
+        }
+
+
+# Process-wide template engines: scripts dir -> engine
+_engines: dict[Path, TemplateEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_template_engine(scripts_dir: str | Path = "scripts") -> TemplateEngine:
+    """Get the shared template engine for a scripts directory, creating it once."""
+    scripts_dir = Path(scripts_dir).absolute()
+    with _engines_lock:
+        if scripts_dir not in _engines:
+            _engines[scripts_dir] = TemplateEngine(scripts_dir)
+        return _engines[scripts_dir]
+
+
 def write_file(
     content: str,
     output_path: Path,
@@ -51,29 +134,58 @@ def write_file(
         f.write(content)
 
 
+def write_file_if_changed(
+    content: str,
+    output_path: Path,
+) -> bool:
+    """Write content to a file only if it differs. Returns True if written."""
+    if output_path.exists():
+        with open(output_path, "r") as f:
+            if f.read() == content:
+                return False
+    write_file(content, output_path)
+    return True
+
+
 def read_ddl_file(table_name: str) -> str:
     """Read DDL content for a table."""
     ddl_path = Path("ddl") / f"{table_name}.sql"
+    if not ddl_path.exists():
+        # DDL files are named in lowercase, which matters on case-sensitive filesystems
+        ddl_path = Path("ddl") / f"{table_name.lower()}.sql"
     if ddl_path.exists():
         with open(ddl_path, "r") as f:
             return f.read().strip()
     return ""
 
 
-def create_tpt_files(
+def render_tpt_scripts(
     table_name: str,
     csv_file_path: str,
-) -> tuple[Path, Path, Path, Path]:
-    """Create TPT jobvars and script files for create and load jobs."""
-    # Get template paths
-    scripts_dir = Path("scripts")
-    jobvars_template = scripts_dir / "jobvars-template.jvar"
-    drop_template = scripts_dir / "drop-table.tpt"
-    create_template = scripts_dir / "create-table.tpt"
-    load_template = scripts_dir / "load-table.tpt"
+    config: DictConfig | None = None,
+    reader_instances: int = 1,
+    load_operator: str = "LOAD",
+    append: bool = False,
+    operations: Iterable[str] | None = None,
+) -> dict[str, str]:
+    """
+    Render the jobvars and TPT scripts for a table to strings, keyed by operation.
+
+    Args:
+        table_name: Name of the target table
+        csv_file_path: Path to the CSV file, or a wildcard pattern over its chunks
+        config: Configuration to use (default: the cached config)
+        reader_instances: Number of FileReader instances to read the file(s) with
+        load_operator: Consumer operator to load with (LOAD, UPDATE, STREAM or INSERTER)
+        append: Add the rows to the existing table instead of dropping and
+            creating it in the single job
+        operations: Scripts to render (default: all of them)
 
+    Returns:
+        Dictionary of operation to rendered script
+    """
     # Get credentials
-    credentials = get_credentials()
+    credentials = get_credentials(config)
 
     # Read DDL for the table
     ddl_content = read_ddl_file(table_name)
@@ -84,13 +196,38 @@ def create_tpt_files(
         "table_name": table_name,
         "csv_file_path": csv_file_path,
         "ddl_content": ddl_content,
+        "columns": parse_columns(ddl_content),
+        "reader_instances": reader_instances,
+        "csv_directory_path": None,
+        "load_operator": load_operator,
+        "append": append,
     }
 
-    # Render templates
-    jobvars_content = render_template(jobvars_template, **template_vars)
-    drop_content = render_template(drop_template, **template_vars)
-    create_content = render_template(create_template, **template_vars)
-    load_content = render_template(load_template, **template_vars)
+    if reader_instances > 1:
+        # Chunked files are read with a wildcard file name within their directory
+        directory_path, file_name = os.path.split(csv_file_path)
+        template_vars["csv_directory_path"] = directory_path
+        template_vars["csv_file_path"] = file_name
+
+    return get_template_engine().render_all(operations, **template_vars)
+
+
+def create_tpt_files(
+    table_name: str,
+    csv_file_path: str,
+    config: DictConfig | None = None,
+    reader_instances: int = 1,
+    load_operator: str = "LOAD",
+) -> tuple[Path, Path, Path, Path]:
+    """Create TPT jobvars and script files for create and load jobs."""
+    rendered = render_tpt_scripts(
+        table_name,
+        csv_file_path,
+        config,
+        reader_instances,
+        load_operator,
+        operations=("jobvars", "drop", "create", "load"),
+    )
 
     # Output paths (in render_tmp directory)
     output_dir = Path("render_tmp")
@@ -99,10 +236,41 @@ def create_tpt_files(
     drop_output = output_dir / f"{table_name}_drop.tpt"
     load_output = output_dir / f"{table_name}_load.tpt"
 
-    # Write files
-    write_file(jobvars_content, jobvars_output)
-    write_file(drop_content, drop_output)
-    write_file(create_content, create_output)
-    write_file(load_content, load_output)
+    # Write files, leaving unchanged ones untouched
+    write_file_if_changed(rendered["jobvars"], jobvars_output)
+    write_file_if_changed(rendered["drop"], drop_output)
+    write_file_if_changed(rendered["create"], create_output)
+    write_file_if_changed(rendered["load"], load_output)
 
     return jobvars_output, drop_output, create_output, load_output
+
+
+def create_tpt_job_files(
+    table_name: str,
+    csv_file_path: str,
+    config: DictConfig | None = None,
+    reader_instances: int = 1,
+    load_operator: str = "LOAD",
+    append: bool = False,
+) -> tuple[Path, Path]:
+    """Create TPT jobvars and a single job script that drops, creates and loads."""
+    rendered = render_tpt_scripts(
+        table_name,
+        csv_file_path,
+        config,
+        reader_instances,
+        load_operator,
+        append,
+        operations=("jobvars", "job"),
+    )
+
+    # Output paths (in render_tmp directory)
+    output_dir = Path("render_tmp")
+    jobvars_output = output_dir / f"{table_name}.jvar"
+    job_output = output_dir / f"{table_name}_job.tpt"
+
+    # Write files, leaving unchanged ones untouched
+    write_file_if_changed(rendered["jobvars"], jobvars_output)
+    write_file_if_changed(rendered["job"], job_output)
+
+    return jobvars_output, job_output
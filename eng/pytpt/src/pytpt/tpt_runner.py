@@ -1,14 +1,71 @@
 """Simple TPT execution functions."""
 
+import itertools
+import queue
 import re
 import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Optional
 
+from omegaconf import DictConfig
+
+from .checkpoint import CHECKPOINT_INTERVAL, CheckpointJob, CheckpointStore
+from .config_utils import load_config
+from .csv_split import prepare_reader_input, remove_chunks
+from .csv_transform import PipeFeed, prepare_transform, remove_transform
 from .logging_config import get_logger
+from .metrics import (
+    MetricsParser,
+    TptMetrics,
+    current_run_id,
+    parse_metrics,
+)
+from .operators import select_operator
+from .retry import RetryPolicy, run_with_retries
+
+if TYPE_CHECKING:
+    from .report import RunReport
+    from .run_archive import RunArchive
 
 logger = get_logger(__name__)
 
+# Pattern to match: Job step load_stg_table completed successfully
+STEP_STATUS_PATTERN = re.compile(
+    r"Job step (\w+) (completed successfully|terminated)", re.IGNORECASE
+)
+
+# Pattern to match: $LOAD: entering Acquisition Phase
+PHASE_PATTERN = re.compile(r"\$\w+:\s*entering (\w+) Phase", re.IGNORECASE)
+
+# Number of stderr lines kept in memory for reporting
+STDERR_TAIL_LINES = 50
+
+# Lines reporting errors, kept so failures can be classified as retryable or not
+ERROR_LINE_PATTERN = re.compile(
+    r"\b(?:error|failure|failed|deadlock|too many)\b", re.IGNORECASE
+)
+
+# Number of error lines kept; the first errors of a job are usually the cause
+ERROR_LINES_KEPT = 50
+
+# Steps of the single table job (scripts/table-job.tpt) and the operation each belongs to
+TABLE_JOB_STEPS = {
+    "drop_main_table": "drop",
+    "drop_error_table_1": "drop",
+    "drop_error_table_2": "drop",
+    "create_table": "create",
+    "load_stg_table": "load",
+}
+
+# FastLoad and MultiLoad leave a table they failed to load locked, with its
+# error tables, so without a checkpoint to restart from a retry fails on
+# error 2652 unless the table is dropped and created again first
+LOCKING_OPERATORS = ("LOAD", "UPDATE")
+
 
 def parse_tpt_metrics(output: str) -> Dict[str, Optional[int]]:
     """
@@ -20,156 +77,794 @@ def parse_tpt_metrics(output: str) -> Dict[str, Optional[int]]:
     Returns:
         Dictionary with parsed metrics
     """
-    metrics = {"rows_sent": None, "rows_applied": None}
+    metrics = parse_metrics(output)
+    return {"rows_sent": metrics.rows_sent, "rows_applied": metrics.rows_applied}
 
-    # Pattern to match: $LOAD: Total Rows Sent To RDBMS: 1234
-    rows_sent_pattern = r"\$LOAD:\s*Total Rows Sent To RDBMS:\s*(\d+)"
-    rows_applied_pattern = r"\$LOAD:\s*Total Rows Applied:\s*(\d+)"
 
-    # Search for rows sent
-    sent_match = re.search(rows_sent_pattern, output, re.IGNORECASE)
-    if sent_match:
-        metrics["rows_sent"] = int(sent_match.group(1))
+def parse_step_results(output: str) -> Dict[str, bool]:
+    """
+    Parse TPT output for the outcome of each job step.
 
-    # Search for rows applied
-    applied_match = re.search(rows_applied_pattern, output, re.IGNORECASE)
-    if applied_match:
-        metrics["rows_applied"] = int(applied_match.group(1))
+    Args:
+        output: TPT stdout/stderr output
 
-    return metrics
+    Returns:
+        Dictionary of step name to True if the step completed successfully
+    """
+    return {
+        match.group(1): match.group(2).lower() == "completed successfully"
+        for match in STEP_STATUS_PATTERN.finditer(output)
+    }
+
+
+@dataclass
+class TbuildEvent:
+    """Progress event emitted while a tbuild job runs."""
+
+    kind: str  # started, phase, rows, step or finished
+    operation_type: str
+    message: str = ""
+    rows_sent: Optional[int] = None
+    rows_applied: Optional[int] = None
+
+
+@dataclass
+class TbuildResult:
+    """Outcome of a tbuild job, gathered while its output streamed past."""
+
+    returncode: int
+    log_file: Path
+    metrics: TptMetrics = field(default_factory=TptMetrics)
+    step_results: Dict[str, bool] = field(default_factory=dict)
+    stderr_tail: list[str] = field(default_factory=list)
+    error_lines: list[str] = field(default_factory=list)
+    attempts: int = 1
+
+    @property
+    def success(self) -> bool:
+        """True if tbuild exited with return code 0."""
+        return self.returncode == 0
+
+    @property
+    def rows_sent(self) -> Optional[int]:
+        """Rows sent to the RDBMS by the consumer operator."""
+        return self.metrics.rows_sent
+
+    @property
+    def rows_applied(self) -> Optional[int]:
+        """Rows applied to the target table."""
+        return self.metrics.rows_applied
+
+
+def _read_lines(stream, name: str, lines: queue.Queue) -> None:
+    """Read a process stream line by line onto a queue, then signal the end."""
+    for line in stream:
+        lines.put((name, line.rstrip("\r\n")))
+    lines.put((name, None))
+
+
+def _event_from_line(
+    line: str,
+    result: TbuildResult,
+    parser: MetricsParser,
+    operation_type: str,
+) -> Optional[TbuildEvent]:
+    """Update the running result from one line of output and return any event."""
+    if len(result.error_lines) < ERROR_LINES_KEPT and ERROR_LINE_PATTERN.search(line):
+        result.error_lines.append(line)
+
+    if "$" in line:
+        updated = parser.feed(line)
+        if updated in ("rows_sent", "rows_applied"):
+            return TbuildEvent(
+                "rows", operation_type, line, result.rows_sent, result.rows_applied
+            )
+
+        if PHASE_PATTERN.search(line):
+            return TbuildEvent("phase", operation_type, line)
+    elif line.startswith("Job "):
+        parser.feed(line)
+
+    step_match = STEP_STATUS_PATTERN.search(line)
+    if step_match:
+        result.step_results[step_match.group(1)] = (
+            step_match.group(2).lower() == "completed successfully"
+        )
+        return TbuildEvent("step", operation_type, line)
 
+    return None
 
-def run_tbuild(
-    jvar_file: Path, tpt_file: Path, operation_type: str = "unknown"
-) -> bool:
-    """Run tbuild command with jobvars and TPT script."""
-    # Use -nocp to disable checkpoint files (prevents issues on reruns)
-    cmd = ["tbuild", "-f", str(tpt_file), "-v", str(jvar_file), "-nocp"]
 
-    logger.info(f"Starting {operation_type} operation: {' '.join(cmd)}")
+def stream_tbuild(
+    cmd: list[str],
+    log_file: Path,
+    operation_type: str = "unknown",
+    on_event: Optional[Callable[[TbuildEvent], None]] = None,
+) -> TbuildResult:
+    """
+    Run a tbuild command, teeing its output into one log file as it arrives.
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    stdout and stderr are read line by line, so output is never held in
+    memory and row counts and job steps are tracked while the job runs.
+    The output only goes to the job's log file, which the application log
+    refers to, as a large job would flood the application log.
 
-    success = result.returncode == 0
+    Args:
+        cmd: The tbuild command line
+        log_file: File to write the combined output to
+        operation_type: Operation name used in the log and events
+        on_event: Optional callback for progress events
 
-    # Create logs directory if it doesn't exist
-    logs_dir = Path("logs")
-    logs_dir.mkdir(exist_ok=True)
+    Returns:
+        The job result with return code, row counts and step outcomes
+    """
+    parser = MetricsParser()
+    result = TbuildResult(returncode=-1, log_file=log_file, metrics=parser.metrics)
+    stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
 
-    # Extract table name from jvar file for log naming
-    table_name = "unknown"
-    try:
-        table_name = (
-            jvar_file.stem.replace("_", "").replace("JVAR", "").replace("jvar", "")
-        )
-        if not table_name:
-            table_name = jvar_file.stem
-    except:
-        table_name = "unknown"
-
-    # Save complete TPT output to files
-    stdout_log_file = logs_dir / f"tpt_{table_name}_{operation_type}_stdout.log"
-    stderr_log_file = logs_dir / f"tpt_{table_name}_{operation_type}_stderr.log"
-    combined_log_file = logs_dir / f"tpt_{table_name}_{operation_type}_combined.log"
-
-    # Write stdout
-    if result.stdout:
-        with open(stdout_log_file, "w", encoding="utf-8") as f:
-            f.write(f"Command: {' '.join(cmd)}\n")
-            f.write(f"Return Code: {result.returncode}\n")
-            f.write(f"Operation: {operation_type}\n")
-            f.write("=" * 80 + "\n")
-            f.write(result.stdout)
-
-    # Write stderr
-    if result.stderr:
-        with open(stderr_log_file, "w", encoding="utf-8") as f:
-            f.write(f"Command: {' '.join(cmd)}\n")
-            f.write(f"Return Code: {result.returncode}\n")
-            f.write(f"Operation: {operation_type}\n")
-            f.write("=" * 80 + "\n")
-            f.write(result.stderr)
-
-    # Write combined output
-    with open(combined_log_file, "w", encoding="utf-8") as f:
+    def emit(event: TbuildEvent) -> None:
+        if on_event:
+            on_event(event)
+
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_file, "w", encoding="utf-8", buffering=1) as f:
         f.write(f"Command: {' '.join(cmd)}\n")
-        f.write(f"Return Code: {result.returncode}\n")
         f.write(f"Operation: {operation_type}\n")
-        f.write(f"Success: {success}\n")
         f.write("=" * 80 + "\n")
-        if result.stdout:
-            f.write("STDOUT:\n")
-            f.write(result.stdout)
-            f.write("\n" + "=" * 80 + "\n")
-        if result.stderr:
-            f.write("STDERR:\n")
-            f.write(result.stderr)
-            f.write("\n" + "=" * 80 + "\n")
-
-    # Log the result
-    if success:
+
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+            )
+        except OSError as e:
+            logger.error(f"Could not start tbuild: {e}")
+            f.write(f"Could not start tbuild: {e}\n")
+            result.returncode = 127
+            result.stderr_tail = [str(e)]
+            emit(TbuildEvent("finished", operation_type, str(e)))
+            return result
+
+        emit(TbuildEvent("started", operation_type, " ".join(cmd)))
+        logger.debug(f"Writing {operation_type} output to {log_file}")
+
+        lines = queue.Queue()
+        readers = [
+            threading.Thread(
+                target=_read_lines, args=(process.stdout, "stdout", lines), daemon=True
+            ),
+            threading.Thread(
+                target=_read_lines, args=(process.stderr, "stderr", lines), daemon=True
+            ),
+        ]
+        for reader in readers:
+            reader.start()
+
+        open_streams = len(readers)
+        while open_streams:
+            stream_name, line = lines.get()
+            if line is None:
+                open_streams -= 1
+                continue
+
+            if stream_name == "stderr":
+                stderr_tail.append(line)
+                f.write(f"[stderr] {line}\n")
+            else:
+                f.write(f"{line}\n")
+
+            event = _event_from_line(line, result, parser, operation_type)
+            if event:
+                emit(event)
+
+        for reader in readers:
+            reader.join()
+        result.returncode = process.wait()
+        result.stderr_tail = list(stderr_tail)
+
+        f.write("=" * 80 + "\n")
+        f.write(f"Return Code: {result.returncode}\n")
+        f.write(f"Success: {result.success}\n")
+
+    emit(
+        TbuildEvent(
+            "finished",
+            operation_type,
+            f"Return code {result.returncode}",
+            result.rows_sent,
+            result.rows_applied,
+        )
+    )
+    return result
+
+
+def run_tbuild(
+    jvar_file: Path,
+    tpt_file: Path,
+    operation_type: str = "unknown",
+    on_event: Optional[Callable[[TbuildEvent], None]] = None,
+) -> bool:
+    """Run tbuild command with jobvars and TPT script."""
+    return execute_tbuild(jvar_file, tpt_file, operation_type, on_event).success
+
+
+def tbuild_command(
+    jvar_file: Path,
+    tpt_file: Path,
+    checkpoint: Optional[CheckpointJob] = None,
+    checkpoint_interval: int = CHECKPOINT_INTERVAL,
+) -> list[str]:
+    """Build the tbuild command line, checkpointed if a checkpoint job is given."""
+    cmd = ["tbuild", "-f", str(tpt_file), "-v", str(jvar_file)]
+    if checkpoint is None:
+        # Use -nocp to disable checkpoint files (prevents issues on reruns)
+        return cmd + ["-nocp"]
+    # The same job name and checkpoint directory restart a failed job
+    return cmd + checkpoint.tbuild_args(checkpoint_interval)
+
+
+def tbuild_log_file(
+    jvar_file: Path,
+    operation_type: str = "unknown",
+    table_name: Optional[str] = None,
+) -> Path:
+    """Path of the log file for a tbuild job, under the logs directory."""
+    # Create logs directory if it doesn't exist
+    logs_dir = Path("logs")
+    logs_dir.mkdir(exist_ok=True)
+
+    # The jobvars file is named after its table, e.g. render_tmp/GAME_STATS.jvar
+    table_name = table_name or jvar_file.stem or "unknown"
+    return logs_dir / f"tpt_{table_name}_{operation_type}.log"
+
+
+def log_tbuild_result(
+    result: TbuildResult,
+    operation_type: str = "unknown",
+    output_location: Optional[str] = None,
+) -> None:
+    """
+    Log the outcome, row counts and stderr of a finished tbuild job.
+
+    Args:
+        result: Result of the job
+        operation_type: Operation of the job, such as drop, create or load
+        output_location: Where the job's output can be read (default: its log file)
+    """
+    output_location = output_location or str(result.log_file)
+    if result.success:
         logger.success(f"{operation_type} operation completed successfully")
-        logger.info(f"Complete TPT output saved to: {combined_log_file}")
+        logger.info(f"Complete TPT output saved to: {output_location}")
     else:
         logger.error(
             f"{operation_type} operation failed with return code {result.returncode}"
         )
-        logger.error(f"Error details saved to: {combined_log_file}")
+        logger.error(f"Error details saved to: {output_location}")
 
-    # Parse metrics if it's a load operation
-    if operation_type.lower() == "load" and result.stdout:
-        metrics = parse_tpt_metrics(result.stdout)
-        if metrics["rows_sent"] is not None:
-            logger.info(f"Rows sent to RDBMS: {metrics['rows_sent']:,}")
-        if metrics["rows_applied"] is not None:
-            logger.info(f"Rows applied: {metrics['rows_applied']:,}")
+    # Report metrics if the job includes a load
+    if operation_type.lower() in ("load", "job"):
+        if result.rows_sent is not None:
+            logger.info(f"Rows sent to RDBMS: {result.rows_sent:,}")
+        if result.rows_applied is not None:
+            logger.info(f"Rows applied: {result.rows_applied:,}")
 
     # Log errors if any
-    if result.stderr:
-        logger.warning(f"TPT stderr output: {result.stderr}")
+    if result.stderr_tail:
+        logger.warning(f"TPT stderr output: {chr(10).join(result.stderr_tail)}")
+
+
+def execute_tbuild(
+    jvar_file: Path,
+    tpt_file: Path,
+    operation_type: str = "unknown",
+    on_event: Optional[Callable[[TbuildEvent], None]] = None,
+    checkpoint: Optional[CheckpointJob] = None,
+    checkpoint_interval: int = CHECKPOINT_INTERVAL,
+    table_name: Optional[str] = None,
+    log_result: bool = True,
+) -> TbuildResult:
+    """
+    Run tbuild command with jobvars and TPT script, returning the job result.
+
+    With log_result False, the caller logs the result, such as once it has
+    moved the log file into the run archive.
+    """
+    cmd = tbuild_command(jvar_file, tpt_file, checkpoint, checkpoint_interval)
+
+    logger.info(f"Starting {operation_type} operation: {' '.join(cmd)}")
+
+    # Stream complete TPT output (stdout and stderr) to one file
+    log_file = tbuild_log_file(jvar_file, operation_type, table_name)
+    result = stream_tbuild(cmd, log_file, operation_type, on_event)
 
-    # Log full output to debug level (for troubleshooting)
-    if result.stdout:
-        logger.debug(f"TPT stdout: {result.stdout}")
+    if log_result:
+        log_tbuild_result(result, operation_type)
+    return result
 
-    return success
+
+def _run_step(
+    table_name: str,
+    operation_type: str,
+    run: Callable[[], TbuildResult],
+    retry_policy: RetryPolicy | None = None,
+    report: "RunReport | None" = None,
+    bytes_read: int = 0,
+    load_operator: Optional[str] = None,
+    archive: "RunArchive | None" = None,
+    first_attempt: int = 1,
+) -> TbuildResult:
+    """
+    Run a step of a table load with retries, recording it in the run report.
+
+    The result of each attempt is logged once its log file is in place: with
+    an archive, the log file is moved into the run's archive, numbered from
+    first_attempt, and the log points to the archive instead.
+    """
+    attempts = itertools.count(first_attempt)
+
+    def run_attempt() -> TbuildResult:
+        result = run()
+        output_location = None
+        if archive is not None:
+            run_id = current_run_id()
+            attempt = next(attempts)
+            entry = archive.add_file(
+                run_id, table_name, operation_type, result.log_file, attempt
+            )
+            if entry is not None:
+                output_location = (
+                    f"{archive.archive_file(run_id)} (read with: pytpt log "
+                    f"{table_name} {operation_type} --run {run_id} --attempt {attempt})"
+                )
+        log_tbuild_result(result, operation_type, output_location)
+        return result
+
+    started_at = time.time()
+    result = run_with_retries(
+        run_attempt, retry_policy, f"{operation_type.capitalize()} of {table_name}"
+    )
+    if report is not None:
+        report.record_step(
+            table_name, operation_type, started_at, result, bytes_read, load_operator
+        )
+    return result
+
+
+def _with_feed(
+    run: Callable[[], TbuildResult], input_feed: PipeFeed | None
+) -> Callable[[], TbuildResult]:
+    """Run a job while its input is fed through a named pipe, if it has a feed."""
+    if input_feed is None:
+        return run
+
+    def run_fed() -> TbuildResult:
+        with input_feed.feeding():
+            result = run()
+        if input_feed.error is None:
+            return result
+        # The job read only part of its input
+        error_line = f"Input feed failed: {input_feed.error}"
+        return replace(
+            result,
+            returncode=result.returncode or 1,
+            error_lines=[*result.error_lines, error_line],
+        )
+
+    return run_fed
+
+
+def _table_columns(table_name: str, config: DictConfig) -> list:
+    """Columns of a table from its DDL, or an empty list if it has none."""
+    from .ddl import load_schema
+
+    schema = load_schema(config.get("load", {}).get("ddl_dir", "ddl"))
+    table = schema.tables.get(table_name)
+    return table.columns if table else []
+
+
+def _csv_bytes(csv_file_path: str | Path) -> int:
+    """Size of a CSV file, or 0 if it is missing."""
+    try:
+        return Path(csv_file_path).stat().st_size
+    except OSError:
+        return 0
 
 
 def load_table(
     table_name: str,
     csv_file_path: str,
+    config: DictConfig | None = None,
+    single_job: bool = False,
+    checkpoints: CheckpointStore | None = None,
+    append: bool = False,
+    report: "RunReport | None" = None,
+    archive: "RunArchive | None" = None,
 ) -> bool:
-    """Load a single CSV file to a table using TPT."""
+    """
+    Load a single CSV file to a table using TPT.
+
+    The consumer operator ($LOAD, $UPDATE, $STREAM or $INSERTER) is chosen
+    from the size of the CSV file, as set in the operator config.
+
+    With checkpoints, the load is checkpointed and a load that failed on an
+    earlier run restarts from its last checkpoint instead of starting over.
+
+    A step that fails for a transient reason, such as a deadlock or no free
+    load slot, is retried on its own as set in the retry config. A $LOAD or
+    $UPDATE without a checkpoint is instead retried from the drop of the
+    table, or not at all when appending.
+
+    With the transform config enabled, the CSV columns are mapped to the
+    table columns by header, and the CSV is rewritten in table column order,
+    to a file or a named pipe, if the two differ.
+
+    Args:
+        table_name: Name of the target table
+        csv_file_path: Path to the CSV file to load
+        config: Configuration to use (default: the cached config)
+        single_job: Drop, create and load in one tbuild job instead of three
+        checkpoints: Store of checkpointed jobs, shared by concurrent loads
+            (default: created from the checkpoint config, if enabled)
+        append: Add the rows to the existing table instead of dropping and
+            creating it first
+        report: Run report to record each step in, shared by concurrent loads
+        archive: Archive to move the TPT output of each step into
+
+    Returns:
+        True if the table was loaded successfully
+    """
+    if config is None:
+        config = load_config()
+    if checkpoints is None:
+        checkpoints = CheckpointStore.from_config(config.get("checkpoint", {}))
+
+    choice = select_operator(
+        csv_file_path, config.get("operator", {}), target_exists=append
+    )
+    logger.info(f"Loading {table_name} with ${choice.operator}: {choice.reason}")
+    retry_policy = RetryPolicy.from_config(config.get("retry", {}))
+
+    # Map the CSV columns to the table columns, rewriting the CSV if they differ
+    transform_config = config.get("transform", {})
+    try:
+        reader_path, input_feed = prepare_transform(
+            table_name,
+            csv_file_path,
+            (
+                _table_columns(table_name, config)
+                if transform_config.get("enabled", False)
+                else []
+            ),
+            transform_config,
+            # A checkpointed load may restart part way through its input
+            allow_pipe=checkpoints is None,
+        )
+    except ValueError as error:
+        logger.error(f"Cannot map {csv_file_path} to table {table_name}: {error}")
+        remove_transform(table_name, transform_config)
+        return False
+
+    # Split large files so they are read by several FileReader instances
+    split_config = config.get("split", {})
+    if input_feed is None:
+        reader_path, reader_instances = prepare_reader_input(
+            table_name, reader_path, split_config
+        )
+    else:
+        # A named pipe is read by one FileReader instance
+        reader_instances = 1
+
+    try:
+        load = load_table_single_job if single_job else load_table_steps
+        return load(
+            table_name,
+            reader_path,
+            config,
+            reader_instances,
+            checkpoints,
+            load_operator=choice.operator,
+            append=append,
+            source_csv=csv_file_path,
+            retry_policy=retry_policy,
+            report=report,
+            archive=archive,
+            input_feed=input_feed,
+        )
+    finally:
+        if reader_instances > 1:
+            remove_chunks(table_name, split_config)
+        remove_transform(table_name, transform_config)
+
+
+def load_table_steps(
+    table_name: str,
+    csv_file_path: str,
+    config: DictConfig | None = None,
+    reader_instances: int = 1,
+    checkpoints: CheckpointStore | None = None,
+    load_operator: str = "LOAD",
+    append: bool = False,
+    source_csv: str | None = None,
+    retry_policy: RetryPolicy | None = None,
+    report: "RunReport | None" = None,
+    archive: "RunArchive | None" = None,
+    input_feed: PipeFeed | None = None,
+) -> bool:
+    """Load a single CSV file to a table using separate drop, create and load jobs."""
     from .templates import create_tpt_files
 
     logger.info(f"Starting table load process: {csv_file_path} -> {table_name}")
+    # The CSV before any split, which checkpoints are matched against
+    source_csv = source_csv or csv_file_path
 
     # Create TPT files
     jvar_file, drop_file, create_file, load_file = create_tpt_files(
-        table_name, csv_file_path
+        table_name, csv_file_path, config, reader_instances, load_operator
     )
 
-    # Step 1: Drop table
-    logger.info(f"Step 1/3: Dropping table {table_name}")
-    drop_success = run_tbuild(jvar_file, drop_file, "drop")
+    checkpoint = None
+    if checkpoints is not None:
+        checkpoint = checkpoints.resumable(table_name, "load", source_csv)
+    if checkpoint is not None:
+        # The table is still part way through the failed load, so keep it
+        logger.info(
+            f"Restarting load of {table_name} from checkpoint {checkpoint.job_name}"
+        )
+        return _run_checkpointed_load(
+            table_name,
+            jvar_file,
+            load_file,
+            checkpoints,
+            checkpoint,
+            load_operator,
+            retry_policy,
+            report,
+            _csv_bytes(source_csv),
+            archive,
+            input_feed,
+        ).success
+
+    # Without a checkpoint, a locked table cannot be loaded again on its own, so
+    # its steps are not retried one by one
+    reload_from_drop = checkpoints is None and load_operator in LOCKING_OPERATORS
+    step_retry_policy = RetryPolicy(max_retries=0) if reload_from_drop else retry_policy
+
+    if append:
+        logger.info(f"Appending to existing table {table_name}")
+        if checkpoints is not None:
+            checkpoint = checkpoints.start(table_name, "load", source_csv)
+        return _run_checkpointed_load(
+            table_name,
+            jvar_file,
+            load_file,
+            checkpoints,
+            checkpoint,
+            load_operator,
+            step_retry_policy,
+            report,
+            _csv_bytes(source_csv),
+            archive,
+            input_feed,
+        ).success
+
+    unit_attempts = itertools.count(1)
+
+    def drop_create_load() -> TbuildResult:
+        attempt = next(unit_attempts)
+        # Step 1: Drop table
+        logger.info(f"Step 1/3: Dropping table {table_name}")
+        drop_result = _run_step(
+            table_name,
+            "drop",
+            lambda: execute_tbuild(
+                jvar_file, drop_file, "drop", table_name=table_name, log_result=False
+            ),
+            step_retry_policy,
+            report,
+            archive=archive,
+            first_attempt=attempt,
+        )
 
-    if not drop_success:
-        logger.error(f"Failed to drop table {table_name}")
-        return False
+        if not drop_result.success:
+            logger.error(f"Failed to drop table {table_name}")
+            return drop_result
+
+        # Step 2: Create table
+        logger.info(f"Step 2/3: Creating table {table_name}")
+        create_result = _run_step(
+            table_name,
+            "create",
+            lambda: execute_tbuild(
+                jvar_file,
+                create_file,
+                "create",
+                table_name=table_name,
+                log_result=False,
+            ),
+            step_retry_policy,
+            report,
+            archive=archive,
+            first_attempt=attempt,
+        )
 
-    # Step 2: Create table
-    logger.info(f"Step 2/3: Creating table {table_name}")
-    create_success = run_tbuild(jvar_file, create_file, "create")
+        if not create_result.success:
+            logger.error(f"Failed to create table {table_name}")
+            return create_result
+
+        # Step 3: Load data
+        logger.info(f"Step 3/3: Loading data into {table_name}")
+        checkpoint = None
+        if checkpoints is not None:
+            checkpoint = checkpoints.start(table_name, "load", source_csv)
+        return _run_checkpointed_load(
+            table_name,
+            jvar_file,
+            load_file,
+            checkpoints,
+            checkpoint,
+            load_operator,
+            step_retry_policy,
+            report,
+            _csv_bytes(source_csv),
+            archive,
+            input_feed,
+            attempt,
+        )
 
-    if not create_success:
-        logger.error(f"Failed to create table {table_name}")
-        return False
+    if not reload_from_drop:
+        return drop_create_load().success
+    return run_with_retries(
+        drop_create_load, retry_policy, f"Drop, create and load of {table_name}"
+    ).success
+
+
+def _run_checkpointed_load(
+    table_name: str,
+    jvar_file: Path,
+    load_file: Path,
+    checkpoints: CheckpointStore | None,
+    checkpoint: CheckpointJob | None,
+    load_operator: str = "LOAD",
+    retry_policy: RetryPolicy | None = None,
+    report: "RunReport | None" = None,
+    bytes_read: int = 0,
+    archive: "RunArchive | None" = None,
+    input_feed: PipeFeed | None = None,
+    first_attempt: int = 1,
+) -> TbuildResult:
+    """Run the load job, cleaning up its checkpoint if it succeeds."""
+    # A retry of a checkpointed load restarts from its last checkpoint
+    load_result = _run_step(
+        table_name,
+        "load",
+        _with_feed(
+            lambda: execute_tbuild(
+                jvar_file,
+                load_file,
+                "load",
+                checkpoint=checkpoint,
+                checkpoint_interval=(
+                    checkpoints.interval if checkpoints else CHECKPOINT_INTERVAL
+                ),
+                table_name=table_name,
+                log_result=False,
+            ),
+            input_feed,
+        ),
+        retry_policy,
+        report,
+        bytes_read,
+        load_operator,
+        archive,
+        first_attempt,
+    )
+    load_success = load_result.success
+
+    if load_success:
+        if checkpoints is not None:
+            checkpoints.complete(table_name)
+        logger.success(f"Successfully completed table load: {table_name}")
+    else:
+        logger.error(f"Failed to load data to {table_name}")
+        if checkpoint is not None:
+            logger.info(f"Rerun to restart {table_name} from its last checkpoint")
+
+    return load_result
+
+
+def load_table_single_job(
+    table_name: str,
+    csv_file_path: str,
+    config: DictConfig | None = None,
+    reader_instances: int = 1,
+    checkpoints: CheckpointStore | None = None,
+    load_operator: str = "LOAD",
+    append: bool = False,
+    source_csv: str | None = None,
+    retry_policy: RetryPolicy | None = None,
+    report: "RunReport | None" = None,
+    archive: "RunArchive | None" = None,
+    input_feed: PipeFeed | None = None,
+) -> bool:
+    """Load a single CSV file to a table using one tbuild job for drop, create and load."""
+    from .templates import create_tpt_job_files
+
+    logger.info(f"Starting single job table load: {csv_file_path} -> {table_name}")
+    source_csv = source_csv or csv_file_path
+
+    # Create TPT files
+    jvar_file, job_file = create_tpt_job_files(
+        table_name, csv_file_path, config, reader_instances, load_operator, append
+    )
+
+    checkpoint = None
+    restarted = False
+    if checkpoints is not None:
+        checkpoint = checkpoints.resumable(table_name, "job", source_csv)
+        restarted = checkpoint is not None
+        if restarted:
+            logger.info(
+                f"Restarting job for {table_name} from checkpoint {checkpoint.job_name}"
+            )
+        else:
+            checkpoint = checkpoints.start(table_name, "job", source_csv)
+
+    # With a checkpoint, a retry restarts the job at the step that failed; an
+    # appending job without one has no drop to unlock the table before a retry
+    if append and checkpoint is None and load_operator in LOCKING_OPERATORS:
+        retry_policy = RetryPolicy(max_retries=0)
+    result = _run_step(
+        table_name,
+        "job",
+        _with_feed(
+            lambda: execute_tbuild(
+                jvar_file,
+                job_file,
+                "job",
+                checkpoint=checkpoint,
+                checkpoint_interval=(
+                    checkpoints.interval if checkpoints else CHECKPOINT_INTERVAL
+                ),
+                table_name=table_name,
+                log_result=False,
+            ),
+            input_feed,
+        ),
+        retry_policy,
+        report,
+        _csv_bytes(source_csv),
+        load_operator,
+        archive,
+    )
+    restarted = restarted or (checkpoint is not None and result.attempts > 1)
+    step_results = result.step_results
+
+    # Report each operation separately; a step that never ran counts as failed,
+    # unless the job restarted past it because it completed on an earlier run,
+    # or it was left out of the job to append to the existing table
+    operation_results = {}
+    for step, operation in TABLE_JOB_STEPS.items():
+        skipped = restarted or (append and operation != "load")
+        step_success = step_results.get(step, skipped)
+        operation_results[operation] = (
+            operation_results.get(operation, True) and step_success
+        )
+
+    for step_number, (operation, success) in enumerate(operation_results.items(), 1):
+        if success:
+            logger.info(f"Step {step_number}/3: {operation} {table_name} succeeded")
+        else:
+            logger.error(f"Step {step_number}/3: {operation} {table_name} failed")
 
-    # Step 3: Load data
-    logger.info(f"Step 3/3: Loading data into {table_name}")
-    load_success = run_tbuild(jvar_file, load_file, "load")
+    load_success = result.success and all(operation_results.values())
 
     if load_success:
+        if checkpoints is not None:
+            checkpoints.complete(table_name)
         logger.success(f"Successfully completed table load: {table_name}")
     else:
         logger.error(f"Failed to load data to {table_name}")
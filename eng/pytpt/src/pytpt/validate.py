@@ -0,0 +1,247 @@
+"""Fast CSV validation against a table's DDL before it is loaded."""
+
+import csv
+import re
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Optional
+
+from .csv_transform import ColumnMapping
+from .ddl import Column
+
+# Rows validated together; each column of a chunk is checked in one pass
+CHUNK_ROWS = 50_000
+
+# Default number of offending rows to report
+MAX_ERRORS = 20
+
+# Value ranges of the integer types
+INTEGER_RANGES = {
+    "BYTEINT": (-(2**7), 2**7 - 1),
+    "SMALLINT": (-(2**15), 2**15 - 1),
+    "INTEGER": (-(2**31), 2**31 - 1),
+    "INT": (-(2**31), 2**31 - 1),
+    "BIGINT": (-(2**63), 2**63 - 1),
+}
+
+# Teradata truncates a fraction when converting text to an integer, so allow one
+INTEGER_PATTERN = r"[-+]?\d+(?:\.\d*)?"
+FLOAT_PATTERN = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+DATE_PATTERN = r"\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])"
+
+CHARACTER_TYPES = ("CHAR", "VARCHAR", "CHARACTER")
+
+
+@dataclass
+class RowError:
+    """A problem found in one CSV record."""
+
+    line_number: int
+    column: Optional[str]
+    value: Optional[str]
+    message: str
+
+
+@dataclass
+class ValidationReport:
+    """Result of validating a CSV file."""
+
+    csv_file: Path
+    rows_checked: int = 0
+    errors: list[RowError] = field(default_factory=list)
+    complete: bool = True
+
+    @property
+    def valid(self) -> bool:
+        """True if no problems were found."""
+        return not self.errors
+
+
+def _value_pattern(column: Column) -> Optional[str]:
+    """Get the regex a non-empty value of the column must fully match."""
+    if column.data_type in INTEGER_RANGES:
+        return INTEGER_PATTERN
+    if column.data_type in ("DECIMAL", "NUMERIC"):
+        precision = column.length or 5
+        scale = column.scale or 0
+        return rf"[-+]?(?=\.?\d)\d{{0,{precision - scale}}}(?:\.\d*)?"
+    if column.data_type in ("FLOAT", "REAL", "DOUBLE"):
+        return FLOAT_PATTERN
+    if column.data_type == "DATE":
+        return DATE_PATTERN
+    return None
+
+
+class ColumnCheck:
+    """Checks one column of a chunk of rows, vectorised over the whole column."""
+
+    def __init__(self, column: Column):
+        self.column = column
+        pattern = _value_pattern(column)
+        self.value_regex = re.compile(pattern) if pattern else None
+        # Matches a whole column joined with newlines in one call when every value is valid
+        self.column_regex = (
+            re.compile(rf"(?:(?:{pattern})?\n)*(?:{pattern})?") if pattern else None
+        )
+        self.max_length = (
+            column.length
+            if column.data_type in CHARACTER_TYPES and column.length
+            else None
+        )
+        self.integer_range = INTEGER_RANGES.get(column.data_type)
+
+    def check(self, values: list[str]) -> list[tuple[int, str]]:
+        """
+        Check a column of values.
+
+        Args:
+            values: The column's values for each row in the chunk
+
+        Returns:
+            List of (row index within the chunk, message) for bad values
+        """
+        problems = []
+
+        # Empty fields load as NULL
+        if not self.column.nullable and "" in values:
+            problems.extend(
+                (index, "NULL in NOT NULL column")
+                for index, value in enumerate(values)
+                if value == ""
+            )
+
+        if self.max_length and max(map(len, values), default=0) > self.max_length:
+            problems.extend(
+                (index, f"longer than {self.max_length} characters")
+                for index, value in enumerate(values)
+                if len(value) > self.max_length
+            )
+
+        if self.column_regex and not self.column_regex.fullmatch("\n".join(values)):
+            problems.extend(
+                (index, f"not a valid {self.column.data_type}")
+                for index, value in enumerate(values)
+                if value and not self.value_regex.fullmatch(value)
+            )
+
+        if self.integer_range and max(map(len, values), default=0) > 9:
+            low, high = self.integer_range
+            for index, value in enumerate(values):
+                if len(value) > 9 and self.value_regex.fullmatch(value):
+                    if not low <= int(value.split(".")[0]) <= high:
+                        problems.append(
+                            (index, f"out of range for {self.column.data_type}")
+                        )
+
+        return problems
+
+
+def _iter_chunks(reader, chunk_rows: int):
+    """Yield chunks of rows from a csv reader with the line number each row starts on."""
+    line_number = reader.line_num
+    while True:
+        rows = []
+        line_numbers = []
+        for row in islice(reader, chunk_rows):
+            rows.append(row)
+            line_numbers.append(line_number + 1)
+            line_number = reader.line_num
+        if not rows:
+            return
+        yield rows, line_numbers
+
+
+def validate_csv(
+    csv_file: str | Path,
+    columns: list[Column],
+    max_errors: int = MAX_ERRORS,
+    chunk_rows: int = CHUNK_ROWS,
+    skip_rows: int = 1,
+    mapping: Optional[ColumnMapping] = None,
+) -> ValidationReport:
+    """
+    Validate a CSV file against table columns, streaming it in chunks.
+
+    Checks column count, NOT NULL, character lengths and that values can be
+    converted to the column type. Validation stops once max_errors offending
+    rows have been found.
+
+    Args:
+        csv_file: CSV file to validate
+        columns: Columns of the target table, from ddl.parse_columns
+        max_errors: Number of offending rows to report before stopping
+        chunk_rows: Number of rows checked together
+        skip_rows: Number of header rows to skip
+        mapping: Where each table column is in the CSV, from
+            csv_transform.map_columns (default: the table's columns, by position)
+
+    Returns:
+        Validation report with the first offending rows and their line numbers
+    """
+    report = ValidationReport(Path(csv_file))
+    if mapping is None:
+        sources = list(range(len(columns)))
+        column_count = len(columns)
+    else:
+        sources = mapping.sources
+        column_count = len(mapping.header)
+    # Columns filled with their default are not in the CSV to check
+    checks = [
+        (position, source, ColumnCheck(column))
+        for position, (column, source) in enumerate(zip(columns, sources))
+        if source is not None
+    ]
+
+    with open(csv_file, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        for _ in islice(reader, skip_rows):
+            pass
+
+        try:
+            for rows, line_numbers in _iter_chunks(reader, chunk_rows):
+                report.rows_checked += len(rows)
+
+                problems: dict[int, RowError] = {}
+                well_formed = []
+                for index, row in enumerate(rows):
+                    if len(row) == column_count:
+                        well_formed.append(index)
+                    else:
+                        problems[index] = RowError(
+                            line_numbers[index],
+                            None,
+                            None,
+                            f"expected {column_count} columns, found {len(row)}",
+                        )
+
+                if len(well_formed) < len(rows):
+                    rows_to_check = [rows[index] for index in well_formed]
+                else:
+                    rows_to_check = rows
+
+                if rows_to_check:
+                    csv_columns = list(zip(*rows_to_check))
+                    for position, source, check in checks:
+                        for index, message in check.check(list(csv_columns[source])):
+                            index = well_formed[index]
+                            if index not in problems:
+                                problems[index] = RowError(
+                                    line_numbers[index],
+                                    columns[position].name,
+                                    rows[index][source],
+                                    message,
+                                )
+
+                for index in sorted(problems):
+                    report.errors.append(problems[index])
+                    if len(report.errors) >= max_errors:
+                        report.complete = False
+                        return report
+        except UnicodeDecodeError as e:
+            report.errors.append(
+                RowError(reader.line_num + 1, None, None, f"invalid UTF-8: {e}")
+            )
+            report.complete = False
+
+    return report
@@ -0,0 +1,18 @@
+"""Fixtures shared by the tests."""
+
+import pytest
+
+from pytpt.pool import ConnectionPool
+from pytpt.stub_driver import StubDatabase
+
+
+@pytest.fixture
+def database():
+    """Empty stub database, which a test module may override to add its tables."""
+    return StubDatabase()
+
+
+@pytest.fixture
+def pool(database):
+    """Connection pool over the stub database."""
+    return ConnectionPool(database.connect, min_size=0, max_size=4)
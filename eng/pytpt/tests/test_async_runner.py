@@ -0,0 +1,225 @@
+"""Tests for async_runner module."""
+
+import asyncio
+import os
+import signal
+import stat
+import time
+from pathlib import Path
+
+import pytest
+
+from pytpt.async_runner import (
+    TIMEOUT_RETURN_CODE,
+    TbuildJob,
+    TbuildSupervisor,
+    run_tbuild_jobs,
+    stream_tbuild_async,
+    tbuild_job,
+)
+
+FAKE_TBUILD = """#!/bin/sh
+# Fake tbuild: the first argument chooses how the job behaves
+echo "Teradata Parallel Transporter Version 20.00.00.16 64-Bit"
+echo '$LOAD: entering Acquisition Phase'
+case "$1" in
+  ok)
+    sleep 0.2
+    echo '$LOAD: Total Rows Sent To RDBMS:      100'
+    echo '$LOAD: Total Rows Applied:            100'
+    echo "Job step load_stg_table completed successfully"
+    ;;
+  fail-once)
+    if [ ! -f "$2" ]; then
+      touch "$2"
+      echo "RDBMS error 2631: Transaction ABORTed due to deadlock." >&2
+      exit 12
+    fi
+    echo "Job step load_stg_table completed successfully"
+    ;;
+  fail)
+    echo "Job step load_stg_table terminated (status 8)"
+    exit 8
+    ;;
+  syntax-error)
+    echo "RDBMS error 3706: Syntax error: expected something between '(' and ')'." >&2
+    exit 12
+    ;;
+  hang)
+    # A child process, as tbuild starts its operators
+    sleep 60 &
+    echo $! > "$2"
+    wait
+    ;;
+esac
+"""
+
+
+@pytest.fixture
+def fake_tbuild(tmp_path):
+    """Write the fake tbuild shell script and return its path."""
+    if os.name == "nt":
+        pytest.skip("Fake tbuild script requires a POSIX shell")
+    script = tmp_path / "tbuild"
+    script.write_text(FAKE_TBUILD)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return script
+
+
+def is_running(pid: int) -> bool:
+    """True if a process exists and is not a zombie."""
+    try:
+        status = Path(f"/proc/{pid}/stat").read_text()
+    except FileNotFoundError:
+        return False
+    return status.rsplit(")", 1)[1].split()[0] != "Z"
+
+
+def wait_until_stopped(pid: int, timeout: float = 5.0) -> bool:
+    """Wait for a signalled process to exit, True if it did within the timeout."""
+    deadline = time.monotonic() + timeout
+    while is_running(pid):
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def make_job(script, tmp_path, name, *args, timeout=None) -> TbuildJob:
+    """Build a job running the fake tbuild."""
+    return TbuildJob(
+        name,
+        [str(script), *map(str, args)],
+        tmp_path / "logs" / f"{name}.log",
+        "load",
+        timeout,
+    )
+
+
+def test_stream_tbuild_async(fake_tbuild, tmp_path):
+    """Test output is parsed and teed to the log as the job runs."""
+    events = []
+    log_file = tmp_path / "logs" / "ok.log"
+
+    result = asyncio.run(
+        stream_tbuild_async([str(fake_tbuild), "ok"], log_file, "load", events.append)
+    )
+
+    assert result.success
+    assert result.rows_applied == 100
+    assert result.step_results == {"load_stg_table": True}
+    assert [event.kind for event in events][0] == "started"
+    assert "phase" in [event.kind for event in events]
+    assert "Return Code: 0" in log_file.read_text()
+
+
+def test_supervisor_runs_jobs_concurrently(fake_tbuild, tmp_path):
+    """Test many jobs share the event loop, at most max_concurrent at a time."""
+    jobs = [make_job(fake_tbuild, tmp_path, f"job{i}", "ok") for i in range(40)]
+
+    results = run_tbuild_jobs(jobs, max_concurrent=20)
+
+    assert [result.job.name for result in results] == [job.name for job in jobs]
+    assert all(result.success and result.attempts == 1 for result in results)
+    # 40 jobs of 0.2s each, run 20 at a time
+    assert max(result.elapsed for result in results) < 4
+
+
+def test_supervisor_retries_transient_failure(fake_tbuild, tmp_path):
+    """Test a job failing with a transient return code is retried after a backoff."""
+    marker = tmp_path / "failed-once"
+    supervisor = TbuildSupervisor(backoff=0.05)
+    retry_events = []
+
+    async def run():
+        job = make_job(fake_tbuild, tmp_path, "flaky", "fail-once", marker)
+        task = asyncio.ensure_future(supervisor.run([job]))
+        async for job_event in supervisor.events():
+            if job_event.event.kind == "retry":
+                retry_events.append(job_event)
+        return await task
+
+    (result,) = asyncio.run(run())
+
+    assert result.success
+    assert result.attempts == 2
+    assert [event.attempt for event in retry_events] == [1]
+
+
+def test_supervisor_does_not_retry_other_failures(fake_tbuild, tmp_path):
+    """Test a failure without a transient error is not retried, whatever its return code."""
+    results = run_tbuild_jobs(
+        [
+            make_job(fake_tbuild, tmp_path, "bad", "fail"),
+            make_job(fake_tbuild, tmp_path, "syntax", "syntax-error"),
+        ],
+        backoff=0,
+    )
+
+    assert [result.result.returncode for result in results] == [8, 12]
+    assert all(result.attempts == 1 for result in results)
+
+
+def test_supervisor_retry_delay_has_jitter():
+    """Test retries wait a jittered, doubling backoff up to the maximum."""
+    supervisor = TbuildSupervisor(backoff=2, max_backoff=5)
+    delays = [supervisor.retry_delay(2) for _ in range(50)]
+
+    assert all(2 <= delay <= 4 for delay in delays)
+    assert len(set(delays)) > 1
+    assert TbuildSupervisor(max_backoff=5, jitter=0).retry_delay(10) == 5
+
+
+def test_supervisor_timeout_kills_process_group(fake_tbuild, tmp_path):
+    """Test a job past its timeout is killed along with its children."""
+    pid_file = tmp_path / "child.pid"
+    job = make_job(fake_tbuild, tmp_path, "slow", "hang", pid_file, timeout=0.5)
+
+    (result,) = run_tbuild_jobs([job], max_retries=0)
+
+    assert result.timed_out
+    assert result.result.returncode == TIMEOUT_RETURN_CODE
+    assert wait_until_stopped(int(pid_file.read_text()))
+    assert "Timed out" in job.log_file.read_text()
+
+
+def test_supervisor_sigint_cancels_jobs(fake_tbuild, tmp_path):
+    """Test SIGINT stops running jobs and their children, and skips waiting ones."""
+    pid_files = [tmp_path / f"child{i}.pid" for i in range(3)]
+    jobs = [
+        make_job(fake_tbuild, tmp_path, f"hang{i}", "hang", pid_file)
+        for i, pid_file in enumerate(pid_files)
+    ]
+    supervisor = TbuildSupervisor(max_concurrent=2)
+
+    async def run():
+        task = asyncio.ensure_future(supervisor.run(jobs))
+        # Wait until both running jobs have written their child's pid
+        while not all(
+            pid_file.exists() and pid_file.read_text().strip()
+            for pid_file in pid_files[:2]
+        ):
+            await asyncio.sleep(0.01)
+        os.kill(os.getpid(), signal.SIGINT)
+        return await task
+
+    results = asyncio.run(run())
+
+    assert all(result.cancelled for result in results)
+    assert results[2].attempts == 0
+    for pid_file in pid_files[:2]:
+        assert wait_until_stopped(int(pid_file.read_text()))
+
+
+def test_tbuild_job(tmp_path, monkeypatch):
+    """Test a job for a jobvars and TPT script runs tbuild as run_tbuild does."""
+    monkeypatch.chdir(tmp_path)
+
+    job = tbuild_job(
+        Path("render_tmp/VENUE.jvar"), Path("render_tmp/VENUE_load.tpt"), "load"
+    )
+
+    assert job.name == "VENUE_load"
+    assert job.cmd[0] == "tbuild"
+    assert job.cmd[-1] == "-nocp"
+    assert job.log_file == Path("logs") / "tpt_VENUE_load.log"
@@ -0,0 +1,186 @@
+"""Tests for cli module."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from omegaconf import OmegaConf
+
+import pytpt
+from pytpt.cli import main, parse_args, table_ddl_hash
+from pytpt.config_utils import load_config
+from pytpt.run_archive import RunArchive
+
+GAME_TYPE_DDL = """create table PRD_ADS_PYTHON_NFL_DB.GAME_TYPE (
+  GAME_TYPE_ID integer not null
+, GAME_TYPE varchar(10)
+, constraint GAME_TYPE_PK primary key (GAME_TYPE_ID)
+);
+"""
+
+GAME_DDL = """create table PRD_ADS_PYTHON_NFL_DB.GAME (
+  GAME_ID integer not null
+, GAME_TYPE_ID integer
+, constraint GAME_PK primary key (GAME_ID)
+, constraint GAME_GAME_TYPE_ID_FK foreign key (GAME_TYPE_ID) references PRD_ADS_PYTHON_NFL_DB.GAME_TYPE (GAME_TYPE_ID)
+);
+"""
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A project with a plain YAML config, DDL and CSV files for two tables."""
+    (tmp_path / "conf").mkdir()
+    (tmp_path / "conf" / "config.yaml").write_text(
+        "data:\n"
+        "  dir: data\n"
+        "logging:\n"
+        "  dir: logs\n"
+        "  file: pytpt.log\n"
+        "  level: WARNING\n"
+        "load:\n"
+        "  ddl_dir: ddl\n"
+        "tables:\n"
+        "  game: GAME\n"
+        "  game_type: GAME_TYPE\n"
+    )
+    (tmp_path / "ddl").mkdir()
+    (tmp_path / "ddl" / "game_type.sql").write_text(GAME_TYPE_DDL)
+    (tmp_path / "ddl" / "game.sql").write_text(GAME_DDL)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "game.csv").write_text("GAME_ID,GAME_TYPE_ID\n1,1\n")
+    (tmp_path / "data" / "game_type.csv").write_text("GAME_TYPE_ID,GAME_TYPE\n1,REG\n")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_parse_args_tables_and_options():
+    """Test commands take their own options and an optional list of tables."""
+    args = parse_args(["--config-dir", "other", "load", "--force", "GAME"])
+
+    assert args.command == "load"
+    assert args.config_dir == "other"
+    assert args.force
+    assert args.tables == ["GAME"]
+
+
+def test_parse_args_requires_command():
+    """Test a command must be given."""
+    with pytest.raises(SystemExit):
+        parse_args([])
+
+
+def test_table_ddl_hash_covers_load_inputs(tmp_path, monkeypatch):
+    """Test the hash follows the load script and aliases, not CSV path or password."""
+    config = OmegaConf.to_container(load_config(), resolve=True)
+    csv_file = tmp_path / "player.csv"
+    csv_file.write_text("GAME_PLAYER_ID,LOCATION\n1,Home\n")
+    moved_file = tmp_path / "moved" / "player.csv"
+    moved_file.parent.mkdir()
+    moved_file.write_text(csv_file.read_text())
+
+    def ddl_hash(csv_file, **sections):
+        return table_ddl_hash(
+            "PLAYER", str(csv_file), OmegaConf.create({**config, **sections})
+        )
+
+    base = ddl_hash(csv_file)
+    assert ddl_hash(moved_file) == base
+    monkeypatch.setenv("TARGET_PASSWORD", "rotated")
+    assert ddl_hash(csv_file) == base
+
+    assert ddl_hash(csv_file, operator={"mode": "stream"}) != base
+    aliases = {"PLAYER": {"HOME_OR_AWAY": "HOME_AWAY"}}
+    transform = {**config["transform"], "aliases": aliases}
+    assert ddl_hash(csv_file, transform=transform) != base
+
+
+def test_plan_lists_tables_parents_first(project, capsys):
+    """Test plan --list-tables prints each table once, parents before children."""
+    assert main(["plan", "--list-tables"]) == 0
+
+    assert capsys.readouterr().out.split() == ["GAME_TYPE", "GAME"]
+
+
+def test_plan_shows_operator(project, capsys):
+    """Test plan shows the operator each table would load with."""
+    assert main(["plan", "game_type"]) == 0
+
+    out = capsys.readouterr().out
+    assert "Level 0:" in out
+    assert "GAME_TYPE" in out and "$INSERTER" in out
+    assert "GAME " not in out
+
+
+def test_validate_fails_on_bad_rows(project, capsys):
+    """Test validate exits with 1 when a CSV does not match its DDL."""
+    (project / "data" / "game.csv").write_text("GAME_ID,GAME_TYPE_ID\nabc,1\n")
+
+    assert main(["validate"]) == 1
+
+    out = capsys.readouterr().out
+    assert "FAILED  GAME " in out
+    assert "OK      GAME_TYPE" in out
+
+
+def test_validate_maps_columns_by_header(project, capsys):
+    """Test validate matches CSV columns by header when the transform is enabled."""
+    # By position, the empty first field would be a NULL GAME_ID
+    (project / "data" / "game.csv").write_text("TYPE,GAME_ID\n,1\n")
+    assert main(["validate", "game"]) == 1
+    capsys.readouterr()
+    config_file = project / "conf" / "config.yaml"
+    config_file.write_text(
+        config_file.read_text() + "transform:\n"
+        "  enabled: true\n"
+        "  aliases:\n"
+        "    GAME:\n"
+        "      TYPE: GAME_TYPE_ID\n"
+    )
+
+    assert main(["validate", "game"]) == 0
+    assert "OK      GAME " in capsys.readouterr().out
+
+    (project / "data" / "game.csv").write_text("TYPE\n1\n")
+    assert main(["validate", "game"]) == 1
+    assert "FAILED  GAME " in capsys.readouterr().out
+
+
+def test_plan_imports_neither_jinja_nor_hydra(project):
+    """Test plan with a plain YAML config starts without importing Jinja or Hydra."""
+    env = dict(os.environ, PYTHONPATH=str(Path(pytpt.__file__).parents[1]))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "pytpt.cli", "plan"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    imported = {
+        line.rsplit("|", 1)[1].strip()
+        for line in completed.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    assert "pytpt.ddl" in imported
+    assert "jinja2" not in imported
+    assert "hydra" not in imported
+
+
+def test_log_prints_archived_output(project, capsys):
+    """Test log prints a table's steps from the last run in the archive."""
+    archive = RunArchive()
+    archive.add("run1", "GAME", "load", b"old load\n")
+    archive.add("run2", "GAME", "drop", b"new drop\n")
+    archive.add("run2", "GAME", "load", b"new load\n")
+
+    assert main(["log", "game"]) == 0
+    out = capsys.readouterr().out
+    assert "new drop" in out and "new load" in out and "old load" not in out
+
+    assert main(["log", "game", "load", "--run", "run1"]) == 0
+    assert "old load" in capsys.readouterr().out
+
+    assert main(["log", "venue"]) == 1
@@ -0,0 +1,92 @@
+"""Tests for config_utils module."""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+from omegaconf import DictConfig
+
+from pytpt.config_utils import load_config, clear_config_cache
+
+
+def write_config(config_dir: Path, data_dir: str) -> Path:
+    """Write a minimal config.yaml into a directory."""
+    config_file = config_dir / "config.yaml"
+    config_file.write_text(f'data:\n  dir: "{data_dir}"\n')
+    return config_file
+
+
+def test_load_config_is_cached():
+    """Test that repeated calls return the same config object."""
+    clear_config_cache()
+
+    assert load_config() is load_config()
+
+
+def test_load_config_force_reload():
+    """Test that force_reload recomposes the config."""
+    config = load_config()
+
+    assert load_config(force_reload=True) is not config
+
+
+def test_clear_config_cache():
+    """Test that clearing the cache recomposes the config."""
+    config = load_config()
+    clear_config_cache()
+
+    assert load_config() is not config
+
+
+def test_load_config_is_read_only():
+    """Test that the shared config cannot be modified."""
+    config = load_config()
+
+    assert isinstance(config, DictConfig)
+    with pytest.raises(Exception):
+        config.data.dir = "elsewhere"
+
+
+def test_load_config_reloads_when_yaml_changes():
+    """Test that a change to the YAML mtime invalidates the cache."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_dir = Path(temp_dir)
+        config_file = write_config(config_dir, "first")
+
+        config = load_config(config_dir)
+        assert load_config(config_dir) is config
+        assert config.data.dir == "first"
+
+        write_config(config_dir, "second")
+        stat = config_file.stat()
+        os.utime(config_file, (stat.st_atime, stat.st_mtime + 10))
+
+        reloaded = load_config(config_dir)
+        assert reloaded is not config
+        assert reloaded.data.dir == "second"
+
+
+def test_load_config_plain_yaml_skips_hydra(tmp_path, monkeypatch):
+    """Test a config without a defaults list is loaded without Hydra composing it."""
+    import hydra
+
+    def fail_compose(*args, **kwargs):
+        raise AssertionError("Hydra should not compose a plain YAML config")
+
+    monkeypatch.setattr(hydra, "compose", fail_compose)
+    write_config(tmp_path, "plain")
+
+    config = load_config(tmp_path)
+
+    assert config.data.dir == "plain"
+    with pytest.raises(Exception):
+        config.data.dir = "elsewhere"
+
+
+def test_load_config_composes_defaults():
+    """Test a config with a defaults list is composed with its config groups."""
+    config = load_config(force_reload=True)
+
+    assert "defaults" not in config
+    assert config.database.target_host
@@ -0,0 +1,110 @@
+"""Tests for csv_profile module."""
+
+import csv
+import os
+
+import pytpt.csv_profile as csv_profile
+from pytpt.csv_profile import (
+    ProfileCache,
+    count_records,
+    profile_csv,
+    profile_csv_files,
+)
+
+
+def test_count_records(tmp_path):
+    """Test that every line is a record, with or without a final newline."""
+    csv_file = tmp_path / "game.csv"
+    csv_file.write_bytes(b"GAME_ID,GAME_TYPE_ID\n1,1\n2,1\n")
+    assert count_records(csv_file) == (3, False)
+
+    csv_file.write_bytes(b"GAME_ID,GAME_TYPE_ID\n1,1\n2,1")
+    assert count_records(csv_file) == (3, False)
+
+
+def test_count_records_empty_file(tmp_path):
+    """Test that an empty file has no records."""
+    csv_file = tmp_path / "empty.csv"
+    csv_file.write_bytes(b"")
+
+    assert count_records(csv_file) == (0, False)
+
+
+def test_count_records_quoted_newlines(tmp_path):
+    """Test that a newline inside a quoted field does not end a record."""
+    csv_file = tmp_path / "venue.csv"
+    csv_file.write_bytes(
+        b'VENUE_ID,VENUE_NAME\n1,"Lambeau\nField"\n2,"Soldier ""Field"""\n'
+    )
+
+    assert count_records(csv_file) == (3, True)
+
+
+def test_count_records_across_blocks(tmp_path, monkeypatch):
+    """Test that a quoted field spanning two scan blocks is counted once."""
+    monkeypatch.setattr(csv_profile, "SCAN_BLOCK_SIZE", 8)
+    csv_file = tmp_path / "venue.csv"
+    csv_file.write_bytes(b'ID,NAME\n1,"a\nb\nc\nd\ne"\n2,x\n3,y\n')
+
+    assert count_records(csv_file) == (4, True)
+
+
+def test_count_records_matches_csv_reader(tmp_path, monkeypatch):
+    """Test that escaped quotes split across any block size count as csv.reader does."""
+    csv_file = tmp_path / "venue.csv"
+    csv_file.write_bytes(b'ID,NAME\n1,"a""\nb"\n2,""""\n3,"x\n""y"""\n4,""\n')
+    with open(csv_file, "r", newline="") as f:
+        expected = sum(1 for _ in csv.reader(f))
+
+    for block_size in range(1, 12):
+        monkeypatch.setattr(csv_profile, "SCAN_BLOCK_SIZE", block_size)
+        assert count_records(csv_file) == (expected, True)
+
+
+def test_profile_csv(tmp_path):
+    """Test that the profile has the data rows, size and header."""
+    csv_file = tmp_path / "game.csv"
+    csv_file.write_bytes(b"GAME_ID,GAME_TYPE_ID\n1,1\n2,1\n")
+
+    profile = profile_csv(csv_file)
+
+    assert profile.rows == 2
+    assert profile.columns == 2
+    assert profile.header == ["GAME_ID", "GAME_TYPE_ID"]
+    assert profile.size == csv_file.stat().st_size
+    assert profile.matches(csv_file)
+
+
+def test_profile_cache_reuses_unchanged_files(tmp_path, monkeypatch):
+    """Test that a cached profile is reused until its file changes."""
+    csv_file = tmp_path / "game.csv"
+    csv_file.write_bytes(b"GAME_ID\n1\n")
+    cache_file = tmp_path / "state" / "csv_profiles.json"
+    profile_csv_files([csv_file], ProfileCache(cache_file))
+
+    def fail(csv_file):
+        raise AssertionError(f"{csv_file} profiled again")
+
+    monkeypatch.setattr(csv_profile, "profile_csv", fail)
+    profiles = profile_csv_files([csv_file], ProfileCache(cache_file))
+    assert profiles[csv_file].rows == 1
+
+    monkeypatch.undo()
+    csv_file.write_bytes(b"GAME_ID\n1\n2\n")
+    os.utime(csv_file, ns=(0, 0))
+    profiles = profile_csv_files([csv_file], ProfileCache(cache_file))
+    assert profiles[csv_file].rows == 2
+
+
+def test_profile_csv_files_in_processes(tmp_path):
+    """Test that several files are profiled in a process pool, keyed by path."""
+    csv_files = []
+    for rows in range(1, 4):
+        csv_file = tmp_path / f"table{rows}.csv"
+        csv_file.write_text("ID\n" + "".join(f"{row}\n" for row in range(rows)))
+        csv_files.append(csv_file)
+
+    profiles = profile_csv_files(csv_files, max_workers=2)
+
+    assert list(profiles) == csv_files
+    assert [profile.rows for profile in profiles.values()] == [1, 2, 3]
@@ -0,0 +1,119 @@
+"""Tests for csv_split module."""
+
+import csv
+import io
+
+import pytest
+
+from pytpt import csv_split
+from pytpt.csv_split import (
+    choose_chunk_count,
+    find_record_boundaries,
+    prepare_reader_input,
+    remove_chunks,
+    split_csv,
+)
+
+MULTILINE_CSV = (
+    "id,name,notes\n"
+    '1,"Smith, John","line one\nline two"\n'
+    "2,Jones,plain\n"
+    '3,"Quote ""inside""","multi\nline\nfield"\n'
+    "4,Brown,plain\n"
+    '5,White,"ends\nhere"\n'
+)
+
+
+def read_records(text: str) -> list[list[str]]:
+    """Parse CSV text into records."""
+    return list(csv.reader(io.StringIO(text)))
+
+
+def test_choose_chunk_count():
+    """Test the chunk count grows with file size up to the maximum."""
+    mb = 1024 * 1024
+
+    assert choose_chunk_count(10 * mb, target_chunk_bytes=64 * mb) == 1
+    assert choose_chunk_count(130 * mb, target_chunk_bytes=64 * mb) == 3
+    assert (
+        choose_chunk_count(10_000 * mb, target_chunk_bytes=64 * mb, max_chunks=8) == 8
+    )
+
+
+def test_find_record_boundaries_skips_quoted_newlines(tmp_path):
+    """Test boundaries never fall on a newline inside a quoted field."""
+    csv_file = tmp_path / "multi.csv"
+    csv_file.write_bytes(MULTILINE_CSV.encode())
+    inside_quotes = MULTILINE_CSV.index("line two")
+
+    boundaries = find_record_boundaries(csv_file, [inside_quotes])
+
+    assert boundaries == [MULTILINE_CSV.index("2,Jones")]
+
+
+@pytest.mark.parametrize("block_size", [7, 1024 * 1024])
+@pytest.mark.parametrize("chunk_count", [2, 3, 5])
+def test_split_csv_keeps_every_record(tmp_path, monkeypatch, block_size, chunk_count):
+    """Test chunks hold every record once, each with the header row."""
+    monkeypatch.setattr(csv_split, "BLOCK_SIZE", block_size)
+    csv_file = tmp_path / "multi.csv"
+    csv_file.write_bytes(MULTILINE_CSV.encode())
+
+    chunks = split_csv(csv_file, tmp_path / "chunks", chunk_count)
+
+    assert 1 < len(chunks) <= chunk_count
+    records = []
+    for chunk in chunks:
+        chunk_records = read_records(chunk.read_text())
+        assert chunk_records[0] == ["id", "name", "notes"]
+        records.extend(chunk_records[1:])
+    assert records == read_records(MULTILINE_CSV)[1:]
+
+
+def test_split_csv_without_quotes(tmp_path):
+    """Test splitting a plain file takes the fast path."""
+    csv_file = tmp_path / "plain.csv"
+    lines = ["id,value"] + [f"{i},{i * 2}" for i in range(1000)]
+    csv_file.write_text("\n".join(lines) + "\n")
+
+    chunks = split_csv(csv_file, tmp_path / "chunks", 4)
+
+    assert len(chunks) == 4
+    body = "".join(chunk.read_text().split("\n", 1)[1] for chunk in chunks)
+    assert body == "\n".join(lines[1:]) + "\n"
+
+
+def test_prepare_reader_input_disabled(tmp_path):
+    """Test the CSV is passed through when splitting is disabled."""
+    csv_file = tmp_path / "game.csv"
+    csv_file.write_text("id\n1\n")
+
+    assert prepare_reader_input("GAME", str(csv_file), {"enabled": False}) == (
+        str(csv_file),
+        1,
+    )
+
+
+def test_prepare_reader_input_splits_large_file(tmp_path):
+    """Test a file larger than the target chunk size is split."""
+    csv_file = tmp_path / "player.csv"
+    csv_file.write_text(
+        "id,name\n" + "".join(f"{i},player {i}\n" for i in range(200_000))
+    )
+    split_config = {
+        "enabled": True,
+        "target_chunk_mb": 1,
+        "max_readers": 4,
+        "dir": str(tmp_path / "chunks"),
+    }
+
+    pattern, reader_instances = prepare_reader_input(
+        "PLAYER", str(csv_file), split_config
+    )
+
+    assert reader_instances == 4
+    assert pattern.endswith("player_part*.csv")
+    assert len(list((tmp_path / "chunks" / "PLAYER").glob("*.csv"))) == 4
+
+    remove_chunks("PLAYER", split_config)
+    assert not (tmp_path / "chunks" / "PLAYER").exists()
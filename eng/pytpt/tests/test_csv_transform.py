@@ -0,0 +1,189 @@
+"""Tests for csv_transform module."""
+
+import csv
+import io
+import os
+import threading
+import time
+
+import pytest
+
+import pytpt.csv_transform as csv_transform
+from pytpt.csv_transform import (
+    choose_method,
+    map_columns,
+    prepare_transform,
+    remove_transform,
+    transform_csv,
+)
+from pytpt.ddl import Column
+
+GAME_COLUMNS = [
+    Column("GAME_ID", "INTEGER", nullable=False),
+    Column("WEEK", "INTEGER"),
+    Column("HOME_AWAY", "VARCHAR", 50),
+]
+
+
+def transformed(csv_file, mapping, method=None):
+    """Transform a CSV file to bytes."""
+    output = io.BytesIO()
+    transform_csv(csv_file, output, mapping, method)
+    return output.getvalue()
+
+
+def test_map_columns_by_name_and_alias():
+    """Test headers match table columns ignoring case, or through an alias."""
+    mapping = map_columns(
+        ["LOCATION", "game_id", "week", "NOTES"],
+        GAME_COLUMNS,
+        aliases={"location": "HOME_AWAY"},
+    )
+
+    assert mapping.sources == [1, 2, 0]
+    assert mapping.dropped == ["NOTES"]
+    assert not mapping.passthrough
+
+
+def test_map_columns_defaults_and_nulls():
+    """Test missing columns take their default, or null if nullable."""
+    mapping = map_columns(["GAME_ID"], GAME_COLUMNS, defaults={"HOME_AWAY": "Home"})
+
+    assert mapping.sources == [0, None, None]
+    assert mapping.defaults == {"WEEK": "", "HOME_AWAY": "Home"}
+    assert mapping.append_only
+
+
+def test_map_columns_missing_not_null_column():
+    """Test a NOT NULL column missing from the CSV without a default is an error."""
+    with pytest.raises(ValueError, match="GAME_ID"):
+        map_columns(["WEEK", "HOME_AWAY"], GAME_COLUMNS)
+
+
+def test_renamed_and_extra_trailing_columns_pass_through(tmp_path):
+    """Test a CSV with the table's columns first, in order, is read as it is."""
+    csv_file = tmp_path / "player.csv"
+    csv_file.write_text("GAME_ID,WEEK,LOCATION,EXTRA\n1,1,Home,x\n")
+    mapping = map_columns(
+        ["GAME_ID", "WEEK", "LOCATION", "EXTRA"],
+        GAME_COLUMNS,
+        aliases={"LOCATION": "HOME_AWAY"},
+    )
+
+    assert mapping.passthrough
+    assert choose_method(csv_file, mapping) == "passthrough"
+
+
+def test_transform_split_reorders_and_fills(tmp_path):
+    """Test fields are reordered and defaults filled, with or without a final newline."""
+    csv_file = tmp_path / "game.csv"
+    csv_file.write_bytes(b"WEEK,GAME_ID\r\n1,10\r\n2,20")
+    mapping = map_columns(
+        ["WEEK", "GAME_ID"], GAME_COLUMNS, defaults={"HOME_AWAY": "Away"}
+    )
+
+    assert choose_method(csv_file, mapping) == "split"
+    assert transformed(csv_file, mapping) == (
+        b"GAME_ID,WEEK,HOME_AWAY\r\n10,1,Away\r\n20,2,Away\r\n"
+    )
+
+
+def test_transform_append_across_blocks(tmp_path, monkeypatch):
+    """Test defaults are appended to every line, whatever the block size."""
+    csv_file = tmp_path / "game.csv"
+    csv_file.write_bytes(b"GAME_ID,WEEK\r\n1,1\r\n2,1\r\n3,2\r\n")
+    mapping = map_columns(["GAME_ID", "WEEK"], GAME_COLUMNS)
+    expected = b"GAME_ID,WEEK,HOME_AWAY\r\n1,1,\r\n2,1,\r\n3,2,\r\n"
+
+    assert choose_method(csv_file, mapping) == "append"
+    for block_size in range(1, 8):
+        monkeypatch.setattr(csv_transform, "BLOCK_SIZE", block_size)
+        assert transformed(csv_file, mapping) == expected
+
+
+def test_transform_quoted_fields(tmp_path):
+    """Test a CSV with quoted commas and newlines is reordered with the csv module."""
+    csv_file = tmp_path / "game.csv"
+    csv_file.write_text('HOME_AWAY,GAME_ID\n"Home, field","1"\n"Away\nfield",2\n')
+    mapping = map_columns(["HOME_AWAY", "GAME_ID"], GAME_COLUMNS)
+
+    assert choose_method(csv_file, mapping) == "csv"
+    rows = list(csv.reader(io.StringIO(transformed(csv_file, mapping).decode())))
+    assert rows == [
+        ["GAME_ID", "WEEK", "HOME_AWAY"],
+        ["1", "", "Home, field"],
+        ["2", "", "Away\nfield"],
+    ]
+
+
+def test_transform_rows_of_wrong_width(tmp_path):
+    """Test a row with more or fewer columns than the header is an error."""
+    csv_file = tmp_path / "game.csv"
+    mapping = map_columns(["WEEK", "GAME_ID"], GAME_COLUMNS)
+
+    csv_file.write_text("WEEK,GAME_ID\n1,10\n2\n")
+    with pytest.raises(ValueError, match="1 columns, not the 2"):
+        transformed(csv_file, mapping)
+
+    # One row too wide and one too narrow have as many commas as two good rows
+    csv_file.write_text("WEEK,GAME_ID,HOME_AWAY\n1,2,3,4\n5,6\n")
+    wide_mapping = map_columns(["WEEK", "GAME_ID", "HOME_AWAY"], GAME_COLUMNS)
+    with pytest.raises(ValueError, match="4 columns, not the 3"):
+        transformed(csv_file, wide_mapping)
+
+    csv_file.write_text('WEEK,GAME_ID\n1,10\n"2",20,x\n')
+    with pytest.raises(ValueError, match="Line 3 has 3 columns, not the 2"):
+        transformed(csv_file, mapping)
+
+
+def test_prepare_transform_writes_file(tmp_path):
+    """Test a CSV whose columns differ is written in table column order."""
+    csv_file = tmp_path / "game.csv"
+    csv_file.write_text("WEEK,GAME_ID,HOME_AWAY\n1,10,Home\n")
+    config = {"enabled": True, "dir": str(tmp_path / "transform")}
+
+    reader_path, feed = prepare_transform("GAME", str(csv_file), GAME_COLUMNS, config)
+
+    assert feed is None
+    assert reader_path != str(csv_file)
+    with open(reader_path, newline="") as f:
+        assert f.read() == "GAME_ID,WEEK,HOME_AWAY\n10,1,Home\n"
+
+    remove_transform("GAME", config)
+    assert not (tmp_path / "transform" / "GAME").exists()
+
+
+def test_prepare_transform_disabled(tmp_path):
+    """Test the CSV is read as it is when the transform is disabled."""
+    csv_file = tmp_path / "game.csv"
+    csv_file.write_text("WEEK,GAME_ID\n1,10\n")
+
+    assert prepare_transform("GAME", str(csv_file), GAME_COLUMNS, {}) == (
+        str(csv_file),
+        None,
+    )
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="named pipes are POSIX only")
+def test_pipe_feed(tmp_path):
+    """Test the feed writes to the pipe for each job, and is released if it is not read."""
+    csv_file = tmp_path / "game.csv"
+    csv_file.write_text("WEEK,GAME_ID\n1,10\n")
+    config = {"enabled": True, "pipe": True, "dir": str(tmp_path / "transform")}
+
+    reader_path, feed = prepare_transform("GAME", str(csv_file), GAME_COLUMNS, config)
+    assert os.path.exists(reader_path) and feed is not None
+
+    # Each attempt of the job reads the whole input again
+    for _ in range(2):
+        with feed.feeding():
+            with open(reader_path, newline="") as pipe:
+                assert pipe.read() == "GAME_ID,WEEK,HOME_AWAY\n10,1,\n"
+        assert feed.error is None
+
+    # A job that fails before opening its input does not leave the feed waiting
+    start = time.perf_counter()
+    with feed.feeding():
+        pass
+    assert time.perf_counter() - start < 5
+    assert not any(thread.name == "feed-game" for thread in threading.enumerate())
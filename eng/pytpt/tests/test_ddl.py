@@ -0,0 +1,189 @@
+"""Tests for ddl module."""
+
+import tempfile
+from pathlib import Path
+
+from pytpt.ddl import (
+    ForeignKey,
+    clear_schema_cache,
+    load_schema,
+    normalise_table_name,
+    parse_columns,
+    parse_table,
+    parse_table_dependencies,
+    read_table_dependencies,
+)
+
+
+def test_normalise_table_name():
+    """Test normalise_table_name strips database prefix and quotes."""
+    assert normalise_table_name("PRD_ADS_PYTHON_NFL_DB.GAME") == "GAME"
+    assert normalise_table_name('"game_venue"') == "GAME_VENUE"
+
+
+def test_parse_table_dependencies_commented_foreign_keys():
+    """Test that commented out foreign keys are still read."""
+    ddl_content = """create table
+  GAME_VENUE (
+    GAME_VENUE_ID integer not null
+  , GAME_ID integer not null
+  , VENUE_ID integer not null
+  )
+;
+
+--, constraint GAME_VENUE_GAME_ID_FK foreign key (GAME_ID) references PRD_ADS_PYTHON_NFL_DB.GAME (GAME_ID)
+--, constraint GAME_VENUE_VENUE_ID_FK foreign key (VENUE_ID) references PRD_ADS_PYTHON_NFL_DB.VENUE (VENUE_ID)"""
+
+    table_name, references = parse_table_dependencies(ddl_content)
+
+    assert table_name == "GAME_VENUE"
+    assert references == {"GAME", "VENUE"}
+
+
+def test_parse_table_dependencies_no_create_table():
+    """Test parse_table_dependencies with text that has no create table."""
+    assert parse_table_dependencies("select 1;") == (None, set())
+
+
+def test_read_table_dependencies():
+    """Test read_table_dependencies over a DDL directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        (Path(temp_dir) / "parent.sql").write_text("create table PARENT (ID integer);")
+        (Path(temp_dir) / "child.sql").write_text(
+            "create table CHILD (ID integer, PARENT_ID integer\n"
+            ", constraint FK foreign key (PARENT_ID) references DB.PARENT (ID));"
+        )
+
+        dependencies = read_table_dependencies(temp_dir)
+
+    assert dependencies == {"CHILD": {"PARENT"}, "PARENT": set()}
+
+
+def test_read_table_dependencies_real_ddl():
+    """Test read_table_dependencies with the project DDL files."""
+    dependencies = read_table_dependencies("ddl")
+
+    assert dependencies["GAME_VENUE"] == {"GAME", "VENUE"}
+    assert dependencies["GAME_TYPE"] == set()
+
+
+def test_read_table_dependencies_single_script():
+    """Test read_table_dependencies with a script of several create table statements."""
+    dependencies = read_table_dependencies("../../python-nfl-ddl.sql")
+
+    assert len(dependencies) == 8
+    assert dependencies["GAME_VENUE"] == {"GAME", "VENUE"}
+    assert dependencies["PLAYER"] == {"GAME", "TEAM_LOOKUP"}
+    assert dependencies["GAME"] == {"GAME_TYPE"}
+    assert dependencies["VENUE"] == set()
+
+
+def test_parse_columns():
+    """Test parse_columns reads names, types, lengths and nullability."""
+    ddl_content = """create table
+  GAME_STATS (
+    GAME_TEAM_ID integer not null
+  , THIRD_DOWN_CONVERSION_PERC decimal(10, 5)
+  , WIN_LOSS char(1) character set LATIN not CASESPECIFIC
+  , constraint GAME_TEAM_ID_PK primary key (GAME_TEAM_ID)
+  )
+;
+
+--, constraint GAME_STATS_GAME_ID_FK foreign key (GAME_ID) references DB.GAME (GAME_ID)"""
+
+    columns = parse_columns(ddl_content)
+
+    assert [column.name for column in columns] == [
+        "GAME_TEAM_ID",
+        "THIRD_DOWN_CONVERSION_PERC",
+        "WIN_LOSS",
+    ]
+    assert columns[0].data_type == "INTEGER"
+    assert columns[0].nullable is False
+    assert (columns[1].length, columns[1].scale) == (10, 5)
+    assert columns[1].delimited_width == 12
+    assert columns[2].data_type == "CHAR"
+    assert columns[2].nullable is True
+
+
+def test_parse_columns_real_ddl():
+    """Test parse_columns with the project DDL files."""
+    columns = parse_columns(Path("ddl/player.sql").read_text())
+
+    assert len(columns) == 21
+    assert columns[4].name == "HOME_AWAY"
+
+
+def test_parse_table_keys():
+    """Test parse_table reads the primary key and foreign key columns."""
+    ddl = """create table PRD_ADS_PYTHON_NFL_DB.GAME_STATS (
+  GAME_TEAM_ID INTEGER NOT NULL
+  , GAME_ID INTEGER NOT NULL
+  , TEAM_ID INTEGER
+  , CONSTRAINT GAME_TEAM_ID_PK PRIMARY KEY (GAME_TEAM_ID)
+  , CONSTRAINT GAME_STATS_GAME_ID_FK FOREIGN KEY (GAME_ID)
+      REFERENCES PRD_ADS_PYTHON_NFL_DB.GAME (GAME_ID)
+  , CONSTRAINT GAME_STATS_TEAM_ID_FK FOREIGN KEY (TEAM_ID)
+      REFERENCES PRD_ADS_PYTHON_NFL_DB.TEAM_LOOKUP (TEAM_ID)
+)
+;"""
+
+    table = parse_table(ddl)
+
+    assert table.name == "GAME_STATS"
+    assert [column.name for column in table.columns] == [
+        "GAME_TEAM_ID",
+        "GAME_ID",
+        "TEAM_ID",
+    ]
+    assert table.primary_key == ["GAME_TEAM_ID"]
+    assert table.foreign_keys == [
+        ForeignKey(["GAME_ID"], "GAME", ["GAME_ID"]),
+        ForeignKey(["TEAM_ID"], "TEAM_LOOKUP", ["TEAM_ID"]),
+    ]
+    assert table.references == {"GAME", "TEAM_LOOKUP"}
+
+
+def test_parse_table_column_primary_key():
+    """Test a primary key declared on the column itself."""
+    table = parse_table(
+        "create table T (ID integer not null primary key, NAME char(3));"
+    )
+
+    assert table.primary_key == ["ID"]
+    assert [column.name for column in table.columns] == ["ID", "NAME"]
+
+
+def test_load_schema_plans_project_ddl():
+    """Test the schema of both DDL sources gives the same parents first load plan."""
+    for ddl_path in ("ddl", "../../python-nfl-ddl.sql"):
+        schema = load_schema(ddl_path)
+
+        assert schema.load_levels() == [
+            ["GAME_TYPE", "TEAM_LOOKUP", "VENUE"],
+            ["GAME"],
+            ["GAME_STATS", "GAME_VENUE", "PLAYER", "WEATHER"],
+        ]
+        assert schema.tables["VENUE"].primary_key == ["VENUE_ID"]
+
+    order = load_schema("ddl").load_order(["PLAYER", "GAME", "GAME_TYPE"])
+    assert order == ["GAME_TYPE", "GAME", "PLAYER"]
+
+
+def test_load_schema_cached_on_file_hashes(tmp_path):
+    """Test the schema is reused until a DDL file's content changes."""
+    clear_schema_cache()
+    ddl_file = tmp_path / "parent.sql"
+    ddl_file.write_text("create table PARENT (ID integer);")
+
+    first = load_schema(tmp_path)
+    assert load_schema(tmp_path) is first
+
+    # Same content with a new mtime still hits the cache
+    ddl_file.write_text("create table PARENT (ID integer);")
+    assert load_schema(tmp_path) is first
+
+    ddl_file.write_text("create table PARENT (ID integer, NAME char(3));")
+    changed = load_schema(tmp_path)
+    assert changed is not first
+    assert len(changed.tables["PARENT"].columns) == 2
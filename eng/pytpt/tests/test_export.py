@@ -0,0 +1,134 @@
+"""Tests for export module."""
+
+import csv
+import gzip
+
+import pytest
+
+from pytpt.export import (
+    CATALOG_QUERY,
+    KEY_COLUMNS_QUERY,
+    export_tables,
+    plan_slices,
+)
+
+DATABASE = "PRD_ADS_PYTHON_NFL_DB"
+
+
+@pytest.fixture
+def database(database):
+    """Stub database with PLAYER and GAME_TYPE tables and their catalog entries."""
+    database.create_table(
+        "PLAYER",
+        ["GAME_PLAYER_ID", "PLAYER_NAME", "RUSHING_YARDS"],
+        [(i, f"Player {i}", i % 7 or None) for i in range(1, 101)],
+    )
+    database.create_table("GAME_TYPE", ["GAME_TYPE_ID", "GAME_TYPE"], [(1, "REG")])
+    database.add_result(
+        CATALOG_QUERY, ["TableName", "ColumnCount"], [("GAME_TYPE", 2), ("PLAYER", 3)]
+    )
+    database.add_result(
+        KEY_COLUMNS_QUERY, ["TableName", "ColumnName"], [("PLAYER", "GAME_PLAYER_ID")]
+    )
+    return database
+
+
+def test_plan_slices_splits_on_key_range(database):
+    """Test a large table is split into non-overlapping key ranges."""
+    con = database.connect()
+
+    slices = plan_slices(con, f"{DATABASE}.PLAYER", "PLAYER", "GAME_PLAYER_ID", 30)
+
+    assert [s.params for s in slices] == [(1, 25), (26, 50), (51, 75), (76, 100)]
+    assert slices[0].sql.endswith("or GAME_PLAYER_ID is null")
+    assert "is null" not in slices[1].sql
+
+
+def test_plan_slices_small_table_or_no_key(database):
+    """Test small tables and tables without a key are exported in one slice."""
+    con = database.connect()
+
+    assert len(plan_slices(con, "PLAYER", "PLAYER", "GAME_PLAYER_ID", 1000)) == 1
+    (only,) = plan_slices(con, "GAME_TYPE", "GAME_TYPE", None)
+    assert only.sql == "select * from GAME_TYPE"
+    assert only.params == ()
+
+
+def test_plan_slices_respects_max_slices(database):
+    """Test the number of slices is capped."""
+    con = database.connect()
+
+    slices = plan_slices(con, "PLAYER", "PLAYER", "GAME_PLAYER_ID", 1, max_slices=3)
+
+    assert len(slices) == 3
+
+
+def test_export_tables_csv(pool, tmp_path):
+    """Test every table from the catalog is exported to gzip CSV partitions."""
+    results = export_tables(
+        pool, DATABASE, tmp_path, file_format="csv", slice_rows=40, fetch_size=16
+    )
+
+    by_table = {result.table_name: result for result in results}
+    assert set(by_table) == {"GAME_TYPE", "PLAYER"}
+    player = by_table["PLAYER"]
+    assert player.rows == 100
+    assert [path.name for path in player.files] == [
+        "part-00000.csv.gz",
+        "part-00001.csv.gz",
+        "part-00002.csv.gz",
+    ]
+    assert player.bytes_written > 0
+    assert player.mb_per_sec > 0
+
+    rows = []
+    for path in player.files:
+        with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            assert next(reader) == ["GAME_PLAYER_ID", "PLAYER_NAME", "RUSHING_YARDS"]
+            rows.extend(reader)
+    assert sorted(int(row[0]) for row in rows) == list(range(1, 101))
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_export_tables_parquet(pool, tmp_path):
+    """Test tables are exported to Parquet partitions that read back as one dataset."""
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    results = export_tables(pool, DATABASE, tmp_path, tables=["PLAYER"], slice_rows=50)
+
+    (player,) = results
+    assert len(player.files) == 2
+    table = pq.read_table(tmp_path / "player")
+    assert table.num_rows == 100
+    assert table.column("RUSHING_YARDS").null_count == 14
+
+
+def test_export_tables_replaces_previous_export(pool, tmp_path):
+    """Test partitions from an earlier export are removed."""
+    stale = tmp_path / "game_type" / "part-00009.csv.gz"
+    stale.parent.mkdir()
+    stale.write_text("old")
+
+    export_tables(pool, DATABASE, tmp_path, file_format="csv", tables=["GAME_TYPE"])
+
+    assert not stale.exists()
+    assert (tmp_path / "game_type" / "part-00000.csv.gz").exists()
+
+
+def test_export_tables_unknown_format(pool, tmp_path):
+    """Test an unknown format is rejected before anything is exported."""
+    with pytest.raises(ValueError, match="Unknown export format"):
+        export_tables(pool, DATABASE, tmp_path, file_format="xlsx")
+
+
+def test_export_tables_reports_failed_table(pool, database, tmp_path):
+    """Test a table that cannot be read is reported without stopping the others."""
+    del database.tables["GAME_TYPE"]
+
+    results = export_tables(pool, DATABASE, tmp_path, file_format="csv")
+
+    by_table = {result.table_name: result for result in results}
+    assert by_table["GAME_TYPE"].error
+    assert by_table["PLAYER"].error is None
+    assert by_table["PLAYER"].rows == 100
@@ -0,0 +1,29 @@
+"""Tests for logging_config module."""
+
+import sys
+
+import pytest
+from loguru import logger
+
+from pytpt.logging_config import get_logger, setup_logging
+
+
+@pytest.fixture
+def restore_logger():
+    """Put loguru back to its default stderr sink after a test sets up logging."""
+    yield
+    logger.remove()
+    logger.add(sys.stderr)
+
+
+@pytest.mark.parametrize("enqueue", [False, True])
+def test_setup_logging_writes_log_file(tmp_path, restore_logger, enqueue):
+    """Test messages reach the log file, direct or from the queue."""
+    setup_logging(tmp_path, "test.log", "DEBUG", enqueue=enqueue)
+
+    get_logger(__name__).debug("queued message")
+    logger.complete()
+
+    log_text = (tmp_path / "test.log").read_text()
+    assert "queued message" in log_text
+    assert ("(queued)" in log_text) == enqueue
@@ -0,0 +1,101 @@
+"""Tests for manifest module."""
+
+import json
+import os
+
+from pytpt.manifest import (
+    LoadManifest,
+    fingerprint_file,
+    hash_file,
+    hash_text,
+    write_json,
+)
+
+
+def test_hash_file_matches_content(tmp_path):
+    """Test hash_file depends only on file content."""
+    first = tmp_path / "first.csv"
+    second = tmp_path / "second.csv"
+    first.write_text("id,name\n1,a\n")
+    second.write_text("id,name\n1,a\n")
+
+    assert hash_file(first) == hash_file(second)
+    assert hash_file(first) != hash_text("something else")
+
+
+def test_fingerprint_file_reuses_hash_when_unchanged(tmp_path):
+    """Test fingerprint_file skips hashing when size and mtime match."""
+    csv_file = tmp_path / "game.csv"
+    csv_file.write_text("id\n1\n")
+
+    fingerprint = fingerprint_file(csv_file)
+
+    assert fingerprint_file(csv_file, fingerprint) is fingerprint
+
+
+def test_manifest_unchanged_after_successful_load(tmp_path):
+    """Test a successfully loaded table with the same inputs is unchanged."""
+    csv_file = tmp_path / "game.csv"
+    csv_file.write_text("id\n1\n")
+    manifest_file = tmp_path / "manifest.json"
+
+    manifest = LoadManifest(manifest_file)
+    assert not manifest.is_unchanged("GAME", csv_file, "ddl-1")
+
+    manifest.record("GAME", csv_file, "ddl-1", success=True)
+    manifest.save()
+
+    reloaded = LoadManifest(manifest_file)
+    assert reloaded.is_unchanged("GAME", csv_file, "ddl-1")
+    assert not reloaded.is_unchanged("GAME", csv_file, "ddl-2")
+
+
+def test_manifest_changed_content(tmp_path):
+    """Test a CSV with new content is reported as changed."""
+    csv_file = tmp_path / "game.csv"
+    csv_file.write_text("id\n1\n")
+
+    manifest = LoadManifest(tmp_path / "manifest.json")
+    manifest.record("GAME", csv_file, "ddl", success=True)
+
+    csv_file.write_text("id\n2\n")
+    stat = csv_file.stat()
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert not manifest.is_unchanged("GAME", csv_file, "ddl")
+
+
+def test_manifest_touched_but_identical(tmp_path):
+    """Test a CSV whose mtime changed but content did not is unchanged."""
+    csv_file = tmp_path / "game.csv"
+    csv_file.write_text("id\n1\n")
+
+    manifest = LoadManifest(tmp_path / "manifest.json")
+    manifest.record("GAME", csv_file, "ddl", success=True)
+
+    stat = csv_file.stat()
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert manifest.is_unchanged("GAME", csv_file, "ddl")
+    assert manifest.entries["GAME"].fingerprint.mtime_ns == csv_file.stat().st_mtime_ns
+
+
+def test_manifest_failed_load_is_reloaded(tmp_path):
+    """Test a table whose last load failed is never skipped."""
+    csv_file = tmp_path / "game.csv"
+    csv_file.write_text("id\n1\n")
+
+    manifest = LoadManifest(tmp_path / "manifest.json")
+    manifest.record("GAME", csv_file, "ddl", success=False)
+
+    assert not manifest.is_unchanged("GAME", csv_file, "ddl")
+
+
+def test_write_json_replaces_file(tmp_path):
+    """Test write_json creates the directory and leaves no temporary file behind."""
+    path = tmp_path / "state" / "manifest.json"
+    write_json(path, {"GAME": 1})
+    write_json(path, {"GAME": 2})
+
+    assert json.loads(path.read_text()) == {"GAME": 2}
+    assert os.listdir(path.parent) == ["manifest.json"]
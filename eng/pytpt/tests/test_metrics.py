@@ -0,0 +1,92 @@
+"""Tests for metrics module."""
+
+from pathlib import Path
+
+import pytest
+
+from pytpt.metrics import MetricsParser, parse_metrics
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "tpt"
+
+
+def read_fixture(name: str) -> str:
+    """Read a TPT output fixture captured from a real run."""
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+def test_parse_metrics_load_fixture():
+    """Test parsing every operator statistic from a real load job."""
+    metrics = parse_metrics(read_fixture("tpt_VENUE_load_stdout.log"))
+
+    assert metrics.rows_sent == 32
+    assert metrics.rows_applied == 32
+    assert metrics.rows_read == 32
+    assert metrics.error_table_rows == 0
+    assert metrics.uv_table_rows == 0
+    assert metrics.duplicate_rows == 0
+    assert metrics.files_processed == 1
+    assert metrics.start_to_acquisition_seconds == 7
+    assert metrics.acquisition_seconds == 3
+    assert metrics.application_seconds == 0
+    assert metrics.application_to_end_seconds == 1
+    assert metrics.acquisition_mb_per_sec == pytest.approx(0.001)
+    assert metrics.operator_cpu_seconds["LOAD"] == pytest.approx(0.0625)
+    assert metrics.job_seconds == 11
+
+
+@pytest.mark.parametrize(
+    "fixture, cpu_seconds, job_seconds",
+    [
+        ("tpt_VENUE_drop_stdout.log", 0.015625, 5),
+        ("tpt_VENUE_create_stdout.log", 0.03125, 6),
+    ],
+)
+def test_parse_metrics_ddl_fixtures(fixture, cpu_seconds, job_seconds):
+    """Test parsing DDL jobs, which have no load statistics."""
+    metrics = parse_metrics(read_fixture(fixture))
+
+    assert metrics.rows_sent is None
+    assert metrics.operator_cpu_seconds == {"DDL": pytest.approx(cpu_seconds)}
+    assert metrics.cpu_seconds == pytest.approx(cpu_seconds)
+    assert metrics.job_seconds == job_seconds
+
+
+def test_metrics_parser_streamed_lines():
+    """Test that feeding lines one at a time matches parsing the whole output."""
+    output = read_fixture("tpt_VENUE_load_stdout.log")
+    parser = MetricsParser()
+    updated = [parser.feed(line) for line in output.splitlines()]
+
+    assert "rows_sent" in updated
+    assert parser.metrics == parse_metrics(output)
+
+
+def test_parse_metrics_sums_reader_instances():
+    """Test that records processed are summed across reader instances."""
+    output = """$FILE_READER[1]: Number of records processed: 1,000
+$FILE_READER[2]: Number of records processed: 2,500
+$FILE_READER[1]: Total files processed: 1.
+$FILE_READER[2]: Total files processed: 1.
+$UPDATE: Total Rows Sent To RDBMS:      3500"""
+
+    metrics = parse_metrics(output)
+
+    assert metrics.rows_read == 3500
+    assert metrics.files_processed == 2
+    assert metrics.rows_sent == 3500
+
+
+def test_parse_metrics_grouped_and_missing_numbers():
+    """Test numbers with thousands separators parse, and values like N/A are skipped."""
+    output = """$LOAD: MB/sec in Acquisition Phase: 1,234.56
+$LOAD: Elapsed time in Acquisition Phase: 1,234.5 seconds
+$LOAD: Total processor time used = '1,200.25 Second(s)'
+$UPDATE: MB/sec in Acquisition Phase: N/A
+$UPDATE: Elapsed time in Application Phase: ... seconds"""
+
+    metrics = parse_metrics(output)
+
+    assert metrics.acquisition_mb_per_sec == 1234.56
+    assert metrics.acquisition_seconds == 1234.5
+    assert metrics.application_seconds is None
+    assert metrics.cpu_seconds == 1200.25
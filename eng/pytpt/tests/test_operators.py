@@ -0,0 +1,79 @@
+"""Tests for operators module."""
+
+import pytest
+
+from pytpt.operators import (
+    OperatorThresholds,
+    choose_operator,
+    estimate_csv_rows,
+    select_operator,
+)
+
+MB = 1024 * 1024
+
+
+def test_estimate_csv_rows_small_file_exact(tmp_path):
+    """Test a file within the sample is counted exactly, with or without a final newline."""
+    csv_file = tmp_path / "game_type.csv"
+    csv_file.write_bytes(b"GAME_TYPE_ID,GAME_TYPE\n1,REG\n2,POST")
+
+    assert estimate_csv_rows(csv_file) == 2
+
+
+def test_estimate_csv_rows_large_file(tmp_path):
+    """Test a file larger than the sample is estimated from its line length."""
+    csv_file = tmp_path / "player.csv"
+    csv_file.write_bytes(
+        b"ID,NAME\n" + b"".join(b"%06d,Name\n" % i for i in range(50_000))
+    )
+
+    estimate = estimate_csv_rows(csv_file, sample_bytes=4096)
+
+    assert estimate == pytest.approx(50_000, rel=0.01)
+
+
+def test_choose_operator_by_volume():
+    """Test small, medium and large loads into an empty table."""
+    assert choose_operator(100, 2).operator == "INSERTER"
+    assert choose_operator(10 * MB, 50_000).operator == "STREAM"
+    assert choose_operator(100 * MB, 2_000_000).operator == "LOAD"
+    assert choose_operator(300 * MB, 500).operator == "LOAD"
+
+
+def test_choose_operator_existing_table():
+    """Test large appends use $UPDATE, as $LOAD needs an empty table."""
+    assert choose_operator(100 * MB, 2_000_000, target_exists=True).operator == "UPDATE"
+    assert choose_operator(100, 2, target_exists=True).operator == "INSERTER"
+
+
+def test_choose_operator_thresholds():
+    """Test the thresholds move the boundaries between operators."""
+    thresholds = OperatorThresholds(inserter_max_rows=0, stream_max_rows=10)
+
+    choice = choose_operator(100, 2, thresholds=thresholds)
+
+    assert choice.operator == "STREAM"
+    assert choice.reason == "~2 rows <= 10"
+
+
+def test_select_operator_from_config(tmp_path):
+    """Test the operator config chooses automatically or sets a fixed operator."""
+    csv_file = tmp_path / "game_type.csv"
+    csv_file.write_text("GAME_TYPE_ID,GAME_TYPE\n1,REG\n2,POST\n")
+
+    choice = select_operator(csv_file, {"mode": "auto", "inserter_max_rows": 1})
+    assert choice.operator == "STREAM"
+    assert choice.estimated_rows == 2
+
+    assert select_operator(csv_file, {"mode": "$load"}).operator == "LOAD"
+    assert (
+        select_operator(csv_file, {"mode": "load"}, target_exists=True).operator
+        == "UPDATE"
+    )
+    with pytest.raises(ValueError, match="Unknown operator mode"):
+        select_operator(csv_file, {"mode": "fastest"})
+
+
+def test_select_operator_missing_file(tmp_path):
+    """Test a file that cannot be measured keeps the FastLoad default."""
+    assert select_operator(tmp_path / "missing.csv").operator == "LOAD"
@@ -0,0 +1,169 @@
+"""Tests for pool module."""
+
+import threading
+import time
+
+import pytest
+
+from pytpt.pool import ConnectionPool
+
+
+def test_pool_opens_min_size_connections(database):
+    """Test min_size connections are opened when the pool is created."""
+    pool = ConnectionPool(database.connect, min_size=2, max_size=4)
+
+    assert pool.size == 2
+    assert pool.idle == 2
+    assert database.connections == 2
+
+
+def test_pool_reuses_connections(database):
+    """Test a released connection is handed out again rather than a new one opened."""
+    pool = ConnectionPool(database.connect, min_size=0, max_size=2)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    assert database.connections == 1
+    assert pool.stats.checkouts == 2
+
+
+def test_pool_invalid_size(database):
+    """Test a pool cannot be created with min_size above max_size."""
+    with pytest.raises(ValueError, match="Invalid pool size"):
+        ConnectionPool(database.connect, min_size=3, max_size=2)
+
+
+def test_pool_waits_for_a_free_connection(database):
+    """Test a checkout waits when max_size connections are in use."""
+    pool = ConnectionPool(database.connect, min_size=0, max_size=1)
+    con = pool.acquire()
+
+    def release_later():
+        time.sleep(0.05)
+        pool.release(con)
+
+    thread = threading.Thread(target=release_later)
+    thread.start()
+    with pool.connection(timeout=5) as waited:
+        assert waited is con
+    thread.join()
+
+    assert pool.stats.waits == 1
+    assert pool.stats.wait_seconds > 0
+    assert database.connections == 1
+
+
+def test_pool_acquire_timeout(database):
+    """Test a checkout gives up after its timeout."""
+    pool = ConnectionPool(database.connect, min_size=0, max_size=1)
+    pool.acquire()
+
+    with pytest.raises(TimeoutError, match="No connection free"):
+        pool.acquire(timeout=0.01)
+
+
+def test_pool_concurrent_checkouts_stay_within_max_size(database):
+    """Test many threads never hold more than max_size connections at once."""
+    pool = ConnectionPool(database.connect, min_size=1, max_size=3)
+    lock = threading.Lock()
+    in_use = set()
+    peak = 0
+
+    def worker():
+        nonlocal peak
+        for _ in range(20):
+            with pool.connection() as con:
+                with lock:
+                    in_use.add(id(con))
+                    peak = max(peak, len(in_use))
+                cursor = con.cursor()
+                cursor.execute("select 1")
+                time.sleep(0.001)
+                with lock:
+                    in_use.discard(id(con))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak <= 3
+    assert database.connections <= 3
+    assert pool.stats.checkouts == 160
+
+
+def test_pool_replaces_connection_failing_health_check(database):
+    """Test a broken connection is closed and replaced after an error in a block."""
+    pool = ConnectionPool(database.connect, min_size=0, max_size=1)
+
+    with pytest.raises(RuntimeError):
+        with pool.connection() as broken:
+            broken.close()
+            raise RuntimeError("session lost")
+
+    with pool.connection() as con:
+        assert con is not broken
+        assert not con.closed
+
+    assert pool.stats.failed_health_checks == 1
+    assert pool.size == 1
+
+
+def test_pool_evicts_idle_connections_above_min_size(database):
+    """Test connections idle for longer than idle_timeout are closed down to min_size."""
+    pool = ConnectionPool(database.connect, min_size=1, max_size=3, idle_timeout=0.01)
+    cons = [pool.acquire() for _ in range(3)]
+    for con in cons:
+        pool.release(con)
+
+    time.sleep(0.02)
+
+    assert pool.evict_idle() == 2
+    assert pool.size == 1
+    assert sum(con.closed for con in cons) == 2
+
+
+def test_pool_close(database):
+    """Test closing the pool closes idle connections and refuses new checkouts."""
+    pool = ConnectionPool(database.connect, min_size=1, max_size=2)
+    checked_out = pool.acquire()
+
+    pool.close()
+    assert pool.size == 1
+
+    pool.release(checked_out)
+    assert checked_out.closed
+    assert pool.size == 0
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.acquire()
+
+
+def test_pool_serves_waiters_in_order(database):
+    """Test a thread that releases and re-acquires does not jump ahead of a waiter."""
+    pool = ConnectionPool(database.connect, min_size=0, max_size=1)
+    con = pool.acquire()
+    acquired = []
+    done = threading.Event()
+
+    def waiter():
+        with pool.connection(timeout=5) as waited:
+            acquired.append(waited)
+            done.wait(5)
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    while pool.stats.waits == 0:
+        time.sleep(0.001)
+
+    pool.release(con)
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0)
+    done.set()
+    thread.join()
+
+    assert acquired == [con]
@@ -0,0 +1,162 @@
+"""Tests for report module."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from pytpt.metrics import parse_metrics
+from pytpt.report import RunReport, read_step_records
+from pytpt.scheduler import TableLoadResult
+from pytpt.tpt_runner import TbuildResult
+
+
+def make_result(returncode=0, rows_sent=None, rows_applied=None, attempts=1):
+    """Build a tbuild result with load metrics."""
+    result = TbuildResult(returncode, Path("job.log"), attempts=attempts)
+    result.metrics.rows_sent = rows_sent
+    result.metrics.rows_applied = rows_applied
+    return result
+
+
+def make_report():
+    """Build a report of one loaded, one failed and one unchanged table."""
+    report = RunReport("20260101-000000")
+    report.record_step("GAME", "drop", 0.0, make_result())
+    report.record_step(
+        "GAME",
+        "load",
+        1.0,
+        make_result(rows_sent=10, rows_applied=10, attempts=2),
+        bytes_read=500,
+        load_operator="INSERTER",
+    )
+    report.record_step("PLAYER", "job", 0.0, make_result(returncode=12))
+    report.record_tables(
+        [
+            TableLoadResult("GAME", Path("game.csv"), True, 2.0),
+            TableLoadResult("PLAYER", Path("player.csv"), False, 1.0),
+        ],
+        unchanged=[(Path("team.csv"), "TEAM")],
+    )
+    return report
+
+
+def test_records_steps_tables_and_run():
+    """Test the report has a record per step and table, then one for the run."""
+    records = make_report().records()
+
+    assert [record["record"] for record in records] == [
+        "step",
+        "step",
+        "step",
+        "table",
+        "table",
+        "table",
+        "run",
+    ]
+    load = records[1]
+    assert load["step"] == "load"
+    assert load["retries"] == 1
+    assert load["rows_applied"] == 10
+    assert load["bytes_read"] == 500
+    assert load["success"] is True
+    assert load["duration_seconds"] > 0
+
+    game, player, team = records[3:6]
+    assert (game["status"], game["rows_applied"], game["bytes_read"]) == (
+        "ok",
+        10,
+        500,
+    )
+    assert (player["status"], player["rows_applied"]) == ("failed", None)
+    assert team["status"] == "unchanged"
+    assert records[-1]["tables"] == {"ok": 1, "failed": 1, "skipped": 0, "unchanged": 1}
+
+
+def test_repeated_steps_are_merged():
+    """Test a step run again is one record with the first start and last result."""
+    report = RunReport("20260101-000000")
+    for returncode, rows in ((12, 5), (0, 10)):
+        for step in ("drop", "create"):
+            report.record_step("GAME", step, 0.0, make_result())
+        report.record_step("GAME", "load", 1.0, make_result(returncode, 10, rows))
+    report.record_tables([TableLoadResult("GAME", Path("game.csv"), True, 2.0)])
+
+    steps = report.tables[0].steps
+    assert [(step.step, step.retries) for step in steps] == [
+        ("drop", 1),
+        ("create", 1),
+        ("load", 1),
+    ]
+    assert steps[2].started_at == 1.0
+    assert report.tables[0].rows_applied == 10
+
+    text = report.prometheus_text()
+    assert text.count('pytpt_step_returncode{table="GAME",step="load"}') == 1
+    assert 'pytpt_step_returncode{table="GAME",step="load"} 0' in text
+    assert 'pytpt_step_retries{table="GAME",step="load"} 1' in text
+
+
+def test_write_jsonl_appends_each_run(tmp_path):
+    """Test each run appends its records to the JSONL file."""
+    report_file = tmp_path / "logs" / "run_report.jsonl"
+    report = make_report()
+
+    report.write_jsonl(report_file)
+    report.write_jsonl(report_file)
+
+    lines = report_file.read_text().splitlines()
+    assert len(lines) == 14
+    assert all(json.loads(line)["run_id"] == "20260101-000000" for line in lines)
+
+
+def test_step_records_keep_tpt_statistics_across_runs(tmp_path):
+    """Test step records carry the TPT statistics, read back by table for every run."""
+    report_file = tmp_path / "run_report.jsonl"
+    fixture = Path(__file__).parent / "fixtures" / "tpt" / "tpt_VENUE_load_stdout.log"
+    for run_id in ("night-1", "night-2"):
+        report = RunReport(run_id)
+        result = make_result()
+        result.metrics = parse_metrics(fixture.read_text(encoding="utf-8"))
+        report.record_step("VENUE", "load", 0.0, result, load_operator="LOAD")
+        report.record_step("GAME", "job", 0.0, make_result())
+        report.record_tables([TableLoadResult("VENUE", Path("venue.csv"), True)])
+        report.write_jsonl(report_file)
+
+    history = read_step_records(report_file, table_name="VENUE")
+
+    assert [record["run_id"] for record in history] == ["night-1", "night-2"]
+    assert history[0]["rows_sent"] == 32
+    assert history[0]["rows_read"] == 32
+    assert history[0]["cpu_seconds"] == pytest.approx(0.0625)
+    assert history[0]["load_operator"] == "LOAD"
+    assert "metrics" not in history[0]
+    assert read_step_records(tmp_path / "missing.jsonl") == []
+
+
+def test_prometheus_text_labels_tables_and_steps():
+    """Test the textfile has typed gauges labelled by table and step."""
+    text = make_report().prometheus_text()
+
+    assert "# TYPE pytpt_step_duration_seconds gauge" in text
+    assert 'pytpt_step_retries{table="GAME",step="load"} 1' in text
+    assert 'pytpt_step_returncode{table="PLAYER",step="job"} 12' in text
+    assert 'pytpt_table_rows_applied{table="GAME"} 10' in text
+    assert 'pytpt_table_success{table="PLAYER"} 0' in text
+    assert 'pytpt_run_tables{status="unchanged"} 1' in text
+    # Unchanged tables did no work to report
+    assert 'pytpt_table_duration_seconds{table="TEAM"}' not in text
+    # Each metric is described once, before its samples
+    assert text.count("# HELP pytpt_step_retries ") == 1
+
+
+def test_write_prometheus_replaces_file(tmp_path):
+    """Test the textfile is replaced, leaving no temporary file behind."""
+    prom_file = tmp_path / "pytpt.prom"
+    prom_file.write_text("old\n")
+
+    make_report().write_prometheus(prom_file)
+
+    assert "old" not in prom_file.read_text()
+    assert [path.name for path in tmp_path.iterdir()] == ["pytpt.prom"]
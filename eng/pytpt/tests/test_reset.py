@@ -0,0 +1,80 @@
+"""Tests for reset module."""
+
+import pytest
+
+from pytpt.reset import reset_statements, reset_tables
+
+DEPENDENCIES = {
+    "GAME_VENUE": {"GAME", "VENUE"},
+    "GAME": {"GAME_TYPE"},
+    "PLAYER": {"GAME", "TEAM_LOOKUP"},
+}
+
+TABLES = ["GAME_TYPE", "GAME", "VENUE", "GAME_VENUE", "TEAM_LOOKUP", "PLAYER"]
+
+
+@pytest.fixture
+def database(database):
+    """Stub database with a row in each NFL table."""
+    for table_name in TABLES:
+        database.create_table(table_name, ["ID"], [(1,)])
+    return database
+
+
+def test_reset_statements():
+    """Test the statements for each reset mode."""
+    assert reset_statements("GAME", "delete", "NFL") == ["delete NFL.GAME all"]
+    assert reset_statements("GAME", "drop") == ["drop table GAME"]
+    with pytest.raises(ValueError, match="Unknown reset mode"):
+        reset_statements("GAME", "truncate")
+
+
+def test_reset_tables_delete_children_first(database, pool):
+    """Test tables are emptied level by level, children before parents."""
+    results = reset_tables(pool, TABLES, DEPENDENCIES, max_workers=2)
+
+    assert all(result.success for result in results)
+    assert [result.level for result in results] == [2, 2, 1, 0, 0]
+    assert [result.tables for result in results] == [
+        ["GAME_VENUE"],
+        ["PLAYER"],
+        ["GAME"],
+        ["GAME_TYPE", "TEAM_LOOKUP"],
+        ["VENUE"],
+    ]
+    assert all(rows == [] for rows in database.tables.values())
+
+
+def test_reset_tables_batches_deletes_into_multi_statement_requests(database, pool):
+    """Test each level's deletes are sent as multi-statement requests."""
+    reset_tables(pool, TABLES, DEPENDENCIES, database="NFL", max_workers=1)
+
+    assert database.statements[0] == "delete NFL.GAME_VENUE all;\ndelete NFL.PLAYER all"
+    assert len(database.statements) == 3
+
+
+def test_reset_tables_drop_one_table_per_request(database, pool):
+    """Test drops are sent one per request, with missing error tables ignored."""
+    database.create_table("GAME_ET", ["ID"])
+
+    results = reset_tables(
+        pool, TABLES, DEPENDENCIES, mode="drop", include_error_tables=True
+    )
+
+    assert all(result.success for result in results)
+    assert len(results) == len(TABLES)
+    assert database.tables == {}
+    assert "drop table GAME_ET" in database.statements
+
+
+def test_reset_tables_stops_after_failed_level(database, pool):
+    """Test referenced tables are left alone when a child cannot be reset."""
+    del database.tables["PLAYER"]
+
+    results = reset_tables(pool, TABLES, DEPENDENCIES, tables_per_request=1)
+
+    failed = [result for result in results if not result.success]
+    assert [result.tables for result in failed] == [["PLAYER"]]
+    assert "3807" in failed[0].error
+    assert database.tables["GAME_VENUE"] == []
+    assert database.tables["GAME"] == [(1,)]
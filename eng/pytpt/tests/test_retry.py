@@ -0,0 +1,153 @@
+"""Tests for retry module."""
+
+import threading
+from pathlib import Path
+
+from pytpt import retry
+from pytpt.retry import (
+    RetryPolicy,
+    classify,
+    release_during_backoff,
+    run_with_retries,
+)
+from pytpt.tpt_runner import TbuildResult
+
+
+def failed(returncode=12, *error_lines, stderr=()) -> TbuildResult:
+    """Build the result of a failed job with some error output."""
+    return TbuildResult(
+        returncode,
+        Path("job.log"),
+        error_lines=list(error_lines),
+        stderr_tail=list(stderr),
+    )
+
+
+def test_classify_retryable_error_codes():
+    """Test deadlocks and load slot shortages are retryable."""
+    deadlock = classify(
+        failed(12, "$UPDATE: RDBMS error 2631: Transaction ABORTed due to deadlock.")
+    )
+    assert deadlock.retryable
+    assert deadlock.error_code == 2631
+
+    slots = classify(
+        failed(12, "$LOAD: TPT10508: RDBMS error 2633: Too many load/unload tasks")
+    )
+    assert slots.retryable
+    assert slots.error_code == 2633
+
+
+def test_classify_fatal_error_code_wins():
+    """Test a fatal error is not retried, even alongside a retryable one."""
+    failure = classify(
+        failed(
+            12,
+            "RDBMS error 2631: Transaction ABORTed due to deadlock.",
+            "RDBMS error 8017: The UserId, Password or Account is invalid.",
+        )
+    )
+
+    assert not failure.retryable
+    assert failure.error_code == 8017
+
+
+def test_classify_ignores_ddl_error_list_codes():
+    """Test a drop error that the jobvars ignore does not stop a later retryable one."""
+    failure = classify(
+        failed(
+            12,
+            "$DDL_OPERATOR: TPT10508: RDBMS error 3807: Object "
+            "'NFL.GAME_ET' does not exist.",
+            "$LOAD: TPT10508: RDBMS error 2633: Too many load/unload tasks running.",
+        )
+    )
+    assert failure.retryable
+    assert failure.error_code == 2633
+
+    # Without the retryable error the job still fails for good
+    failure = classify(
+        failed(12, "$DDL_OPERATOR: RDBMS error 3807: Object 'X' does not exist.")
+    )
+    assert not failure.retryable
+    assert not classify(
+        failed(12, "RDBMS error 3807: Object 'X' does not exist.", "RDBMS error 2633"),
+        ignored_codes=(),
+    ).retryable
+
+
+def test_classify_messages_and_return_codes():
+    """Test transient messages without a code, and the return code fallback."""
+    assert classify(failed(12, stderr=["Logon failed: connection reset"])).retryable
+    assert not classify(failed(12)).retryable
+    assert classify(failed(12), retry_returncodes={12}).retryable
+    assert not classify(failed(8), retry_returncodes={12}).retryable
+
+
+def test_retry_policy_delay():
+    """Test the backoff doubles up to its maximum and jitter only shortens it."""
+    policy = RetryPolicy(backoff=2, max_backoff=10, jitter=0.5)
+
+    assert [policy.delay(attempt, lambda: 0.0) for attempt in (1, 2, 3, 4)] == [
+        2,
+        4,
+        8,
+        10,
+    ]
+    assert policy.delay(2, lambda: 1.0) == 2
+    assert RetryPolicy.from_config({"max_retries": 1}).max_retries == 1
+
+
+def test_run_with_retries_retries_transient_failures():
+    """Test a transient failure is retried with a backoff until the job succeeds."""
+    results = [
+        failed(12, "RDBMS error 2633: Too many load/unload tasks running now."),
+        failed(12, "RDBMS error 2631: Transaction ABORTed due to deadlock."),
+        TbuildResult(0, Path("job.log")),
+    ]
+    waits = []
+
+    result = run_with_retries(
+        lambda: results.pop(0), RetryPolicy(backoff=1, jitter=0), sleep=waits.append
+    )
+
+    assert result.success
+    assert result.attempts == 3
+    assert waits == [1, 2]
+
+
+def test_run_with_retries_stops_on_fatal_or_max_retries():
+    """Test fatal failures are not retried, and retries stop at max_retries."""
+    waits = []
+
+    result = run_with_retries(lambda: failed(8, "RDBMS error 3706: Syntax error"))
+    assert result.attempts == 1
+
+    result = run_with_retries(
+        lambda: failed(12, "RDBMS error 2631: deadlock"),
+        RetryPolicy(max_retries=2),
+        sleep=waits.append,
+    )
+    assert not result.success
+    assert result.attempts == 3
+    assert len(waits) == 2
+
+
+def test_backoff_releases_semaphore(monkeypatch):
+    """Test a job waiting to retry gives up its host slot until the wait is over."""
+    slot = threading.BoundedSemaphore(1)
+    free_while_waiting = []
+
+    def wait(seconds):
+        free_while_waiting.append(slot.acquire(blocking=False))
+        slot.release()
+
+    monkeypatch.setattr(retry.time, "sleep", wait)
+    results = [failed(12, "RDBMS error 2631: deadlock"), TbuildResult(0, Path("a"))]
+
+    with slot, release_during_backoff(slot):
+        assert run_with_retries(lambda: results.pop(0)).success
+        # The slot is held again once the retry starts
+        assert not slot.acquire(blocking=False)
+
+    assert free_while_waiting == [True]
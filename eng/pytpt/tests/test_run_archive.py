@@ -0,0 +1,90 @@
+"""Tests for run_archive module."""
+
+import gzip
+
+import pytest
+
+from pytpt.run_archive import RunArchive
+
+
+def test_read_one_job_by_offset(tmp_path):
+    """Test each job's output is read back on its own, by run, table and step."""
+    archive = RunArchive(tmp_path)
+    archive.add("run1", "GAME", "drop", b"drop output\n")
+    archive.add("run1", "GAME", "load", b"load output\n" * 100)
+    archive.add("run1", "VENUE", "load", b"venue output\n")
+
+    assert archive.read("run1", "GAME", "load") == "load output\n" * 100
+    assert archive.read("run1", "VENUE", "load") == "venue output\n"
+    with pytest.raises(KeyError):
+        archive.read("run1", "VENUE", "drop")
+
+
+def test_read_attempts(tmp_path):
+    """Test the last attempt is read by default, and earlier ones on request."""
+    archive = RunArchive(tmp_path)
+    archive.add("run1", "GAME", "load", b"deadlock\n", attempt=1)
+    archive.add("run1", "GAME", "load", b"loaded\n", attempt=2)
+
+    assert archive.read("run1", "GAME", "load") == "loaded\n"
+    assert archive.read("run1", "GAME", "load", attempt=1) == "deadlock\n"
+
+
+def test_run_archive_is_one_gzip_stream(tmp_path):
+    """Test the members of a run concatenate into one readable gzip file."""
+    archive = RunArchive(tmp_path)
+    archive.add("run1", "GAME", "drop", b"first\n")
+    archive.add("run1", "GAME", "load", b"second\n")
+
+    with gzip.open(archive.archive_file("run1"), "rb") as f:
+        assert f.read() == b"first\nsecond\n"
+
+
+def test_add_file_moves_log_into_archive(tmp_path):
+    """Test a job's log file is removed once its output is archived."""
+    log_file = tmp_path / "tpt_GAME_STATS_load.log"
+    log_file.write_text("Return Code: 0\n")
+    archive = RunArchive(tmp_path / "archive")
+
+    entry = archive.add_file("run1", "GAME_STATS", "load", log_file)
+
+    assert not log_file.exists()
+    assert entry.size == len("Return Code: 0\n")
+    assert archive.read("run1", "GAME_STATS", "load") == "Return Code: 0\n"
+    assert archive.add_file("run1", "GAME_STATS", "load", log_file) is None
+
+
+def test_retention_keeps_newest_runs(tmp_path):
+    """Test retention removes the archives and index entries of the oldest runs."""
+    archive = RunArchive(tmp_path, keep_runs=2)
+    for run_id in ("run1", "run2", "run3"):
+        archive.add(run_id, "GAME", "load", run_id.encode())
+
+    assert archive.apply_retention() == ["run1"]
+
+    assert archive.runs() == ["run2", "run3"]
+    assert not archive.archive_file("run1").exists()
+    assert archive.read("run3", "GAME", "load") == "run3"
+    assert archive.apply_retention() == []
+
+
+def test_zstd_archive(tmp_path):
+    """Test a zstd archive reads back the same as a gzip one."""
+    pytest.importorskip("zstandard")
+    archive = RunArchive(tmp_path, compression="zstd")
+    archive.add("run1", "GAME", "load", b"zstd output\n")
+
+    assert archive.archive_file("run1").suffix == ".zst"
+    assert archive.read("run1", "GAME", "load") == "zstd output\n"
+
+
+def test_from_config():
+    """Test the archive is only created when enabled, with its settings."""
+    assert RunArchive.from_config({"enabled": False}) is None
+
+    archive = RunArchive.from_config({"enabled": True, "keep_runs": 3})
+
+    assert archive.keep_runs == 3
+    assert archive.compression == "gzip"
+    with pytest.raises(ValueError):
+        RunArchive(compression="lz4")
@@ -0,0 +1,252 @@
+"""Tests for scheduler module."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from pytpt.scheduler import (
+    HostSlots,
+    TableLoadResult,
+    dependency_levels,
+    load_priorities,
+    resolve_dependencies,
+    run_load_plan,
+    log_load_summary,
+)
+
+
+def make_mapped_files(*table_names):
+    """Build (csv_file, table_name) pairs for the given tables."""
+    return [(Path(f"/data/{name.lower()}.csv"), name) for name in table_names]
+
+
+def test_resolve_dependencies_ignores_tables_not_loaded():
+    """Test that parents outside the run are ignored."""
+    dependencies = {"GAME_VENUE": {"GAME", "VENUE"}, "GAME": {"GAME_TYPE"}}
+
+    resolved = resolve_dependencies(["GAME_VENUE", "GAME"], dependencies)
+
+    assert resolved == {"GAME_VENUE": {"GAME"}, "GAME": set()}
+
+
+def test_resolve_dependencies_cycle():
+    """Test that a dependency cycle raises ValueError."""
+    dependencies = {"A": {"B"}, "B": {"A"}}
+
+    with pytest.raises(ValueError):
+        resolve_dependencies(["A", "B"], dependencies)
+
+
+def test_dependency_levels():
+    """Test tables are grouped into levels after every table they reference."""
+    dependencies = {
+        "GAME_VENUE": {"GAME", "VENUE"},
+        "GAME": {"GAME_TYPE"},
+        "PLAYER": {"GAME", "TEAM_LOOKUP"},
+    }
+    tables = ["PLAYER", "GAME_VENUE", "VENUE", "GAME", "GAME_TYPE", "TEAM_LOOKUP"]
+
+    levels = dependency_levels(tables, dependencies)
+
+    assert levels == [
+        ["GAME_TYPE", "TEAM_LOOKUP", "VENUE"],
+        ["GAME"],
+        ["GAME_VENUE", "PLAYER"],
+    ]
+
+
+def test_dependency_levels_cycle():
+    """Test that a dependency cycle raises ValueError."""
+    with pytest.raises(ValueError):
+        dependency_levels(["A", "B"], {"A": {"B"}, "B": {"A"}})
+
+
+def test_run_load_plan_parents_finish_first():
+    """Test that children only start after their parents have finished."""
+    dependencies = {"GAME_VENUE": {"GAME", "VENUE"}, "GAME": {"GAME_TYPE"}}
+    finished = set()
+    lock = threading.Lock()
+    violations = []
+
+    def fake_load(table_name, csv_path):
+        for parent in dependencies.get(table_name, set()):
+            if parent not in finished:
+                violations.append((table_name, parent))
+        time.sleep(0.01)
+        with lock:
+            finished.add(table_name)
+        return True
+
+    mapped_files = make_mapped_files("GAME_VENUE", "VENUE", "GAME", "GAME_TYPE")
+    results = run_load_plan(mapped_files, dependencies, fake_load, max_workers=4)
+
+    assert violations == []
+    assert len(results) == 4
+    assert all(result.success for result in results)
+    assert results[-1].table_name == "GAME_VENUE"
+
+
+def test_load_priorities_count_largest_chain():
+    """Test that a parent ranks by its size plus its largest chain of children."""
+    parents = {"GAME_TYPE": set(), "GAME": {"GAME_TYPE"}, "VENUE": set()}
+
+    priorities = load_priorities(parents, {"GAME_TYPE": 1, "GAME": 100, "VENUE": 50})
+
+    assert priorities == {"GAME_TYPE": 101, "GAME": 100, "VENUE": 50}
+
+
+def test_run_load_plan_starts_largest_first():
+    """Test that with table sizes, ready tables start largest first."""
+    started = []
+
+    def fake_load(table_name, csv_path):
+        started.append(table_name)
+        return True
+
+    mapped_files = make_mapped_files("A", "B", "C", "D")
+    sizes = {"A": 10, "B": 40, "C": 20, "D": 30}
+    run_load_plan(mapped_files, {}, fake_load, max_workers=1, table_sizes=sizes)
+
+    assert started == ["B", "D", "C", "A"]
+
+
+def test_run_load_plan_runs_independent_tables_concurrently():
+    """Test that independent tables are loaded at the same time."""
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_load(table_name, csv_path):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return True
+
+    mapped_files = make_mapped_files("A", "B", "C", "D")
+    run_load_plan(mapped_files, {}, fake_load, max_workers=4, max_jobs_per_host=4)
+
+    assert peak > 1
+
+
+def test_run_load_plan_respects_host_slots():
+    """Test that the per-host job slot limit caps concurrency."""
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_load(table_name, csv_path):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return True
+
+    mapped_files = make_mapped_files("A", "B", "C", "D", "E")
+    run_load_plan(mapped_files, {}, fake_load, max_workers=5, max_jobs_per_host=2)
+
+    assert peak <= 2
+
+
+def test_run_load_plan_skips_children_of_failed_parent():
+    """Test that a failed parent causes its descendants to be skipped."""
+    dependencies = {"GAME": {"GAME_TYPE"}, "GAME_VENUE": {"GAME"}}
+    loaded = []
+
+    def fake_load(table_name, csv_path):
+        loaded.append(table_name)
+        return table_name != "GAME_TYPE"
+
+    mapped_files = make_mapped_files("GAME_TYPE", "GAME", "GAME_VENUE", "VENUE")
+    results = {
+        r.table_name: r for r in run_load_plan(mapped_files, dependencies, fake_load)
+    }
+
+    assert sorted(loaded) == ["GAME_TYPE", "VENUE"]
+    assert results["GAME"].skipped
+    assert results["GAME_VENUE"].skipped
+    assert not results["GAME_VENUE"].success
+    assert results["VENUE"].success
+
+
+def test_run_load_plan_skips_children_of_invalid_parent():
+    """Test a table that failed before the run is not loaded, nor are its children."""
+    dependencies = {"GAME": {"GAME_TYPE"}, "GAME_VENUE": {"GAME"}}
+    loaded = []
+
+    def fake_load(table_name, csv_path):
+        loaded.append(table_name)
+        return True
+
+    (invalid_csv, _), *mapped_files = make_mapped_files(
+        "GAME_TYPE", "GAME", "GAME_VENUE", "VENUE"
+    )
+    invalid = TableLoadResult("GAME_TYPE", invalid_csv, False)
+    results = run_load_plan(
+        mapped_files, dependencies, fake_load, failed_results=[invalid]
+    )
+
+    assert loaded == ["VENUE"]
+    assert results[0] is invalid
+    skipped = {r.table_name for r in results if r.skipped}
+    assert skipped == {"GAME", "GAME_VENUE"}
+
+    # A table failed before the run is reported once, even below another one
+    game_csv, game_venue_csv = mapped_files[0][0], mapped_files[1][0]
+    results = run_load_plan(
+        [],
+        dependencies,
+        fake_load,
+        failed_results=[
+            TableLoadResult("GAME_VENUE", game_venue_csv, False),
+            TableLoadResult("GAME", game_csv, False),
+        ],
+    )
+    assert [(r.table_name, r.skipped) for r in results] == [
+        ("GAME_VENUE", False),
+        ("GAME", False),
+    ]
+
+
+def test_run_load_plan_load_exception_is_failure():
+    """Test that an exception from the load function counts as a failure."""
+
+    def fake_load(table_name, csv_path):
+        raise RuntimeError("boom")
+
+    results = run_load_plan(make_mapped_files("A"), {}, fake_load)
+
+    assert len(results) == 1
+    assert not results[0].success
+
+
+def test_run_load_plan_rejects_duplicate_tables():
+    """Test two CSV files mapped to one table are an error, not one lost load."""
+    mapped_files = make_mapped_files("GAME") + [(Path("/data/game_2023.csv"), "GAME")]
+    loaded = []
+
+    with pytest.raises(ValueError, match="game.csv and game_2023.csv"):
+        run_load_plan(mapped_files, {}, lambda t, c: loaded.append(c) or True)
+    assert loaded == []
+
+
+def test_host_slots_same_semaphore_per_host():
+    """Test that HostSlots returns one semaphore per host."""
+    host_slots = HostSlots(2)
+
+    assert host_slots.slot("tdvm") is host_slots.slot("tdvm")
+    assert host_slots.slot("tdvm") is not host_slots.slot("other")
+
+
+def test_log_load_summary():
+    """Test log_load_summary runs without error."""
+    results = run_load_plan(make_mapped_files("A"), {}, lambda t, c: True)
+    log_load_summary(results, 1.0)
@@ -0,0 +1,160 @@
+"""Tests for sql_loader module."""
+
+from pathlib import Path
+
+import pytest
+
+from pytpt.sql_loader import (
+    FASTLOAD_ESCAPE,
+    count_csv_rows,
+    insert_statement,
+    load_csv,
+    load_dataframe,
+    load_rows,
+)
+
+
+@pytest.fixture
+def database(database):
+    """Stub database with an empty VENUE table."""
+    database.create_table("VENUE", ["VENUE_ID", "VENUE_NAME", "CAPACITY"])
+    return database
+
+
+def write_csv(tmp_path, rows: int) -> Path:
+    """Write a venue CSV with a number of rows."""
+    csv_file = tmp_path / "venue.csv"
+    lines = ["VENUE_ID,VENUE_NAME,CAPACITY"]
+    lines += [f'{i},"Stadium, {i}",{"" if i % 2 else i * 100}' for i in range(rows)]
+    csv_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return csv_file
+
+
+def test_insert_statement():
+    """Test the insert has one parameter marker per column."""
+    sql = insert_statement("VENUE", ["VENUE_ID", "VENUE_NAME"])
+
+    assert sql == "insert into VENUE (VENUE_ID, VENUE_NAME) values (?, ?)"
+    assert insert_statement("VENUE", ["A"], fastload=True).startswith(FASTLOAD_ESCAPE)
+    assert insert_statement("VENUE", ["A", "B"], positional=True) == (
+        "insert into VENUE values (?, ?)"
+    )
+
+
+def test_count_csv_rows(tmp_path):
+    """Test rows are counted with and without a trailing newline."""
+    csv_file = write_csv(tmp_path, 5)
+    assert count_csv_rows(csv_file) == 5
+
+    csv_file.write_text("A,B\n1,2\n3,4", encoding="utf-8")
+    assert count_csv_rows(csv_file) == 2
+
+
+def test_load_csv_in_batches(database, tmp_path):
+    """Test a CSV is inserted in batches with empty fields as NULL."""
+    csv_file = write_csv(tmp_path, 25)
+    con = database.connect()
+
+    stats = load_csv(con, "VENUE", csv_file, batch_size=10)
+
+    assert stats.rows == 25
+    assert stats.batches == 3
+    assert not stats.fastload
+    assert stats.rows_per_second > 0
+    assert database.tables["VENUE"][0] == ("0", "Stadium, 0", "0")
+    assert database.tables["VENUE"][1] == ("1", "Stadium, 1", None)
+    assert database.statements == ["insert into VENUE values (?, ?, ?)"] * 3
+
+
+def test_load_csv_header_named_differently(database, tmp_path):
+    """Test the header does not name the columns unless column names are given."""
+    csv_file = tmp_path / "venue.csv"
+    csv_file.write_text("ID,NAME,SEATS\n1,Lambeau Field,81441\n", encoding="utf-8")
+    con = database.connect()
+
+    load_csv(con, "VENUE", csv_file)
+    load_csv(
+        con, "VENUE", csv_file, column_names=["VENUE_ID", "VENUE_NAME", "CAPACITY"]
+    )
+
+    assert database.statements == [
+        "insert into VENUE values (?, ?, ?)",
+        "insert into VENUE (VENUE_ID, VENUE_NAME, CAPACITY) values (?, ?, ?)",
+    ]
+    assert database.tables["VENUE"] == [("1", "Lambeau Field", "81441")] * 2
+
+
+def test_load_csv_with_transform(database, tmp_path):
+    """Test each row is transformed before it is inserted."""
+    csv_file = write_csv(tmp_path, 3)
+    con = database.connect()
+
+    load_csv(
+        con,
+        "VENUE",
+        csv_file,
+        transform=lambda row: [int(row[0]), row[1].upper(), row[2]],
+    )
+
+    assert database.tables["VENUE"][2] == (2, "STADIUM, 2", "200")
+
+
+def test_load_csv_uses_fastload_over_threshold(database, tmp_path):
+    """Test a large enough load is run as a FastLoad in one transaction."""
+    csv_file = write_csv(tmp_path, 20)
+    con = database.connect()
+
+    stats = load_csv(con, "VENUE", csv_file, batch_size=5, fastload_threshold=20)
+
+    assert stats.fastload
+    assert stats.rows == 20
+    assert con.commits == 1
+    assert con.autocommit
+    assert "teradata_autocommit_off" in database.statements[0]
+    assert all(
+        statement.startswith(FASTLOAD_ESCAPE) for statement in database.statements[1:5]
+    )
+
+
+def test_load_rows_reports_fastload_errors(database):
+    """Test FastLoad errors are returned and the transaction is not committed."""
+    database.load_errors = ["[Error 2673] The source parcel length does not match"]
+    con = database.connect()
+
+    stats = load_rows(
+        con, "VENUE", ["VENUE_ID"], [(1,), (2,)], row_count=2, fastload_threshold=1
+    )
+
+    assert stats.errors == database.load_errors
+    assert con.commits == 0
+
+
+def test_load_dataframe(database):
+    """Test a DataFrame is loaded with missing values as NULL and Python scalars."""
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame(
+        {
+            "VENUE_ID": [1, 2],
+            "VENUE_NAME": ["CenturyLink Field", None],
+            "CAPACITY": [67000.0, float("nan")],
+        }
+    )
+    con = database.connect()
+
+    stats = load_dataframe(con, "VENUE", df)
+
+    assert stats.rows == 2
+    assert database.tables["VENUE"] == [
+        (1, "CenturyLink Field", 67000.0),
+        (2, None, None),
+    ]
+    assert type(database.tables["VENUE"][0][0]) is int
+
+
+def test_load_csv_real_data(database):
+    """Test the project's venue data loads through the stub driver."""
+    con = database.connect()
+
+    stats = load_csv(con, "VENUE", Path("../../data/venue.csv"))
+
+    assert stats.rows == 32
@@ -0,0 +1,156 @@
+"""Tests for sql_reader module."""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from pytpt.sql_reader import iter_column_batches, read_sql_arrow, read_sql_chunks
+
+
+class FakeCursor:
+    """Cursor that reports Python types in its description and records fetches."""
+
+    def __init__(self, description, rows):
+        self.description = description
+        self.rows = rows
+        self.fetches = []
+        self.arraysize = 1
+        self.closed = False
+
+    def execute(self, sql, params=None):
+        self.sql = sql
+        self.params = params
+
+    def fetchmany(self, size):
+        self.fetches.append(size)
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    """Connection handing out a single FakeCursor."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+
+@pytest.fixture
+def database(database):
+    """Stub database with a small PLAYER table."""
+    database.create_table(
+        "PLAYER",
+        ["GAME_PLAYER_ID", "PLAYER_NAME", "RUSHING_YARDS"],
+        [(i, f"Player {i}", None if i == 3 else i * 10) for i in range(7)],
+    )
+    return database
+
+
+def test_iter_column_batches_uses_fetch_size():
+    """Test rows are fetched with fetchmany and returned as typed columns."""
+    cursor = FakeCursor(
+        [("ID", int), ("NAME", str), ("AMOUNT", Decimal)],
+        [(1, "a", Decimal("1.5")), (2, "b", None), (3, None, Decimal("2"))],
+    )
+
+    batches = list(iter_column_batches(FakeConnection(cursor), "select", fetch_size=2))
+
+    assert [batch.rows for batch in batches] == [2, 1]
+    assert cursor.fetches == [2, 2, 2]
+    assert cursor.closed
+    assert batches[0].names == ["ID", "NAME", "AMOUNT"]
+    assert batches[0].arrays[0].dtype == np.int64
+    assert batches[0].arrays[1].dtype == object
+    assert batches[0].arrays[2][0] == Decimal("1.5")
+
+
+def test_iter_column_batches_masks_nulls_in_typed_columns():
+    """Test NULLs in an integer column are masked rather than turning it to objects."""
+    cursor = FakeCursor([("ID", int)], [(1,), (None,), (3,)])
+
+    (batch,) = iter_column_batches(FakeConnection(cursor), "select")
+
+    assert batch.arrays[0].dtype == np.int64
+    assert batch.masks[0].tolist() == [False, True, False]
+
+
+def test_iter_column_batches_closes_cursor_when_abandoned():
+    """Test the cursor is closed when the caller stops early."""
+    cursor = FakeCursor([("ID", int)], [(i,) for i in range(10)])
+
+    batches = iter_column_batches(FakeConnection(cursor), "select", fetch_size=3)
+    next(batches)
+    batches.close()
+
+    assert cursor.closed
+
+
+def test_read_sql_chunks(database):
+    """Test a query is read as DataFrames of fetch_size rows."""
+    pytest.importorskip("pandas")
+    con = database.connect()
+
+    chunks = list(read_sql_chunks(con, "select * from player", fetch_size=3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert list(chunks[0].columns) == ["GAME_PLAYER_ID", "PLAYER_NAME", "RUSHING_YARDS"]
+    assert chunks[0]["GAME_PLAYER_ID"].dtype == np.int64
+    # Like pd.read_sql, an integer column with NULLs becomes float
+    assert np.isnan(chunks[1]["RUSHING_YARDS"].iloc[0])
+    assert chunks[2]["PLAYER_NAME"].iloc[0] == "Player 6"
+
+
+def test_read_sql_arrow(database):
+    """Test a query is read as RecordBatches with NULLs kept as nulls."""
+    pa = pytest.importorskip("pyarrow")
+    con = database.connect()
+
+    batches = list(read_sql_arrow(con, "select * from player", fetch_size=3))
+
+    assert [batch.num_rows for batch in batches] == [3, 3, 1]
+    assert all(batch.schema == batches[0].schema for batch in batches)
+    assert batches[0].schema.field("RUSHING_YARDS").type == pa.int64()
+    assert batches[1].column(2).to_pylist() == [None, 40, 50]
+
+
+def test_read_sql_arrow_types_from_description():
+    """Test column types come from the driver, whatever the first batch holds."""
+    pa = pytest.importorskip("pyarrow")
+    cursor = FakeCursor(
+        [
+            ("ID", int, None, None, 10, 0, True),
+            ("NAME", str, None, None, None, None, True),
+            ("AMOUNT", Decimal, None, None, 8, 2, True),
+        ],
+        [(1, None, None), (2, "b", Decimal("2.5"))],
+    )
+
+    batches = list(read_sql_arrow(FakeConnection(cursor), "select", fetch_size=1))
+
+    assert batches[0].schema == batches[1].schema
+    assert batches[0].schema.types == [pa.int64(), pa.string(), pa.decimal128(8, 2)]
+    assert batches[1].column(2).to_pylist() == [Decimal("2.50")]
+
+
+def test_read_sql_arrow_column_null_in_first_batch(database):
+    """Test an untyped column that is all NULL at first takes the type of its values."""
+    pa = pytest.importorskip("pyarrow")
+    database.create_table(
+        "GAME", ["GAME_ID", "NOTES"], [(1, None), (2, None), (3, "x")]
+    )
+
+    con = database.connect()
+
+    batches = list(read_sql_arrow(con, "select * from game", fetch_size=2))
+
+    assert batches[0].schema.field("NOTES").type == pa.null()
+    assert batches[1].schema.field("NOTES").type == pa.string()
+    tables = [pa.Table.from_batches([batch]) for batch in batches]
+    combined = pa.concat_tables(tables, promote_options="default")
+    assert combined.column("NOTES").to_pylist() == [None, None, "x"]
@@ -8,7 +8,12 @@ from pytpt.templates import (
     get_credentials,
     render_template,
     write_file,
+    write_file_if_changed,
     create_tpt_files,
+    create_tpt_job_files,
+    render_tpt_scripts,
+    TemplateEngine,
+    get_template_engine,
 )
 
 
@@ -99,3 +104,118 @@ def test_create_tpt_files():
             jvar_file.unlink()
         if "tpt_file" in locals() and tpt_file.exists():
             tpt_file.unlink()
+
+
+def test_write_file_if_changed():
+    """Test write_file_if_changed only writes when the content differs."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = Path(temp_dir) / "subdir" / "test.txt"
+
+        assert write_file_if_changed("first", output_path) is True
+        assert write_file_if_changed("first", output_path) is False
+        assert write_file_if_changed("second", output_path) is True
+        assert output_path.read_text() == "second"
+
+
+def test_template_engine_render():
+    """Test TemplateEngine compiles a scripts directory and renders strings."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        scripts_dir = Path(temp_dir) / "scripts"
+        scripts_dir.mkdir()
+        for file_name in TemplateEngine.TEMPLATE_FILES.values():
+            (scripts_dir / file_name).write_text(f"{file_name}: {{{{table_name}}}}")
+
+        engine = TemplateEngine(scripts_dir, cache_dir=Path(temp_dir))
+        rendered = engine.render_all(table_name="GAME")
+
+        assert set(rendered) == {"jobvars", "drop", "create", "load", "job"}
+        assert rendered["drop"] == "drop-table.tpt: GAME"
+        assert engine.render("load", table_name="VENUE") == "load-table.tpt: VENUE"
+        assert engine.render_all(("drop", "create"), table_name="GAME") == {
+            "drop": "drop-table.tpt: GAME",
+            "create": "create-table.tpt: GAME",
+        }
+
+
+def test_get_template_engine_is_shared():
+    """Test get_template_engine returns the same engine for a directory."""
+    assert get_template_engine() is get_template_engine("scripts")
+
+
+def test_render_tpt_scripts():
+    """Test render_tpt_scripts renders every script without writing files."""
+    rendered = render_tpt_scripts("RENDER_TEST", "/path/to/render.csv")
+
+    assert "LoadTargetTable=" in rendered["jobvars"]
+    assert "/path/to/render.csv" in rendered["jobvars"]
+    assert "RENDER_TEST_ET" in rendered["drop"]
+    assert "DEFINE JOB" in rendered["load"]
+    assert not (Path("render_tmp") / "RENDER_TEST.jvar").exists()
+
+
+def test_create_tpt_job_files():
+    """Test create_tpt_job_files writes a single drop, create and load job."""
+    table_name = "GAME_TYPE"
+
+    try:
+        jvar_file, job_file = create_tpt_job_files(table_name, "/path/to/game_type.csv")
+
+        assert jvar_file.name == f"{table_name}.jvar"
+        assert job_file.name == f"{table_name}_job.tpt"
+
+        job_content = job_file.read_text()
+        for step in ("drop_main_table", "create_table", "load_stg_table"):
+            assert f"STEP {step}" in job_content
+        # Schema comes from the DDL as the table doesn't exist at compile time
+        assert '"GAME_TYPE_ID" VARCHAR(11)' in job_content
+        assert "create table" in job_content
+
+    finally:
+        for generated_file in (jvar_file, job_file):
+            if generated_file.exists():
+                generated_file.unlink()
+
+
+def test_render_tpt_scripts_multiple_readers():
+    """Test chunked files are read by several instances with a wildcard name."""
+    rendered = render_tpt_scripts(
+        "PLAYER", "/tmp/chunks/PLAYER/player_part*.csv", reader_instances=4
+    )
+
+    assert "FileReaderFileName='player_part*.csv'" in rendered["jobvars"]
+    assert "FileReaderDirectoryPath='/tmp/chunks/PLAYER'" in rendered["jobvars"]
+    assert "FileReaderSkipRowsEveryFile='Y'" in rendered["jobvars"]
+    assert "$FILE_READER(unit_schema)[4]" in rendered["load"]
+    assert "$FILE_READER(unit_schema)[4]" in rendered["job"]
+
+
+def test_render_tpt_scripts_single_reader():
+    """Test a single file keeps one reader instance and no directory path."""
+    rendered = render_tpt_scripts("GAME", "/data/game.csv")
+
+    assert "FileReaderDirectoryPath" not in rendered["jobvars"]
+    assert "$FILE_READER(unit_schema)[1]" in rendered["load"]
+
+
+def test_render_tpt_scripts_load_operator():
+    """Test the chosen operator is used by the load and its job variables."""
+    rendered = render_tpt_scripts("GAME", "/data/game.csv")
+    assert "TO OPERATOR ($LOAD)" in rendered["load"]
+    assert "TO OPERATOR ($LOAD)" in rendered["job"]
+
+    rendered = render_tpt_scripts("GAME", "/data/game.csv", load_operator="UPDATE")
+    assert "TO OPERATOR ($UPDATE)" in rendered["load"]
+    assert "TO OPERATOR ($UPDATE)" in rendered["job"]
+    assert "UpdateTargetTable=" in rendered["jobvars"]
+
+
+def test_render_tpt_scripts_append():
+    """Test an appending single job leaves out the drop and create steps."""
+    rendered = render_tpt_scripts(
+        "GAME", "/data/game.csv", load_operator="STREAM", append=True
+    )
+
+    assert "STEP drop_main_table" not in rendered["job"]
+    assert "STEP create_table" not in rendered["job"]
+    assert "STEP load_stg_table" in rendered["job"]
+    assert "StreamPrivateLogName=" in rendered["jobvars"]
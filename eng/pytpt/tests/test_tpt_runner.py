@@ -3,9 +3,43 @@
 import tempfile
 from pathlib import Path
 
-from pytpt.tpt_runner import run_tbuild, load_table
+import os
+import re
+import stat
+import sys
 
+import pytest
+from omegaconf import OmegaConf
 
+from pytpt import retry, tpt_runner
+from pytpt.checkpoint import CheckpointJob, CheckpointStore
+from pytpt.config_utils import load_config
+from pytpt.report import RunReport
+from pytpt.run_archive import RunArchive
+from pytpt.scheduler import TableLoadResult
+from pytpt.tpt_runner import (
+    run_tbuild,
+    load_table,
+    load_table_steps,
+    parse_step_results,
+    stream_tbuild,
+    tbuild_log_file,
+    TbuildResult,
+)
+
+
+@pytest.fixture
+def tmp_workdir(tmp_path, monkeypatch):
+    """Run in tmp_path with the project's conf, ddl and scripts, so output stays there."""
+    if os.name == "nt":
+        pytest.skip("Linking the project directories requires POSIX symlinks")
+    for name in ("conf", "ddl", "scripts"):
+        (tmp_path / name).symlink_to(Path(name).absolute(), target_is_directory=True)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.usefixtures("tmp_workdir")
 def test_run_tbuild_with_invalid_files():
     """Test run_tbuild with non-existent files (should return False)."""
     jvar_file = Path("/nonexistent/file.jvar")
@@ -15,6 +49,7 @@ def test_run_tbuild_with_invalid_files():
     assert result is False
 
 
+@pytest.mark.usefixtures("tmp_workdir")
 def test_run_tbuild_with_valid_files():
     """Test run_tbuild with actual files (may fail but shouldn't crash)."""
     # Create temporary files with valid content
@@ -47,6 +82,7 @@ DESCRIPTION 'Test job' (
         tpt_file.unlink()
 
 
+@pytest.mark.usefixtures("tmp_workdir")
 def test_load_table():
     """Test load_table function."""
     # Create a test CSV file
@@ -82,16 +118,9 @@ def test_load_table():
 
     finally:
         Path(csv_path).unlink()
-        # Cleanup generated files if they exist
-        output_dir = Path("render_tmp")
-        for generated_file in [
-            output_dir / f"{table_name}.jvar",
-            output_dir / f"{table_name}.tpt",
-        ]:
-            if generated_file.exists():
-                generated_file.unlink()
 
 
+@pytest.mark.usefixtures("tmp_workdir")
 def test_load_table_creates_files():
     """Test that load_table creates the expected TPT files."""
     csv_content = "id,name\n1,test"
@@ -126,11 +155,479 @@ def test_load_table_creates_files():
 
     finally:
         Path(csv_path).unlink()
-        # Cleanup
-        output_dir = Path("render_tmp")
-        for generated_file in [
-            output_dir / f"{table_name}.jvar",
-            output_dir / f"{table_name}.tpt",
-        ]:
-            if generated_file.exists():
-                generated_file.unlink()
+
+
+SINGLE_JOB_OUTPUT = """Teradata Parallel Transporter Version 20.00.00.16 64-Bit
+Job step drop_main_table completed successfully
+Job step drop_error_table_1 completed successfully
+Job step drop_error_table_2 completed successfully
+Job step create_table completed successfully
+$LOAD: Total Rows Sent To RDBMS:      2
+$LOAD: Total Rows Applied:            2
+Job step load_stg_table terminated (status 12)
+Job chris terminated (status 12)
+"""
+
+
+def test_parse_step_results():
+    """Test parse_step_results reports each step separately."""
+    step_results = parse_step_results(SINGLE_JOB_OUTPUT)
+
+    assert step_results["drop_main_table"] is True
+    assert step_results["create_table"] is True
+    assert step_results["load_stg_table"] is False
+
+
+@pytest.mark.usefixtures("tmp_workdir")
+def test_load_table_single_job(monkeypatch):
+    """Test load_table with single_job runs one tbuild for all steps."""
+    calls = []
+
+    def fake_execute_tbuild(jvar_file, tpt_file, operation_type="unknown", **kwargs):
+        calls.append((tpt_file.name, operation_type))
+        stdout = SINGLE_JOB_OUTPUT.replace(
+            "terminated (status 12)", "completed successfully"
+        )
+        return TbuildResult(0, Path("job.log"), step_results=parse_step_results(stdout))
+
+    monkeypatch.setattr(tpt_runner, "execute_tbuild", fake_execute_tbuild)
+    table_name = "GAME_TYPE"
+
+    assert load_table(table_name, "/path/to/game_type.csv", single_job=True)
+    assert calls == [(f"{table_name}_job.tpt", "job")]
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="named pipes are POSIX only")
+@pytest.mark.usefixtures("tmp_workdir")
+def test_load_table_feeds_mapped_columns_through_pipe(monkeypatch, tmp_path):
+    """Test a CSV with its columns out of order is fed to the load in table order."""
+    csv_file = tmp_path / "game_type.csv"
+    csv_file.write_text("GAME_TYPE,ID\nREG,1\nPOS,2\n")
+    config = OmegaConf.to_container(load_config(), resolve=True)
+    config["split"]["enabled"] = False
+    config["transform"] = {
+        "enabled": True,
+        "pipe": True,
+        "dir": str(tmp_path / "transform"),
+        "aliases": {"GAME_TYPE": {"ID": "GAME_TYPE_ID"}},
+    }
+    config = OmegaConf.create(config)
+    loaded = []
+
+    def fake_execute_tbuild(jvar_file, tpt_file, operation_type="unknown", **kwargs):
+        if operation_type == "load":
+            jobvars = jvar_file.read_text()
+            reader_path = re.search(r"FileReaderFileName='([^']*)'", jobvars).group(1)
+            with open(reader_path) as pipe:
+                loaded.append(pipe.read())
+        return TbuildResult(0, Path(f"{operation_type}.log"))
+
+    monkeypatch.setattr(tpt_runner, "execute_tbuild", fake_execute_tbuild)
+
+    assert load_table("GAME_TYPE", str(csv_file), config)
+    assert loaded == ["GAME_TYPE_ID,GAME_TYPE\n1,REG\n2,POS\n"]
+    assert not (tmp_path / "transform" / "GAME_TYPE").exists()
+
+
+@pytest.mark.usefixtures("tmp_workdir")
+def test_load_table_single_job_failed_step(monkeypatch):
+    """Test that a failed step in the single job fails the table load."""
+
+    def fake_execute_tbuild(jvar_file, tpt_file, operation_type="unknown", **kwargs):
+        step_results = parse_step_results(SINGLE_JOB_OUTPUT)
+        return TbuildResult(12, Path("job.log"), step_results=step_results)
+
+    monkeypatch.setattr(tpt_runner, "execute_tbuild", fake_execute_tbuild)
+
+    assert load_table("GAME_TYPE", "/path/to/game_type.csv", single_job=True) is False
+
+
+FAKE_TBUILD = """#!{python}
+import sys
+import time
+from pathlib import Path
+
+lines = int(sys.argv[sys.argv.index("--lines") + 1]) if "--lines" in sys.argv else 20000
+go_file = Path(__file__).parent / "go"
+
+print("Teradata Parallel Transporter Version 20.00.00.16 64-Bit", flush=True)
+print("$LOAD: entering Acquisition Phase", flush=True)
+
+# Wait until the test has seen the phase event, proving output is streamed
+deadline = time.time() + 10
+while not go_file.exists() and time.time() < deadline:
+    time.sleep(0.01)
+
+for i in range(lines):
+    print(f"$FILE_READER[1]: verbose operator output line {{i}}")
+    if i % 1000 == 0:
+        print(f"$FILE_READER[1]: warning {{i}}", file=sys.stderr)
+print("$LOAD: Total Rows Sent To RDBMS:      {rows}")
+print("$LOAD: Total Rows Applied:            {rows}")
+print("Job step load_stg_table completed successfully")
+sys.exit({returncode})
+"""
+
+
+@pytest.fixture
+def fake_tbuild(tmp_path, monkeypatch):
+    """Put a fake tbuild that prints a lot of output first on the PATH."""
+    if os.name == "nt":
+        pytest.skip("Fake tbuild script requires a POSIX shell")
+
+    def install(rows=12345, returncode=0):
+        script = tmp_path / "tbuild"
+        script.write_text(
+            FAKE_TBUILD.format(python=sys.executable, rows=rows, returncode=returncode)
+        )
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+        return tmp_path
+
+    return install
+
+
+def test_stream_tbuild_streams_output(fake_tbuild, tmp_path):
+    """Test stream_tbuild tees output to one log and emits live events."""
+    script_dir = fake_tbuild(rows=12345)
+    log_file = tmp_path / "logs" / "tpt_TEST_load.log"
+    events = []
+
+    def on_event(event):
+        events.append(event)
+        if event.kind == "phase":
+            # The job is still running and waiting for this file
+            (script_dir / "go").touch()
+
+    result = stream_tbuild(["tbuild"], log_file, "load", on_event)
+
+    assert result.success
+    assert result.rows_sent == 12345
+    assert result.rows_applied == 12345
+    assert result.step_results == {"load_stg_table": True}
+    assert len(result.stderr_tail) <= tpt_runner.STDERR_TAIL_LINES
+
+    kinds = [event.kind for event in events]
+    assert kinds[0] == "started"
+    assert kinds[-1] == "finished"
+    assert "phase" in kinds
+    assert [e.rows_sent for e in events if e.kind == "rows"][-1] == 12345
+
+    log_content = log_file.read_text()
+    assert "verbose operator output line 19999" in log_content
+    assert "[stderr] $FILE_READER[1]: warning 0" in log_content
+    assert "Return Code: 0" in log_content
+
+
+def test_run_tbuild_with_fake_tbuild_failure(fake_tbuild, tmp_path, monkeypatch):
+    """Test run_tbuild reports a failing tbuild return code."""
+    monkeypatch.chdir(tmp_path)
+    script_dir = fake_tbuild(returncode=12)
+    (script_dir / "go").touch()
+
+    result = run_tbuild(tmp_path / "TEST.jvar", tmp_path / "TEST_load.tpt", "load")
+
+    assert result is False
+
+
+def test_stream_tbuild_missing_executable(tmp_path):
+    """Test stream_tbuild when the command cannot be started."""
+    result = stream_tbuild(["pytpt-no-such-tbuild"], tmp_path / "missing.log")
+
+    assert result.success is False
+    assert result.returncode == 127
+
+
+CHECKPOINT_TBUILD = """#!{python}
+import sys
+from pathlib import Path
+
+args = sys.argv[1:]
+with open(Path(__file__).parent / "calls.txt", "a") as f:
+    f.write(" ".join(args) + "\\n")
+
+tpt_file = args[args.index("-f") + 1]
+if not tpt_file.endswith(("_load.tpt", "_job.tpt")):
+    print("Job step drop_main_table completed successfully")
+    sys.exit(0)
+
+# Fail part way through the first run, leaving a checkpoint to restart from
+checkpoint = Path(args[args.index("-r") + 1]) / (args[-1] + ".LVCP")
+if checkpoint.exists():
+    print("$LOAD: Total Rows Sent To RDBMS:      5000")
+    print("$LOAD: Total Rows Applied:            10000")
+    print("Job step load_stg_table completed successfully")
+    sys.exit(0)
+
+print("Job step drop_main_table completed successfully")
+print("Job step drop_error_table_1 completed successfully")
+print("Job step drop_error_table_2 completed successfully")
+print("Job step create_table completed successfully")
+print("$LOAD: entering Acquisition Phase")
+checkpoint.write_text("5000")
+print("Job step load_stg_table terminated (status 12)")
+sys.exit(12)
+"""
+
+
+@pytest.fixture
+def checkpoint_tbuild(tmp_workdir, monkeypatch):
+    """Put a fake tbuild that fails mid-load on its first run first on the PATH."""
+    if os.name == "nt":
+        pytest.skip("Fake tbuild script requires a POSIX shell")
+
+    bin_dir = tmp_workdir / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "tbuild"
+    script.write_text(CHECKPOINT_TBUILD.format(python=sys.executable))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    csv_file = tmp_workdir / "game_type.csv"
+    csv_file.write_text("GAME_TYPE_ID,GAME_TYPE\n1,REG\n")
+    return bin_dir / "calls.txt", csv_file
+
+
+def test_tbuild_command_checkpoint():
+    """Test tbuild runs with -nocp unless a checkpoint job is given."""
+    jvar_file, tpt_file = Path("T.jvar"), Path("T_load.tpt")
+    assert tpt_runner.tbuild_command(jvar_file, tpt_file)[-1] == "-nocp"
+
+    store = CheckpointStore("unused.json", "checkpoints")
+    job = CheckpointJob("T", "pytpt_t_load", "checkpoints/T", "load", "", 0, 0, "")
+    cmd = tpt_runner.tbuild_command(jvar_file, tpt_file, job, store.interval)
+    assert cmd[-5:] == ["-z", "60", "-r", "checkpoints/T", "pytpt_t_load"]
+
+
+def test_load_table_restarts_from_checkpoint(checkpoint_tbuild, tmp_path):
+    """Test a load that failed mid-job restarts from its checkpoint, skipping drop and create."""
+    calls_file, csv_file = checkpoint_tbuild
+    state_file = tmp_path / "state" / "checkpoints.json"
+    checkpoint_dir = tmp_path / "state" / "checkpoints"
+
+    checkpoints = CheckpointStore(state_file, checkpoint_dir, interval=30)
+    assert load_table("GAME_TYPE", str(csv_file), checkpoints=checkpoints) is False
+    first_run = calls_file.read_text().splitlines()
+    assert [call.split()[1].rsplit("_", 1)[-1] for call in first_run] == [
+        "drop.tpt",
+        "create.tpt",
+        "load.tpt",
+    ]
+    assert first_run[-1].endswith(
+        f"-z 30 -r {checkpoint_dir / 'GAME_TYPE'} pytpt_game_type_load"
+    )
+    assert (checkpoint_dir / "GAME_TYPE" / "pytpt_game_type_load.LVCP").exists()
+
+    # A new store, as on the next run of the app, reads the persisted job
+    checkpoints = CheckpointStore(state_file, checkpoint_dir, interval=30)
+    assert checkpoints.jobs["GAME_TYPE"].job_name == "pytpt_game_type_load"
+    assert load_table("GAME_TYPE", str(csv_file), checkpoints=checkpoints) is True
+
+    second_run = calls_file.read_text().splitlines()[len(first_run) :]
+    assert second_run == [first_run[-1]]
+    assert not (checkpoint_dir / "GAME_TYPE").exists()
+    assert CheckpointStore(state_file, checkpoint_dir).jobs == {}
+
+
+def test_load_table_single_job_restarts_from_checkpoint(checkpoint_tbuild, tmp_path):
+    """Test a failed single job restarts and counts steps completed before the failure."""
+    calls_file, csv_file = checkpoint_tbuild
+    checkpoints = CheckpointStore(tmp_path / "checkpoints.json", tmp_path / "cp")
+
+    assert (
+        load_table("GAME_TYPE", str(csv_file), single_job=True, checkpoints=checkpoints)
+        is False
+    )
+    assert (
+        load_table("GAME_TYPE", str(csv_file), single_job=True, checkpoints=checkpoints)
+        is True
+    )
+
+    calls = calls_file.read_text().splitlines()
+    assert len(calls) == 2
+    assert calls[0] == calls[1]
+    assert checkpoints.jobs == {}
+
+
+def test_load_table_changed_csv_discards_checkpoint(checkpoint_tbuild, tmp_path):
+    """Test a checkpoint is not restarted once the CSV it was loading has changed."""
+    calls_file, csv_file = checkpoint_tbuild
+    checkpoints = CheckpointStore(tmp_path / "checkpoints.json", tmp_path / "cp")
+
+    assert load_table("GAME_TYPE", str(csv_file), checkpoints=checkpoints) is False
+    csv_file.write_text("GAME_TYPE_ID,GAME_TYPE\n1,REG\n2,POST\n")
+
+    # Starts over with drop and create, and fails mid-load again
+    assert load_table("GAME_TYPE", str(csv_file), checkpoints=checkpoints) is False
+    assert len(calls_file.read_text().splitlines()) == 6
+
+
+@pytest.mark.usefixtures("tmp_workdir")
+def test_load_table_append_chooses_operator(monkeypatch, tmp_path):
+    """Test an append skips drop and create and loads with the chosen operator."""
+    calls = []
+
+    def fake_execute_tbuild(jvar_file, tpt_file, operation_type="unknown", **kwargs):
+        calls.append(operation_type)
+        return TbuildResult(0, Path("load.log"))
+
+    monkeypatch.setattr(tpt_runner, "execute_tbuild", fake_execute_tbuild)
+    csv_file = tmp_path / "game_type.csv"
+    csv_file.write_text("GAME_TYPE_ID,GAME_TYPE\n1,REG\n")
+    report = RunReport("run-1")
+
+    assert load_table("GAME_TYPE", str(csv_file), append=True, report=report)
+    assert calls == ["load"]
+    report.record_tables([TableLoadResult("GAME_TYPE", csv_file, True, 1.0)])
+    assert [step.load_operator for step in report.tables[0].steps] == ["INSERTER"]
+    load_file = Path("render_tmp") / "GAME_TYPE_load.tpt"
+    assert "TO OPERATOR ($INSERTER)" in load_file.read_text()
+
+
+@pytest.mark.usefixtures("tmp_workdir")
+def test_load_table_retries_only_failed_step(monkeypatch, tmp_path):
+    """Test a load failing on a deadlock is retried without dropping the table again."""
+    calls = []
+    waits = []
+
+    def fake_execute_tbuild(jvar_file, tpt_file, operation_type="unknown", **kwargs):
+        calls.append(operation_type)
+        if operation_type == "load" and calls.count("load") == 1:
+            error = "$LOAD: RDBMS error 2631: Transaction ABORTed due to deadlock."
+            return TbuildResult(12, Path("load.log"), error_lines=[error])
+        return TbuildResult(0, Path(f"{operation_type}.log"))
+
+    monkeypatch.setattr(tpt_runner, "execute_tbuild", fake_execute_tbuild)
+    monkeypatch.setattr(retry.time, "sleep", waits.append)
+    csv_file = tmp_path / "game_type.csv"
+    csv_file.write_text("GAME_TYPE_ID,GAME_TYPE\n1,REG\n")
+
+    assert load_table("GAME_TYPE", str(csv_file))
+    assert calls == ["drop", "create", "load", "load"]
+    assert len(waits) == 1
+
+
+@pytest.mark.usefixtures("tmp_workdir")
+def test_load_table_fastload_retried_from_drop(monkeypatch, tmp_path):
+    """Test a failed $LOAD without a checkpoint is retried from the drop of the table."""
+    calls = []
+    waits = []
+
+    def fake_execute_tbuild(jvar_file, tpt_file, operation_type="unknown", **kwargs):
+        calls.append(operation_type)
+        if operation_type == "load" and calls.count("load") == 1:
+            error = "$LOAD: RDBMS error 2631: Transaction ABORTed due to deadlock."
+            return TbuildResult(12, Path("load.log"), error_lines=[error])
+        return TbuildResult(0, Path(f"{operation_type}.log"))
+
+    monkeypatch.setattr(tpt_runner, "execute_tbuild", fake_execute_tbuild)
+    monkeypatch.setattr(retry.time, "sleep", waits.append)
+    csv_file = tmp_path / "game_type.csv"
+    csv_file.write_text("GAME_TYPE_ID,GAME_TYPE\n1,REG\n")
+
+    report = RunReport("run-1")
+
+    assert load_table_steps(
+        "GAME_TYPE", str(csv_file), load_operator="LOAD", report=report
+    )
+    assert calls == ["drop", "create", "load", "drop", "create", "load"]
+    assert len(waits) == 1
+
+    # Each step is reported once, with the pass from the drop as its retry
+    report.record_tables([TableLoadResult("GAME_TYPE", csv_file, True, 1.0)])
+    steps = report.tables[0].steps
+    assert [(step.step, step.retries) for step in steps] == [
+        ("drop", 1),
+        ("create", 1),
+        ("load", 1),
+    ]
+    assert steps[2].success
+
+    # Appending leaves nothing to drop, so the locked table is not loaded again
+    calls.clear()
+    assert not load_table_steps(
+        "GAME_TYPE", str(csv_file), load_operator="UPDATE", append=True
+    )
+    assert calls == ["load"]
+
+
+@pytest.mark.usefixtures("tmp_workdir")
+def test_load_table_records_steps_in_report(monkeypatch, tmp_path):
+    """Test each step of a load is recorded in the run report with its retries."""
+    calls = []
+
+    def fake_execute_tbuild(jvar_file, tpt_file, operation_type="unknown", **kwargs):
+        calls.append(operation_type)
+        if operation_type == "load" and calls.count("load") == 1:
+            error = "$LOAD: RDBMS error 2631: Transaction ABORTed due to deadlock."
+            return TbuildResult(12, Path("load.log"), error_lines=[error])
+        return TbuildResult(0, Path(f"{operation_type}.log"))
+
+    monkeypatch.setattr(tpt_runner, "execute_tbuild", fake_execute_tbuild)
+    monkeypatch.setattr(retry.time, "sleep", lambda seconds: None)
+    csv_file = tmp_path / "game_type.csv"
+    csv_file.write_text("GAME_TYPE_ID,GAME_TYPE\n1,REG\n")
+    report = RunReport("run-1")
+
+    assert load_table("GAME_TYPE", str(csv_file), report=report)
+    report.record_tables([TableLoadResult("GAME_TYPE", csv_file, True, 1.0)])
+    steps = report.tables[0].steps
+    assert [step.step for step in steps] == ["drop", "create", "load"]
+    assert [step.retries for step in steps] == [0, 0, 1]
+    assert steps[2].bytes_read == csv_file.stat().st_size
+    assert steps[2].load_operator == "INSERTER"
+
+
+def test_tbuild_log_file_keeps_table_names_apart():
+    """Test tables that differ only by underscores get their own log files."""
+    game_stats = tbuild_log_file(Path("render_tmp/GAME_STATS.jvar"), "load")
+    gamestats = tbuild_log_file(Path("render_tmp/GAMESTATS.jvar"), "load")
+
+    assert game_stats == Path("logs") / "tpt_GAME_STATS_load.log"
+    assert gamestats != game_stats
+    assert tbuild_log_file(Path("job.jvar"), "load", "GAME") == (
+        Path("logs") / "tpt_GAME_load.log"
+    )
+
+
+@pytest.mark.usefixtures("tmp_workdir")
+def test_load_table_archives_each_attempt(monkeypatch, tmp_path):
+    """Test the log file of every attempt at a step is moved into the run archive."""
+    calls = []
+
+    def fake_execute_tbuild(jvar_file, tpt_file, operation_type="unknown", **kwargs):
+        calls.append(operation_type)
+        log_file = tmp_path / f"{kwargs['table_name']}_{operation_type}.log"
+        log_file.write_text(f"{operation_type} attempt {calls.count(operation_type)}\n")
+        if operation_type == "load" and calls.count("load") == 1:
+            error = "$LOAD: RDBMS error 2631: Transaction ABORTed due to deadlock."
+            return TbuildResult(12, log_file, error_lines=[error])
+        return TbuildResult(0, log_file)
+
+    monkeypatch.setattr(tpt_runner, "execute_tbuild", fake_execute_tbuild)
+    monkeypatch.setattr(tpt_runner, "current_run_id", lambda: "run1")
+    monkeypatch.setattr(retry.time, "sleep", lambda seconds: None)
+    locations = []
+    monkeypatch.setattr(
+        tpt_runner,
+        "log_tbuild_result",
+        lambda result, operation_type, location=None: locations.append(location),
+    )
+    csv_file = tmp_path / "game_type.csv"
+    csv_file.write_text("GAME_TYPE_ID,GAME_TYPE\n1,REG\n")
+    archive = RunArchive(tmp_path / "archive")
+
+    assert load_table("GAME_TYPE", str(csv_file), archive=archive)
+    assert [(e.step, e.attempt) for e in archive.entries("run1")] == [
+        ("drop", 1),
+        ("create", 1),
+        ("load", 1),
+        ("load", 2),
+    ]
+    assert archive.read("run1", "GAME_TYPE", "load", 1) == "load attempt 1\n"
+    assert not list(tmp_path.glob("*.log"))
+    # The log points to the archive, not to the moved log files
+    assert len(locations) == 4
+    assert locations[3].endswith(
+        "(read with: pytpt log GAME_TYPE load --run run1 --attempt 2)"
+    )
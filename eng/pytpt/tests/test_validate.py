@@ -0,0 +1,131 @@
+"""Tests for validate module."""
+
+from pathlib import Path
+
+import pytest
+
+from pytpt.csv_transform import map_columns
+from pytpt.ddl import Column, parse_columns
+from pytpt.validate import ColumnCheck, validate_csv
+
+COLUMNS = [
+    Column("ID", "INTEGER", nullable=False),
+    Column("CODE", "CHAR", length=3),
+    Column("AMOUNT", "DECIMAL", length=6, scale=2),
+    Column("PLAYED_ON", "DATE"),
+]
+
+
+def write_csv(tmp_path, text: str) -> Path:
+    """Write CSV text to a file."""
+    csv_file = tmp_path / "test.csv"
+    csv_file.write_text(text, encoding="utf-8")
+    return csv_file
+
+
+def test_validate_csv_valid_file(tmp_path):
+    """Test a file that matches the columns is valid."""
+    csv_file = write_csv(
+        tmp_path,
+        'id,code,amount,played_on\n1,ABC,1234.56,2020-09-11\n2,,,\n3,"X,Y",-1.5,2021-01-31\n',
+    )
+
+    report = validate_csv(csv_file, COLUMNS)
+
+    assert report.valid
+    assert report.rows_checked == 3
+    assert report.complete
+
+
+def test_validate_csv_reports_line_numbers(tmp_path):
+    """Test offending rows are reported with their line numbers."""
+    csv_file = write_csv(
+        tmp_path,
+        "id,code,amount,played_on\n"
+        "1,ABC,1.00,2020-09-11\n"
+        ",ABC,1.00,2020-09-11\n"
+        "3,TOOLONG,1.00,2020-09-11\n"
+        '4,"A\nB",1.00,2020-09-11\n'
+        "5,ABC,12345.00,2020-09-11\n"
+        "6,ABC,1.00,2020-13-01\n"
+        "x,ABC,1.00,2020-09-11\n"
+        "8,ABC\n",
+    )
+
+    report = validate_csv(csv_file, COLUMNS)
+
+    problems = [(e.line_number, e.column, e.message) for e in report.errors]
+    assert problems == [
+        (3, "ID", "NULL in NOT NULL column"),
+        (4, "CODE", "longer than 3 characters"),
+        (7, "AMOUNT", "not a valid DECIMAL"),
+        (8, "PLAYED_ON", "not a valid DATE"),
+        (9, "ID", "not a valid INTEGER"),
+        (10, None, "expected 4 columns, found 2"),
+    ]
+
+
+def test_validate_csv_stops_at_max_errors(tmp_path):
+    """Test validation stops after the first N offending rows."""
+    rows = "".join(f"x{i},A,1,2020-01-01\n" for i in range(100))
+    csv_file = write_csv(tmp_path, "id,code,amount,played_on\n" + rows)
+
+    report = validate_csv(csv_file, COLUMNS, max_errors=5, chunk_rows=10)
+
+    assert len(report.errors) == 5
+    assert report.errors[0].line_number == 2
+    assert not report.complete
+
+
+def test_validate_csv_across_chunks(tmp_path):
+    """Test line numbers stay correct across chunk boundaries."""
+    rows = "".join(f"{i},A,1,2020-01-01\n" for i in range(25)) + "bad,A,1,2020-01-01\n"
+    csv_file = write_csv(tmp_path, "id,code,amount,played_on\n" + rows)
+
+    report = validate_csv(csv_file, COLUMNS, chunk_rows=10)
+
+    assert [error.line_number for error in report.errors] == [27]
+
+
+def test_validate_csv_with_column_mapping(tmp_path):
+    """Test columns are checked where the mapping finds them, not by position."""
+    csv_file = write_csv(
+        tmp_path, "played_on,NOTES,ref,id\n2020-09-11,x,ABC,1\nnope,y,ABCD,2\n"
+    )
+    mapping = map_columns(
+        ["played_on", "NOTES", "ref", "id"], COLUMNS, aliases={"REF": "CODE"}
+    )
+
+    report = validate_csv(csv_file, COLUMNS, mapping=mapping)
+
+    assert report.rows_checked == 2
+    assert [(e.line_number, e.column, e.value) for e in report.errors] == [
+        (3, "CODE", "ABCD")
+    ]
+    assert not validate_csv(csv_file, COLUMNS).valid
+
+
+@pytest.mark.parametrize(
+    "value, valid",
+    [
+        ("2147483647", True),
+        ("2147483648", False),
+        ("-2147483648", True),
+        ("42.4", True),
+    ],
+)
+def test_column_check_integer_range(value, valid):
+    """Test integer values are checked against the type's range."""
+    check = ColumnCheck(Column("ID", "INTEGER"))
+
+    assert (check.check([value]) == []) is valid
+
+
+def test_validate_csv_real_data():
+    """Test the project data validates against its DDL."""
+    columns = parse_columns(Path("ddl/venue.sql").read_text())
+
+    report = validate_csv(Path("../../data/venue.csv"), columns)
+
+    assert report.valid
+    assert report.rows_checked == 32
@@ -5,17 +5,16 @@ host = "tdvm"
 database = "PRD_ADS_PYTHON_NFL_DB"
 
 # %%
-# This one works for reading Teradata out of the box
-import teradatasql
-import csv
 import pandas as pd
+from pytpt.sql_loader import load_csv
+from pytpt.ddl import load_schema
+from pytpt.export import export_tables
+from pytpt.pool import teradata_pool
+from pytpt.reset import reset_tables
+from pytpt.sql_reader import read_sql_chunks
 
-con = teradatasql.connect(
-    host=host,
-    user=user,
-    password=password,
-    database=database,
-)
+# Sessions are checked out of the pool by each step, so steps can run concurrently
+pool = teradata_pool(host, user, password, database, min_size=1, max_size=4)
 
 # %%
 query = f"""
@@ -31,62 +30,65 @@ group by
 order by 
   TableName
 """
-tables = pd.read_sql(query, con)
+with pool.connection() as con:
+    tables = pd.read_sql(query, con)
 
 # %%
-# Order
-order = pd.DataFrame(
-    [
-        [1, "GAME_TYPE"],
-        [2, "GAME"],
-        [3, "WEATHER"],
-        [4, "VENUE"],
-        [5, "GAME_VENUE"],
-        [6, "TEAM_LOOKUP"],
-        [7, "GAME_STATS"],
-        [8, "PLAYER"],
-    ],
-    columns=["order", "TableName"],
-)
-
-table_load = tables.merge(order, how="right", on="TableName")
-
-# %%
-# Loading data
-cur = con.cursor()
-
+# Load order from the foreign keys in the DDL: tables only reference tables in earlier levels
+schema = load_schema("python-nfl-ddl.sql")
+dependencies = schema.dependencies
+table_names = [name for name in tables["TableName"].str.strip() if name in schema.tables]
+levels = schema.load_levels(table_names)
 
 # %%
 def insert_rows_from_csv(
     tablename: str,
-    columncount: int,
+    batch_size: int = 10_000,
 ):
-    """Insert rows from a CSV into a Teradat table
+    """Insert rows from a CSV into a Teradata table in batches
+
+    The columns are named from the DDL, as some CSV headers differ from them,
+    such as LOCATION for HOME_AWAY in player.csv.
 
     Args:
         tablename (str): the name of the table
-        columncount (int): the number of columns in the table
+        batch_size (int): the number of rows sent in each request
     """
-    columncount_questionmark = ", ?" * (columncount - 1)
-    exec_string = f"{{fn teradata_read_csv(./data/{tablename.lower()}.csv)}}insert into {tablename} (?{columncount_questionmark})"
-    cur.execute(exec_string)
+    column_names = [column.name for column in schema.tables[tablename].columns]
+    with pool.connection() as con:
+        stats = load_csv(
+            con,
+            tablename,
+            f"./data/{tablename.lower()}.csv",
+            batch_size,
+            column_names=column_names,
+        )
+    print(f"{stats.rows} rows, {stats.rows_per_second:,.0f} rows/s")
 
 
 # %%
 # Load all tables
-for index, row in table_load.iterrows():
-    print(row["TableName"], row["ColumnCount"])
-    insert_rows_from_csv(row["TableName"], row["ColumnCount"])
+for level in levels:
+    for tablename in level:
+        print(tablename)
+        insert_rows_from_csv(tablename)
 
 # %%
+# Read the whole player table in chunks, so large tables don't have to fit in
+# memory; the cell shows the rows of each chunk and the total for the table
 query = "select * from player"
-df = pd.read_sql(query, con)
-df
+rows = 0
+with pool.connection() as con:
+    for chunk in read_sql_chunks(con, query, fetch_size=50_000):
+        rows += len(chunk)
+        print(f"{len(chunk):,} rows ({rows:,} so far)")
+rows
+
+# %%
+# Export all tables to data/<table>/part-NNNNN.parquet
+exports = export_tables(pool, database, output_dir="data", file_format="parquet")
 
 # %%
-# Truncate all tables
-table_load = table_load.sort_values(by="order", ascending=False)
-for index, row in table_load.iterrows():
-    print(row["TableName"])
-    cur.execute(f"delete from {row['TableName']}")
+# Truncate all tables, children first, each level's deletes running concurrently
+results = reset_tables(pool, table_names, dependencies, mode="delete", database=database)
 # %%